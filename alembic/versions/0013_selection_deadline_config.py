@@ -0,0 +1,33 @@
+"""Add selection deadline and squad size to team_selection_config
+
+Revision ID: 0013
+Revises: 0012
+Create Date: 2026-10-19
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+revision: str = "0013"
+down_revision: Union[str, None] = "0012"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "team_selection_config",
+        sa.Column("selection_deadline_hours", sa.Integer(), server_default="48"),
+    )
+    op.add_column(
+        "team_selection_config",
+        sa.Column("target_players", sa.Integer(), server_default="11"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("team_selection_config", "target_players")
+    op.drop_column("team_selection_config", "selection_deadline_hours")
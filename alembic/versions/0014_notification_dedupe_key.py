@@ -0,0 +1,53 @@
+"""Add dedupe_key to notifications for generated reminders
+
+Revision ID: 0014
+Revises: 0013
+Create Date: 2026-10-19
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+revision: str = "0014"
+down_revision: Union[str, None] = "0013"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("notifications", sa.Column("dedupe_key", sa.String(255)))
+
+    # Backfill keys for reminders already sent, keeping only the oldest per user
+    # and target so the unique index can be built.
+    for reminder_type, data_key in (
+        ("match_reminder", "match_id"),
+        ("payment_reminder", "payment_id"),
+    ):
+        op.execute(
+            f"""
+            UPDATE notifications
+            SET dedupe_key = '{reminder_type}:' || (data ->> '{data_key}')
+            WHERE id IN (
+                SELECT DISTINCT ON (user_id, data ->> '{data_key}') id
+                FROM notifications
+                WHERE type = '{reminder_type}' AND data ->> '{data_key}' IS NOT NULL
+                ORDER BY user_id, data ->> '{data_key}', created_at
+            )
+            """
+        )
+
+    op.create_index(
+        "uq_notifications_user_dedupe_key",
+        "notifications",
+        ["user_id", "dedupe_key"],
+        unique=True,
+        postgresql_where=sa.text("dedupe_key IS NOT NULL"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("uq_notifications_user_dedupe_key", table_name="notifications")
+    op.drop_column("notifications", "dedupe_key")
@@ -0,0 +1,50 @@
+"""Add job_runs table for the background job scheduler
+
+Revision ID: 0015
+Revises: 0014
+Create Date: 2026-10-19
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import UUID
+
+from alembic import op
+
+revision: str = "0015"
+down_revision: Union[str, None] = "0014"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "job_runs",
+        sa.Column(
+            "id",
+            UUID(as_uuid=True),
+            primary_key=True,
+            server_default=sa.text("gen_random_uuid()"),
+        ),
+        sa.Column("job_name", sa.String(100), nullable=False),
+        sa.Column("scheduled_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("started_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+        sa.Column("finished_at", sa.DateTime(timezone=True)),
+        sa.Column("duration_ms", sa.Integer()),
+        sa.Column("rows_affected", sa.Integer()),
+        sa.Column("status", sa.String(20), nullable=False, server_default="running"),
+        sa.Column("error", sa.Text()),
+        sa.Column("instance", sa.String(255)),
+        sa.UniqueConstraint("job_name", "scheduled_at", name="uq_job_run_slot"),
+        sa.CheckConstraint(
+            "status IN ('running', 'succeeded', 'failed', 'cancelled')",
+            name="ck_job_run_status",
+        ),
+    )
+    op.create_index("idx_job_runs_started_at", "job_runs", ["started_at"])
+
+
+def downgrade() -> None:
+    op.drop_index("idx_job_runs_started_at", table_name="job_runs")
+    op.drop_table("job_runs")
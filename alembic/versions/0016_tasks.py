@@ -0,0 +1,72 @@
+"""Add tasks table for the background task queue
+
+Revision ID: 0016
+Revises: 0015
+Create Date: 2026-10-19
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import JSON, UUID
+
+from alembic import op
+
+revision: str = "0016"
+down_revision: Union[str, None] = "0015"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "tasks",
+        sa.Column(
+            "id",
+            UUID(as_uuid=True),
+            primary_key=True,
+            server_default=sa.text("gen_random_uuid()"),
+        ),
+        sa.Column("club_id", UUID(as_uuid=True)),
+        sa.Column("kind", sa.String(100), nullable=False),
+        sa.Column("payload", JSON, nullable=False, server_default="{}"),
+        sa.Column("status", sa.String(20), nullable=False, server_default="queued"),
+        sa.Column("priority", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("attempts", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("max_attempts", sa.Integer(), nullable=False, server_default="5"),
+        sa.Column(
+            "run_after", sa.DateTime(timezone=True), nullable=False, server_default=sa.func.now()
+        ),
+        sa.Column("locked_by", sa.String(255)),
+        sa.Column("locked_at", sa.DateTime(timezone=True)),
+        sa.Column("finished_at", sa.DateTime(timezone=True)),
+        sa.Column("result", JSON),
+        sa.Column("last_error", sa.Text()),
+        sa.Column("created_by", UUID(as_uuid=True)),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+        sa.CheckConstraint(
+            "status IN ('queued', 'running', 'succeeded', 'failed')",
+            name="ck_task_status",
+        ),
+    )
+    op.create_index("ix_tasks_club_id", "tasks", ["club_id"])
+    op.create_index(
+        "idx_tasks_queued",
+        "tasks",
+        [sa.text("priority DESC"), "run_after"],
+        postgresql_where=sa.text("status = 'queued'"),
+    )
+    op.create_index(
+        "idx_tasks_running_club",
+        "tasks",
+        ["club_id"],
+        postgresql_where=sa.text("status = 'running'"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("idx_tasks_running_club", table_name="tasks")
+    op.drop_index("idx_tasks_queued", table_name="tasks")
+    op.drop_index("ix_tasks_club_id", table_name="tasks")
+    op.drop_table("tasks")
@@ -0,0 +1,40 @@
+"""Add notification_counters for O(1) unread counts
+
+Revision ID: 0017
+Revises: 0016
+Create Date: 2026-10-19
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import UUID
+
+from alembic import op
+
+revision: str = "0017"
+down_revision: Union[str, None] = "0016"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "notification_counters",
+        sa.Column("user_id", UUID(as_uuid=True), primary_key=True),
+        sa.Column("unread_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+    )
+    op.execute(
+        """
+        INSERT INTO notification_counters (user_id, unread_count)
+        SELECT user_id, count(*)
+        FROM notifications
+        WHERE is_read IS FALSE
+        GROUP BY user_id
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("notification_counters")
@@ -0,0 +1,105 @@
+"""Inbox keyset indexes and notifications_archive for retention
+
+Revision ID: 0018
+Revises: 0017
+Create Date: 2026-10-19
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import UUID
+
+from alembic import op
+
+revision: str = "0018"
+down_revision: Union[str, None] = "0017"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "notifications_archive",
+        sa.Column("id", UUID(as_uuid=True), primary_key=True),
+        sa.Column("club_id", UUID(as_uuid=True), nullable=False),
+        sa.Column("user_id", UUID(as_uuid=True), nullable=False),
+        sa.Column("type", sa.String(50), nullable=False),
+        sa.Column("title", sa.String(255), nullable=False),
+        sa.Column("body", sa.Text()),
+        sa.Column("data", sa.JSON(), nullable=False),
+        sa.Column("is_read", sa.Boolean()),
+        sa.Column("dedupe_key", sa.String(255)),
+        sa.Column("created_at", sa.DateTime(timezone=True)),
+        sa.Column("archived_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+    )
+    op.create_index(
+        "idx_notifications_archive_user_created",
+        "notifications_archive",
+        ["user_id", sa.text("created_at DESC")],
+    )
+    op.create_index(
+        "idx_notifications_archive_user_dedupe_key",
+        "notifications_archive",
+        ["user_id", "dedupe_key"],
+        postgresql_where=sa.text("dedupe_key IS NOT NULL"),
+    )
+
+    # notifications is large; build the new indexes without blocking writes
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "idx_notifications_user_created",
+            "notifications",
+            ["user_id", sa.text("created_at DESC"), sa.text("id DESC")],
+            postgresql_concurrently=True,
+        )
+        op.drop_index(
+            "idx_notifications_user_unread",
+            table_name="notifications",
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            "idx_notifications_user_unread",
+            "notifications",
+            ["user_id", sa.text("created_at DESC"), sa.text("id DESC")],
+            postgresql_where=sa.text("is_read = false"),
+            postgresql_concurrently=True,
+        )
+        # Superseded by idx_notifications_user_created
+        op.drop_index(
+            "idx_notifications_user_id",
+            table_name="notifications",
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "idx_notifications_user_id",
+            "notifications",
+            ["user_id"],
+            postgresql_concurrently=True,
+        )
+        op.drop_index(
+            "idx_notifications_user_unread",
+            table_name="notifications",
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            "idx_notifications_user_unread",
+            "notifications",
+            ["user_id", "is_read"],
+            postgresql_where=sa.text("is_read = false"),
+            postgresql_concurrently=True,
+        )
+        op.drop_index(
+            "idx_notifications_user_created",
+            table_name="notifications",
+            postgresql_concurrently=True,
+        )
+    op.drop_index(
+        "idx_notifications_archive_user_dedupe_key", table_name="notifications_archive"
+    )
+    op.drop_index("idx_notifications_archive_user_created", table_name="notifications_archive")
+    op.drop_table("notifications_archive")
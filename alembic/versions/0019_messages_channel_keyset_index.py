@@ -0,0 +1,46 @@
+"""Composite (channel_id, created_at, id) index for message keyset paging
+
+Revision ID: 0019
+Revises: 0018
+Create Date: 2026-10-19
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+revision: str = "0019"
+down_revision: Union[str, None] = "0018"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "idx_messages_channel_created",
+            "messages",
+            ["channel_id", sa.text("created_at DESC"), sa.text("id DESC")],
+            postgresql_concurrently=True,
+        )
+        # Superseded by idx_messages_channel_created
+        op.drop_index(
+            "ix_messages_channel_id", table_name="messages", postgresql_concurrently=True
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_messages_channel_id",
+            "messages",
+            ["channel_id"],
+            postgresql_concurrently=True,
+        )
+        op.drop_index(
+            "idx_messages_channel_created",
+            table_name="messages",
+            postgresql_concurrently=True,
+        )
@@ -0,0 +1,40 @@
+"""Denormalized vote_count on poll_options
+
+Revision ID: 0020
+Revises: 0019
+Create Date: 2026-10-19
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+revision: str = "0020"
+down_revision: Union[str, None] = "0019"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "poll_options",
+        sa.Column("vote_count", sa.Integer(), nullable=False, server_default="0"),
+    )
+    op.execute(
+        """
+        UPDATE poll_options
+        SET vote_count = v.votes
+        FROM (
+            SELECT poll_option_id, count(*) AS votes
+            FROM poll_votes
+            GROUP BY poll_option_id
+        ) v
+        WHERE poll_options.id = v.poll_option_id
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("poll_options", "vote_count")
@@ -0,0 +1,73 @@
+"""Generated tsvector columns and GIN indexes for message and announcement search
+
+Revision ID: 0021
+Revises: 0020
+Create Date: 2026-10-19
+
+Adding a stored generated column rewrites the table under an exclusive lock,
+so on a large ``messages`` table run this in a quiet window. The GIN indexes
+are then built concurrently. They keep the default ``fastupdate``, so a new
+message lands in the index's pending list (merged later by autovacuum or once
+it reaches ``gin_pending_list_limit``) instead of paying for a full GIN
+insert on every ``send_message``.
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from alembic import op
+
+revision: str = "0021"
+down_revision: Union[str, None] = "0020"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "messages",
+        sa.Column(
+            "search_vector",
+            postgresql.TSVECTOR(),
+            sa.Computed("to_tsvector('english', content)", persisted=True),
+        ),
+    )
+    op.add_column(
+        "announcements",
+        sa.Column(
+            "search_vector",
+            postgresql.TSVECTOR(),
+            sa.Computed(
+                "setweight(to_tsvector('english', title), 'A')"
+                " || setweight(to_tsvector('english', coalesce(body, '')), 'B')",
+                persisted=True,
+            ),
+        ),
+    )
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "idx_messages_search",
+            "messages",
+            ["search_vector"],
+            postgresql_using="gin",
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            "idx_announcements_search",
+            "announcements",
+            ["search_vector"],
+            postgresql_using="gin",
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "idx_announcements_search", table_name="announcements", postgresql_concurrently=True
+        )
+        op.drop_index("idx_messages_search", table_name="messages", postgresql_concurrently=True)
+    op.drop_column("announcements", "search_vector")
+    op.drop_column("messages", "search_vector")
@@ -0,0 +1,38 @@
+"""Add channel_read_cursors for per-channel unread counts
+
+Revision ID: 0022
+Revises: 0021
+Create Date: 2026-10-19
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import UUID
+
+from alembic import op
+
+revision: str = "0022"
+down_revision: Union[str, None] = "0021"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "channel_read_cursors",
+        sa.Column("user_id", UUID(as_uuid=True), primary_key=True),
+        sa.Column(
+            "channel_id",
+            UUID(as_uuid=True),
+            sa.ForeignKey("channels.id", ondelete="CASCADE"),
+            primary_key=True,
+        ),
+        sa.Column("last_read_message_id", UUID(as_uuid=True), nullable=False),
+        sa.Column("last_read_created_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("channel_read_cursors")
@@ -0,0 +1,49 @@
+"""Indexes for keyset-paged media items and the tag filter
+
+Revision ID: 0023
+Revises: 0022
+Create Date: 2026-10-19
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+revision: str = "0023"
+down_revision: Union[str, None] = "0022"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "idx_media_items_club_created",
+            "media_items",
+            ["club_id", sa.text("created_at DESC"), sa.text("id DESC")],
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            "idx_media_items_gallery_created",
+            "media_items",
+            ["gallery_id", sa.text("created_at DESC"), sa.text("id DESC")],
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            "idx_media_item_tags_tag_item",
+            "media_item_tags",
+            ["media_tag_id", "media_item_id"],
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table in (
+            ("idx_media_item_tags_tag_item", "media_item_tags"),
+            ("idx_media_items_gallery_created", "media_items"),
+            ("idx_media_items_club_created", "media_items"),
+        ):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True)
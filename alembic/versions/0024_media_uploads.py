@@ -0,0 +1,70 @@
+"""Add media_uploads and content metadata on media_items
+
+Revision ID: 0024
+Revises: 0023
+Create Date: 2026-10-19
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import UUID
+
+from alembic import op
+
+revision: str = "0024"
+down_revision: Union[str, None] = "0023"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("media_items", sa.Column("content_hash", sa.String(64), nullable=True))
+    op.add_column("media_items", sa.Column("content_type", sa.String(100), nullable=True))
+    op.add_column("media_items", sa.Column("size_bytes", sa.BigInteger(), nullable=True))
+    op.create_index("ix_media_items_content_hash", "media_items", ["content_hash"])
+
+    op.create_table(
+        "media_uploads",
+        sa.Column("id", UUID(as_uuid=True), primary_key=True),
+        sa.Column(
+            "club_id",
+            UUID(as_uuid=True),
+            sa.ForeignKey("clubs.id", ondelete="CASCADE"),
+            nullable=False,
+            index=True,
+        ),
+        sa.Column("uploaded_by", UUID(as_uuid=True), nullable=True),
+        sa.Column("filename", sa.String(255), nullable=False),
+        sa.Column("content_type", sa.String(100), nullable=False),
+        sa.Column("total_bytes", sa.BigInteger(), nullable=False),
+        sa.Column("received_bytes", sa.BigInteger(), nullable=False, server_default="0"),
+        sa.Column("status", sa.String(20), nullable=False, server_default="uploading"),
+        sa.Column(
+            "gallery_id",
+            UUID(as_uuid=True),
+            sa.ForeignKey("media_galleries.id", ondelete="SET NULL"),
+            nullable=True,
+        ),
+        sa.Column("title", sa.String(200), nullable=True),
+        sa.Column("description", sa.Text(), nullable=True),
+        sa.Column(
+            "media_item_id",
+            UUID(as_uuid=True),
+            sa.ForeignKey("media_items.id", ondelete="SET NULL"),
+            nullable=True,
+        ),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+        sa.CheckConstraint(
+            "status IN ('uploading', 'completed')", name="ck_media_upload_status"
+        ),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("media_uploads")
+    op.drop_index("ix_media_items_content_hash", table_name="media_items")
+    op.drop_column("media_items", "size_bytes")
+    op.drop_column("media_items", "content_type")
+    op.drop_column("media_items", "content_hash")
@@ -0,0 +1,26 @@
+"""Add derivatives to media_items
+
+Revision ID: 0025
+Revises: 0024
+Create Date: 2026-10-19
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import JSONB
+
+from alembic import op
+
+revision: str = "0025"
+down_revision: Union[str, None] = "0024"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("media_items", sa.Column("derivatives", JSONB(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("media_items", "derivatives")
@@ -0,0 +1,39 @@
+"""Indexes for keyset-paged merchandise orders and the status filter
+
+Revision ID: 0026
+Revises: 0025
+Create Date: 2026-10-19
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+revision: str = "0026"
+down_revision: Union[str, None] = "0025"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "idx_merch_orders_club_created",
+            "merchandise_orders",
+            ["club_id", sa.text("created_at DESC"), sa.text("id DESC")],
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            "idx_merch_orders_club_status_created",
+            "merchandise_orders",
+            ["club_id", "status", sa.text("created_at DESC"), sa.text("id DESC")],
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name in ("idx_merch_orders_club_status_created", "idx_merch_orders_club_created"):
+            op.drop_index(name, table_name="merchandise_orders", postgresql_concurrently=True)
@@ -27,9 +27,11 @@ from app.api.v1 import (
     registration,
     roles,
     scoring,
+    search,
     seasons,
     selections,
     statistics,
+    tasks,
     teams,
 )
 
@@ -88,6 +90,7 @@ api_router.include_router(notifications.router)
 api_router.include_router(notifications.notification_actions_router)
 api_router.include_router(notifications.reminders_router)
 api_router.include_router(notifications.push_tokens_router)
+api_router.include_router(notifications.club_router)
 
 # Scoring & Statistics
 api_router.include_router(scoring.router)
@@ -113,6 +116,8 @@ api_router.include_router(messaging.message_channel_router)
 api_router.include_router(messaging.message_action_router)
 api_router.include_router(messaging.poll_option_router)
 api_router.include_router(messaging.poll_action_router)
+api_router.include_router(messaging.socket_router)
+api_router.include_router(search.router)
 
 # Merchandise
 api_router.include_router(merchandise.club_router)
@@ -126,6 +131,10 @@ api_router.include_router(media.club_router)
 api_router.include_router(media.gallery_router)
 api_router.include_router(media.item_router)
 api_router.include_router(media.tag_router)
+api_router.include_router(media.upload_router)
 
 # Play-Cricket Integration
 api_router.include_router(play_cricket.router)
+
+# Background tasks
+api_router.include_router(tasks.router)
@@ -1,13 +1,15 @@
 from typing import Annotated
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, Path, Query
+from fastapi import APIRouter, Depends, Path, Query, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.conditional import conditional_get, version_source
 from app.core.database import get_db
 from app.core.dependencies import get_current_user
 from app.core.exceptions import NotFoundError
 from app.core.permissions import require_admin, require_member
+from app.models.announcement import Announcement
 from app.schemas.announcement import AnnouncementCreate, AnnouncementRead, AnnouncementUpdate
 from app.schemas.auth import CurrentUser
 from app.services.announcement_service import AnnouncementService
@@ -18,13 +20,23 @@ router = APIRouter(prefix="/clubs/{club_id}/announcements", tags=["announcements
 @router.get("/", response_model=list[AnnouncementRead])
 async def list_announcements(
     club_id: Annotated[UUID, Path()],
+    request: Request,
+    response: Response,
     current_user: Annotated[CurrentUser, Depends(get_current_user)],
     db: Annotated[AsyncSession, Depends(get_db)],
     include_archived: bool = Query(False),
     offset: int = Query(0, ge=0),
     limit: int = Query(50, ge=1, le=100),
-) -> list[AnnouncementRead]:
+) -> list[AnnouncementRead] | Response:
     require_member(current_user, club_id)
+    not_modified = await conditional_get(
+        request,
+        response,
+        db,
+        version_source(Announcement, Announcement.club_id == club_id),
+    )
+    if not_modified:
+        return not_modified
     service = AnnouncementService(db, club_id)
     announcements = await service.get_all(
         offset=offset, limit=limit, include_archived=include_archived
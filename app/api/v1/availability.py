@@ -1,18 +1,24 @@
 from typing import Annotated
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, Path
+from fastapi import APIRouter, Depends, Path, Query, Request, Response
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.conditional import conditional_get, version_source
 from app.core.database import get_db
 from app.core.dependencies import get_current_user
 from app.core.exceptions import NotFoundError
 from app.core.permissions import require_admin_or_captain, require_member
+from app.models.match import Match
+from app.models.match_availability import MatchAvailability
 from app.models.player import Player
+from app.models.season import Season
 from app.schemas.auth import CurrentUser
 from app.schemas.lifecycle import MemberAvailabilitySummaryRead
 from app.schemas.match_availability import (
+    AdminBulkAvailabilityUpdate,
+    AvailabilityMatrixRead,
     AvailabilityRead,
     AvailabilityUpdate,
     BulkAvailabilityUpdate,
@@ -103,5 +109,56 @@ async def bulk_set_availability(
 ) -> dict:
     require_member(current_user, club_id)
     service = AvailabilityService(db, club_id)
-    count = await service.bulk_set(body.match_ids, current_user.user_id, body.status)
-    return {"updated_count": count}
+    results = await service.bulk_set(body.match_ids, current_user.user_id, body.status)
+    updated = sum(1 for r in results if r["result"] != "not_found")
+    return {"updated_count": updated, "results": results}
+
+
+@bulk_router.post("/bulk/players")
+async def bulk_set_player_availability(
+    club_id: Annotated[UUID, Path()],
+    body: AdminBulkAvailabilityUpdate,
+    current_user: Annotated[CurrentUser, Depends(get_current_user)],
+    db: Annotated[AsyncSession, Depends(get_db)],
+) -> dict:
+    require_admin_or_captain(current_user, club_id)
+    service = AvailabilityService(db, club_id)
+    results = await service.bulk_set_for_players(
+        [(e.match_id, e.player_id, e.status) for e in body.entries]
+    )
+    updated = sum(1 for r in results if r["result"] != "not_found")
+    return {"updated_count": updated, "results": results}
+
+
+@bulk_router.get("/matrix", response_model=AvailabilityMatrixRead)
+async def get_season_availability_matrix(
+    club_id: Annotated[UUID, Path()],
+    request: Request,
+    response: Response,
+    current_user: Annotated[CurrentUser, Depends(get_current_user)],
+    db: Annotated[AsyncSession, Depends(get_db)],
+    season_id: UUID = Query(...),
+) -> AvailabilityMatrixRead | Response:
+    """Players x matches availability grid for a season, compactly encoded."""
+    require_member(current_user, club_id)
+
+    season_match_ids = select(Match.id).where(
+        Match.club_id == club_id, Match.season_id == season_id
+    )
+    not_modified = await conditional_get(
+        request,
+        response,
+        db,
+        version_source(Season, Season.id == season_id),
+        version_source(Match, Match.club_id == club_id, Match.season_id == season_id),
+        version_source(Player, Player.club_id == club_id),
+        version_source(MatchAvailability, MatchAvailability.match_id.in_(season_match_ids)),
+    )
+    if not_modified:
+        return not_modified
+
+    service = AvailabilityService(db, club_id)
+    matrix = await service.get_season_matrix(season_id)
+    if not matrix:
+        raise NotFoundError("Season not found")
+    return AvailabilityMatrixRead(**matrix)
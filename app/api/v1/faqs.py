@@ -1,13 +1,15 @@
 from typing import Annotated
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, Path, Query
+from fastapi import APIRouter, Depends, Path, Query, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.conditional import conditional_get, version_source
 from app.core.database import get_db
 from app.core.dependencies import get_current_user
 from app.core.exceptions import NotFoundError
 from app.core.permissions import require_admin, require_member
+from app.models.faq import FAQ
 from app.schemas.auth import CurrentUser
 from app.schemas.faq import FAQCreate, FAQRead, FAQUpdate
 from app.services.faq_service import FAQService
@@ -18,11 +20,18 @@ router = APIRouter(prefix="/clubs/{club_id}/faqs", tags=["faqs"])
 @router.get("/", response_model=list[FAQRead])
 async def list_faqs(
     club_id: Annotated[UUID, Path()],
+    request: Request,
+    response: Response,
     current_user: Annotated[CurrentUser, Depends(get_current_user)],
     db: Annotated[AsyncSession, Depends(get_db)],
     published_only: bool = Query(True),
-) -> list[FAQRead]:
+) -> list[FAQRead] | Response:
     require_member(current_user, club_id)
+    not_modified = await conditional_get(
+        request, response, db, version_source(FAQ, FAQ.club_id == club_id)
+    )
+    if not_modified:
+        return not_modified
     service = FAQService(db, club_id)
     faqs = await service.get_all(published_only=published_only)
     return [FAQRead.model_validate(f) for f in faqs]
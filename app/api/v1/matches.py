@@ -1,10 +1,11 @@
 from typing import Annotated
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, Path, Query
+from fastapi import APIRouter, Depends, Path, Query, Request, Response
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.conditional import conditional_get, version_source
 from app.core.database import get_db
 from app.core.dependencies import get_current_user
 from app.core.exceptions import NotFoundError
@@ -23,9 +24,11 @@ router = APIRouter(prefix="/clubs/{club_id}/matches", tags=["matches"])
 fixtures_router = APIRouter(prefix="/clubs/{club_id}/fixtures", tags=["fixtures"])
 
 
-@fixtures_router.get("/")
+@fixtures_router.get("/", response_model=list[dict])
 async def list_fixtures(
     club_id: Annotated[UUID, Path()],
+    request: Request,
+    response: Response,
     current_user: Annotated[CurrentUser, Depends(get_current_user)],
     db: Annotated[AsyncSession, Depends(get_db)],
     season_id: UUID | None = Query(None),
@@ -34,10 +37,22 @@ async def list_fixtures(
     month: int | None = Query(None),
     year: int | None = Query(None),
     status: str | None = Query(None),
-) -> list[dict]:
+) -> list[dict] | Response:
     """Return fixtures with joined team/season/fixture_type data for the frontend."""
     require_member(current_user, club_id)
 
+    not_modified = await conditional_get(
+        request,
+        response,
+        db,
+        version_source(Match, Match.club_id == club_id),
+        version_source(Team, Team.club_id == club_id),
+        version_source(Season, Season.club_id == club_id),
+        version_source(FixtureType, FixtureType.club_id == club_id),
+    )
+    if not_modified:
+        return not_modified
+
     stmt = (
         select(
             Match,
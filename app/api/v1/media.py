@@ -1,13 +1,16 @@
+from datetime import datetime
 from typing import Annotated
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, Path
+from fastapi import APIRouter, Depends, Header, Path, Query, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.database import get_db
 from app.core.dependencies import get_current_user
 from app.core.exceptions import NotFoundError
+from app.core.pagination import decode_cursor, encode_cursor
 from app.core.permissions import require_admin, require_member
+from app.integrations.imaging import pick_derivative
 from app.schemas.auth import CurrentUser
 from app.schemas.media import (
     GalleryCreate,
@@ -19,8 +22,11 @@ from app.schemas.media import (
     MediaSummary,
     MediaTagCreate,
     MediaTagRead,
+    MediaUploadCreate,
+    MediaUploadRead,
 )
 from app.services.media_service import MediaGalleryService, MediaItemService, MediaTagService
+from app.services.media_upload_service import MediaUploadService
 
 # Club-scoped routes
 club_router = APIRouter(prefix="/clubs/{club_id}/media", tags=["media"])
@@ -37,6 +43,9 @@ item_router = APIRouter(prefix="/media/items/{item_id}", tags=["media"])
 # Tag action routes
 tag_router = APIRouter(prefix="/media/tags/{tag_id}", tags=["media"])
 
+# Upload routes
+upload_router = APIRouter(prefix="/media/uploads/{upload_id}", tags=["media"])
+
 
 async def _get_gallery_club_id(gallery_id: UUID, db: AsyncSession) -> UUID:
     from app.models.media_gallery import MediaGallery
@@ -74,6 +83,32 @@ async def _get_tag_club_id(tag_id: UUID, db: AsyncSession) -> UUID:
     return club_id
 
 
+async def _get_upload_club_id(upload_id: UUID, db: AsyncSession) -> UUID:
+    from sqlalchemy import select
+
+    from app.models.media_upload import MediaUpload
+
+    stmt = select(MediaUpload.club_id).where(MediaUpload.id == upload_id)
+    result = await db.execute(stmt)
+    club_id = result.scalar_one_or_none()
+    if club_id is None:
+        raise NotFoundError("Upload not found")
+    return club_id
+
+
+def _set_next_cursor(response: Response, items: list[dict], limit: int) -> None:
+    if len(items) == limit:
+        last = items[-1]
+        response.headers["X-Next-Cursor"] = encode_cursor(last["created_at"], last["id"])
+
+
+def _read_items(items: list[dict], width: int | None) -> list[MediaItemRead]:
+    return [
+        MediaItemRead(**i, display_url=pick_derivative(i["derivatives"], width) or i["url"])
+        for i in items
+    ]
+
+
 # --- Galleries ---
 
 @club_router.get("/galleries", response_model=list[GalleryRead])
@@ -148,14 +183,26 @@ async def delete_gallery(
 @gallery_router.get("/items", response_model=list[MediaItemRead])
 async def list_gallery_items(
     gallery_id: Annotated[UUID, Path()],
+    response: Response,
     current_user: Annotated[CurrentUser, Depends(get_current_user)],
     db: Annotated[AsyncSession, Depends(get_db)],
+    tag_id: UUID | None = Query(None),
+    limit: int = Query(50, ge=1, le=100),
+    cursor: str | None = Query(None),
+    width: int | None = Query(None, ge=1, le=8192),
 ) -> list[MediaItemRead]:
+    """Items newest first. When more remain, ``X-Next-Cursor`` holds the
+    ``cursor`` for the next page. ``display_url`` is the smallest derivative
+    at least ``width`` device pixels wide."""
     club_id = await _get_gallery_club_id(gallery_id, db)
     require_member(current_user, club_id)
+    after = decode_cursor(cursor, datetime, UUID) if cursor else None
     service = MediaItemService(db, club_id)
-    items = await service.get_all_with_tags(gallery_id=gallery_id)
-    return [MediaItemRead(**i) for i in items]
+    items = await service.get_all_with_tags(
+        gallery_id=gallery_id, tag_id=tag_id, limit=limit, after=after
+    )
+    _set_next_cursor(response, items, limit)
+    return _read_items(items, width)
 
 
 # --- Media Items ---
@@ -163,13 +210,23 @@ async def list_gallery_items(
 @club_router.get("/items", response_model=list[MediaItemRead])
 async def list_items(
     club_id: Annotated[UUID, Path()],
+    response: Response,
     current_user: Annotated[CurrentUser, Depends(get_current_user)],
     db: Annotated[AsyncSession, Depends(get_db)],
+    tag_id: UUID | None = Query(None),
+    limit: int = Query(50, ge=1, le=100),
+    cursor: str | None = Query(None),
+    width: int | None = Query(None, ge=1, le=8192),
 ) -> list[MediaItemRead]:
+    """Items newest first. When more remain, ``X-Next-Cursor`` holds the
+    ``cursor`` for the next page. ``display_url`` is the smallest derivative
+    at least ``width`` device pixels wide."""
     require_member(current_user, club_id)
+    after = decode_cursor(cursor, datetime, UUID) if cursor else None
     service = MediaItemService(db, club_id)
-    items = await service.get_all_with_tags()
-    return [MediaItemRead(**i) for i in items]
+    items = await service.get_all_with_tags(tag_id=tag_id, limit=limit, after=after)
+    _set_next_cursor(response, items, limit)
+    return _read_items(items, width)
 
 
 @club_router.post("/items", response_model=MediaItemRead, status_code=201)
@@ -190,6 +247,7 @@ async def get_item(
     item_id: Annotated[UUID, Path()],
     current_user: Annotated[CurrentUser, Depends(get_current_user)],
     db: Annotated[AsyncSession, Depends(get_db)],
+    width: int | None = Query(None, ge=1, le=8192),
 ) -> MediaItemRead:
     club_id = await _get_item_club_id(item_id, db)
     require_member(current_user, club_id)
@@ -197,7 +255,7 @@ async def get_item(
     item = await service.get_with_tags(item_id)
     if not item:
         raise NotFoundError("Media item not found")
-    return MediaItemRead(**item)
+    return _read_items([item], width)[0]
 
 
 @item_router.patch("/", response_model=MediaItemRead)
@@ -229,6 +287,69 @@ async def delete_item(
         raise NotFoundError("Media item not found")
 
 
+# --- Uploads ---
+
+@club_router.post("/uploads", response_model=MediaUploadRead, status_code=201)
+async def create_upload(
+    club_id: Annotated[UUID, Path()],
+    body: MediaUploadCreate,
+    response: Response,
+    current_user: Annotated[CurrentUser, Depends(get_current_user)],
+    db: Annotated[AsyncSession, Depends(get_db)],
+) -> MediaUploadRead:
+    """Start an upload; send the file with ``PATCH /media/uploads/{id}``."""
+    require_admin(current_user, club_id)
+    service = MediaUploadService(db, club_id)
+    upload = await service.create(uploaded_by=current_user.user_id, **body.model_dump())
+    response.headers["Upload-Offset"] = "0"
+    return MediaUploadRead.model_validate(upload)
+
+
+@upload_router.get("/", response_model=MediaUploadRead)
+async def get_upload(
+    upload_id: Annotated[UUID, Path()],
+    response: Response,
+    current_user: Annotated[CurrentUser, Depends(get_current_user)],
+    db: Annotated[AsyncSession, Depends(get_db)],
+) -> MediaUploadRead:
+    """Progress of an upload; resume by sending from ``received_bytes``."""
+    club_id = await _get_upload_club_id(upload_id, db)
+    require_admin(current_user, club_id)
+    service = MediaUploadService(db, club_id)
+    upload = await service.get(upload_id)
+    if not upload:
+        raise NotFoundError("Upload not found")
+    response.headers["Upload-Offset"] = str(upload.received_bytes)
+    return MediaUploadRead.model_validate(upload)
+
+
+@upload_router.patch("/", response_model=MediaUploadRead)
+async def append_upload(
+    upload_id: Annotated[UUID, Path()],
+    request: Request,
+    response: Response,
+    current_user: Annotated[CurrentUser, Depends(get_current_user)],
+    db: Annotated[AsyncSession, Depends(get_db)],
+    upload_offset: Annotated[int, Header(alias="Upload-Offset", ge=0)],
+) -> MediaUploadRead:
+    """Append the raw request body at ``Upload-Offset``.
+
+    Large files are sent as several requests of at most
+    ``MEDIA_UPLOAD_CHUNK_MAX_BYTES``; after a failure, ``GET`` the upload and
+    continue from its offset. The request that completes the file returns
+    the created ``media_item``.
+    """
+    club_id = await _get_upload_club_id(upload_id, db)
+    require_admin(current_user, club_id)
+    service = MediaUploadService(db, club_id)
+    upload, item = await service.append(upload_id, upload_offset, request.stream())
+    response.headers["Upload-Offset"] = str(upload.received_bytes)
+    result = MediaUploadRead.model_validate(upload)
+    if item:
+        result.media_item = MediaItemRead.model_validate(item)
+    return result
+
+
 # --- Tags ---
 
 @club_router.get("/tags", response_model=list[MediaTagRead])
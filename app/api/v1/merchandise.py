@@ -1,13 +1,20 @@
+from datetime import datetime
 from typing import Annotated
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, Path
+from fastapi import APIRouter, Depends, Path, Query, Request, Response
+from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.conditional import conditional_get, version_source
 from app.core.database import get_db
 from app.core.dependencies import get_current_user
 from app.core.exceptions import NotFoundError
+from app.core.pagination import decode_cursor, encode_cursor
 from app.core.permissions import require_admin, require_member
+from app.models.merchandise_category import MerchandiseCategory
+from app.models.merchandise_item import MerchandiseItem
+from app.models.merchandise_variant import MerchandiseVariant
 from app.schemas.auth import CurrentUser
 from app.schemas.merchandise import (
     MerchCategoryCreate,
@@ -54,10 +61,20 @@ image_router = APIRouter(prefix="/merchandise/images", tags=["merchandise"])
 @club_router.get("/categories", response_model=list[MerchCategoryRead])
 async def list_categories(
     club_id: Annotated[UUID, Path()],
+    request: Request,
+    response: Response,
     current_user: Annotated[CurrentUser, Depends(get_current_user)],
     db: Annotated[AsyncSession, Depends(get_db)],
-) -> list[MerchCategoryRead]:
+) -> list[MerchCategoryRead] | Response:
     require_member(current_user, club_id)
+    not_modified = await conditional_get(
+        request,
+        response,
+        db,
+        version_source(MerchandiseCategory, MerchandiseCategory.club_id == club_id),
+    )
+    if not_modified:
+        return not_modified
     service = MerchCategoryService(db, club_id)
     categories = await service.get_all()
     return [MerchCategoryRead.model_validate(c) for c in categories]
@@ -110,10 +127,21 @@ async def delete_category(
 @club_router.get("/items", response_model=list[MerchItemRead])
 async def list_items(
     club_id: Annotated[UUID, Path()],
+    request: Request,
+    response: Response,
     current_user: Annotated[CurrentUser, Depends(get_current_user)],
     db: Annotated[AsyncSession, Depends(get_db)],
-) -> list[MerchItemRead]:
+) -> list[MerchItemRead] | Response:
     require_member(current_user, club_id)
+    not_modified = await conditional_get(
+        request,
+        response,
+        db,
+        version_source(MerchandiseItem, MerchandiseItem.club_id == club_id),
+        version_source(MerchandiseCategory, MerchandiseCategory.club_id == club_id),
+    )
+    if not_modified:
+        return not_modified
     service = MerchItemService(db, club_id)
     items = await service.get_all_with_category()
     return [MerchItemRead(**i) for i in items]
@@ -184,18 +212,25 @@ async def get_item(
 @item_router.get("/variants", response_model=list[MerchVariantRead])
 async def list_variants(
     item_id: Annotated[UUID, Path()],
+    request: Request,
+    response: Response,
     current_user: Annotated[CurrentUser, Depends(get_current_user)],
     db: Annotated[AsyncSession, Depends(get_db)],
-) -> list[MerchVariantRead]:
-    from app.models.merchandise_item import MerchandiseItem
-    from sqlalchemy import select
-
+) -> list[MerchVariantRead] | Response:
     stmt = select(MerchandiseItem.club_id).where(MerchandiseItem.id == item_id)
     result = await db.execute(stmt)
     club_id = result.scalar_one_or_none()
     if club_id is None:
         raise NotFoundError("Item not found")
     require_member(current_user, club_id)
+    not_modified = await conditional_get(
+        request,
+        response,
+        db,
+        version_source(MerchandiseVariant, MerchandiseVariant.item_id == item_id),
+    )
+    if not_modified:
+        return not_modified
     service = MerchVariantService(db)
     variants = await service.get_for_item(item_id)
     return [MerchVariantRead.model_validate(v) for v in variants]
@@ -306,12 +341,30 @@ async def get_summary(
 @club_router.get("/orders", response_model=list[MerchOrderRead])
 async def list_orders(
     club_id: Annotated[UUID, Path()],
+    response: Response,
     current_user: Annotated[CurrentUser, Depends(get_current_user)],
     db: Annotated[AsyncSession, Depends(get_db)],
+    status: str | None = Query(None),
+    created_from: datetime | None = Query(None),
+    created_to: datetime | None = Query(None),
+    limit: int = Query(50, ge=1, le=100),
+    cursor: str | None = Query(None),
 ) -> list[MerchOrderRead]:
+    """Orders newest first, optionally by status and a ``[created_from, created_to)``
+    range. When more remain, ``X-Next-Cursor`` holds the ``cursor`` for the next page."""
     require_admin(current_user, club_id)
+    after = decode_cursor(cursor, datetime, UUID) if cursor else None
     service = MerchOrderService(db, club_id)
-    orders = await service.get_all()
+    orders = await service.get_all(
+        status=status,
+        created_from=created_from,
+        created_to=created_to,
+        limit=limit,
+        after=after,
+    )
+    if len(orders) == limit:
+        last = orders[-1]
+        response.headers["X-Next-Cursor"] = encode_cursor(last["created_at"], last["id"])
     return [MerchOrderRead(**o) for o in orders]
 
 
@@ -1,16 +1,24 @@
+from datetime import datetime
 from typing import Annotated
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, Path, Query
+from fastapi import APIRouter, Depends, Path, Query, Response, WebSocket
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.channel_hub import ChannelConnection
+from app.core.channel_hub import hub as channel_hub
 from app.core.database import get_db
 from app.core.dependencies import get_current_user
-from app.core.exceptions import NotFoundError
+from app.core.exceptions import AuthenticationError, NotFoundError
+from app.core.pagination import decode_cursor, encode_cursor
 from app.core.permissions import require_admin, require_member
+from app.core.pubsub import ConnectionLimitError
+from app.core.read_cursors import read_cursors
 from app.schemas.auth import CurrentUser
 from app.schemas.messaging import (
     ChannelRead,
+    ChannelReadUpdate,
+    ChannelUnreadRead,
     MessageCreate,
     MessageRead,
     MessageTogglePin,
@@ -19,6 +27,7 @@ from app.schemas.messaging import (
     ReactionCreate,
 )
 from app.services.messaging_service import MessagingService
+from app.services.messaging_socket_service import CLOSE_TRY_AGAIN_LATER, MessagingSocketService
 
 # Club-scoped channel routes
 channel_router = APIRouter(prefix="/clubs/{club_id}", tags=["messaging"])
@@ -33,6 +42,9 @@ message_action_router = APIRouter(prefix="/messages/{message_id}", tags=["messag
 poll_option_router = APIRouter(prefix="/poll-options/{option_id}", tags=["messaging"])
 poll_action_router = APIRouter(prefix="/polls/{poll_id}", tags=["messaging"])
 
+# Real-time messaging socket
+socket_router = APIRouter(tags=["messaging"])
+
 
 async def _get_channel_club_id(channel_id: UUID, db: AsyncSession) -> UUID:
     club_id = await MessagingService.get_channel_club_id(db, channel_id)
@@ -99,30 +111,64 @@ async def list_channels(
     return [ChannelRead.model_validate(c) for c in channels]
 
 
+@channel_router.get("/channels/unread", response_model=list[ChannelUnreadRead])
+async def list_unread_counts(
+    club_id: Annotated[UUID, Path()],
+    current_user: Annotated[CurrentUser, Depends(get_current_user)],
+    db: Annotated[AsyncSession, Depends(get_db)],
+) -> list[ChannelUnreadRead]:
+    """Unread message counts for every channel in the club."""
+    require_member(current_user, club_id)
+    # Reads this worker has buffered for the user count before the flush interval
+    await read_cursors.flush(db, user_id=current_user.user_id)
+    service = MessagingService(db, club_id)
+    counts = await service.get_unread_counts(current_user.user_id)
+    return [ChannelUnreadRead(**c) for c in counts]
+
+
 @channel_router.get("/polls", response_model=list[PollRead])
 async def list_club_polls(
     club_id: Annotated[UUID, Path()],
+    response: Response,
     current_user: Annotated[CurrentUser, Depends(get_current_user)],
     db: Annotated[AsyncSession, Depends(get_db)],
+    limit: int = Query(50, ge=1, le=100),
+    cursor: str | None = Query(None),
 ) -> list[PollRead]:
+    """Polls newest first. When more remain, ``X-Next-Cursor`` holds the
+    ``cursor`` for the next page."""
     require_member(current_user, club_id)
+    after = decode_cursor(cursor, datetime, UUID) if cursor else None
     service = MessagingService(db, club_id)
-    polls = await service.get_polls(current_user.user_id)
+    polls = await service.get_polls(current_user.user_id, limit=limit, after=after)
+    if len(polls) == limit:
+        last = polls[-1]
+        response.headers["X-Next-Cursor"] = encode_cursor(last["created_at"], last["id"])
     return [PollRead(**p) for p in polls]
 
 
 @message_channel_router.get("/messages", response_model=list[MessageRead])
 async def list_messages(
     channel_id: Annotated[UUID, Path()],
+    response: Response,
     current_user: Annotated[CurrentUser, Depends(get_current_user)],
     db: Annotated[AsyncSession, Depends(get_db)],
-    offset: int = Query(0, ge=0),
+    offset: int = Query(0, ge=0, deprecated=True),
     limit: int = Query(50, ge=1, le=100),
+    cursor: str | None = Query(None),
 ) -> list[MessageRead]:
+    """Messages newest first. When more remain, ``X-Next-Cursor`` holds the
+    ``cursor`` for the next page."""
     club_id = await _get_channel_club_id(channel_id, db)
     require_member(current_user, club_id)
+    after = decode_cursor(cursor, datetime, UUID) if cursor else None
     service = MessagingService(db, club_id)
-    messages = await service.get_messages(channel_id, offset=offset, limit=limit)
+    messages = await service.get_messages(
+        channel_id, current_user.user_id, limit=limit, after=after, offset=offset
+    )
+    if len(messages) == limit:
+        last = messages[-1]
+        response.headers["X-Next-Cursor"] = encode_cursor(last["created_at"], last["id"])
     return [MessageRead(**m) for m in messages]
 
 
@@ -140,6 +186,26 @@ async def send_message(
     return MessageRead.model_validate(msg)
 
 
+@message_channel_router.put("/read", status_code=204)
+async def mark_channel_read(
+    channel_id: Annotated[UUID, Path()],
+    body: ChannelReadUpdate,
+    current_user: Annotated[CurrentUser, Depends(get_current_user)],
+    db: Annotated[AsyncSession, Depends(get_db)],
+) -> None:
+    """Move the caller's read cursor up to ``message_id``.
+
+    Safe to call on every scroll: positions are coalesced per worker and
+    written every few seconds, and a cursor never moves backwards.
+    """
+    position = await MessagingService.get_message_position(db, channel_id, body.message_id)
+    if position is None:
+        raise NotFoundError("Message not found")
+    club_id, created_at = position
+    require_member(current_user, club_id)
+    read_cursors.record(current_user.user_id, channel_id, created_at, body.message_id)
+
+
 @message_channel_router.post("/polls", response_model=PollRead)
 async def create_poll(
     channel_id: Annotated[UUID, Path()],
@@ -224,3 +290,36 @@ async def close_poll(
     if not poll:
         raise NotFoundError("Poll not found")
     return {"success": True}
+
+
+@socket_router.websocket("/ws/messaging")
+async def messaging_socket(websocket: WebSocket, token: str | None = Query(None)) -> None:
+    """Subscribe to channels and send messages in real time.
+
+    Authenticate with an ``Authorization: Bearer`` header or, for clients that
+    cannot set headers on a WebSocket, a ``token`` query parameter. See
+    :class:`MessagingSocketService` for the frame protocol.
+    """
+    from app.core.database import async_session_factory
+
+    authorization = websocket.headers.get("authorization") or f"Bearer {token or ''}"
+    try:
+        # Short-lived session: the socket must not pin a pooled connection
+        async with async_session_factory() as db:
+            current_user = await get_current_user(authorization, db)
+    except AuthenticationError:
+        await websocket.close(code=1008, reason="Not authenticated")
+        return
+
+    connection = ChannelConnection(current_user.user_id, websocket.send_json)
+    try:
+        channel_hub.connect(connection)
+    except ConnectionLimitError:
+        await websocket.close(code=CLOSE_TRY_AGAIN_LATER, reason="Server busy")
+        return
+    try:
+        await websocket.accept()
+        await MessagingSocketService(websocket, current_user, connection, channel_hub).run()
+    finally:
+        # Also when the client drops during the handshake, before run() starts
+        channel_hub.disconnect(connection)
@@ -1,14 +1,26 @@
+from datetime import datetime
 from typing import Annotated
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, Path
+from fastapi import APIRouter, Depends, Header, HTTPException, Path, Query, Response, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.database import get_db
 from app.core.dependencies import get_current_user
+from app.core.notification_broker import broker as notification_broker
+from app.core.pagination import decode_cursor, encode_cursor
+from app.core.permissions import require_admin
 from app.schemas.auth import CurrentUser
-from app.schemas.notification import NotificationRead, PushTokenRegister, PushTokenRemove
+from app.schemas.notification import (
+    NotificationBroadcast,
+    NotificationBroadcastResult,
+    NotificationRead,
+    PushTokenRegister,
+    PushTokenRemove,
+)
 from app.services.notification_service import NotificationService
+from app.services.notification_stream_service import NotificationStreamService
 from app.services.push_token_service import PushTokenService
 
 router = APIRouter(prefix="/users/{user_id}/notifications", tags=["notifications"])
@@ -17,24 +29,68 @@ notification_actions_router = APIRouter(
 )
 reminders_router = APIRouter(prefix="/reminders", tags=["notifications"])
 push_tokens_router = APIRouter(prefix="/push-tokens", tags=["notifications"])
+club_router = APIRouter(prefix="/clubs/{club_id}/notifications", tags=["notifications"])
 
 
 @router.get("/", response_model=list[NotificationRead])
 async def get_notifications(
     user_id: Annotated[UUID, Path()],
+    response: Response,
     current_user: Annotated[CurrentUser, Depends(get_current_user)],
     db: Annotated[AsyncSession, Depends(get_db)],
+    limit: int = Query(50, ge=1, le=100),
+    cursor: str | None = Query(None),
+    unread_only: bool = Query(False),
 ) -> list[NotificationRead]:
+    """Inbox page, newest first. When more remain, ``X-Next-Cursor`` holds the
+    ``cursor`` for the next page."""
     # Users can only see their own notifications
     if current_user.user_id != user_id and not current_user.is_platform_admin:
         from app.core.exceptions import ForbiddenError
 
         raise ForbiddenError("Can only view own notifications")
+    after = decode_cursor(cursor, datetime, UUID) if cursor else None
     service = NotificationService(db)
-    notifications = await service.get_for_user(user_id)
+    notifications = await service.get_for_user(
+        user_id, limit=limit, after=after, unread_only=unread_only
+    )
+    if len(notifications) == limit:
+        last = notifications[-1]
+        response.headers["X-Next-Cursor"] = encode_cursor(last.created_at, last.id)
     return [NotificationRead.model_validate(n) for n in notifications]
 
 
+@router.get("/stream", response_class=StreamingResponse)
+async def stream_notifications(
+    user_id: Annotated[UUID, Path()],
+    current_user: Annotated[CurrentUser, Depends(get_current_user)],
+    last_event_id: Annotated[str | None, Header()] = None,
+) -> StreamingResponse:
+    """Server-sent events: new notifications and unread count changes.
+
+    Reconnecting clients send ``Last-Event-ID`` to resume after the last
+    notification they received.
+    """
+    if current_user.user_id != user_id and not current_user.is_platform_admin:
+        from app.core.exceptions import ForbiddenError
+
+        raise ForbiddenError("Can only view own notifications")
+    after = decode_cursor(last_event_id, datetime, UUID) if last_event_id else None
+    # The stream subscribes once it starts; refuse early while the server is full
+    if notification_broker.is_full:
+        raise HTTPException(
+            status_code=503,
+            detail="Too many notification streams on this server",
+            headers={"Retry-After": "10"},
+        )
+    service = NotificationStreamService(notification_broker, user_id)
+    return StreamingResponse(
+        service.events(after),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @router.get("/unread-count")
 async def get_unread_count(
     user_id: Annotated[UUID, Path()],
@@ -90,6 +146,26 @@ async def generate_reminders(
     }
 
 
+@club_router.post(
+    "/broadcast",
+    response_model=NotificationBroadcastResult,
+    status_code=status.HTTP_202_ACCEPTED,
+)
+async def broadcast_notification(
+    club_id: Annotated[UUID, Path()],
+    body: NotificationBroadcast,
+    current_user: Annotated[CurrentUser, Depends(get_current_user)],
+    db: Annotated[AsyncSession, Depends(get_db)],
+) -> NotificationBroadcastResult:
+    """Notify every club member; push delivery runs as a background task."""
+    require_admin(current_user, club_id)
+    service = NotificationService(db)
+    recipients, task = await service.broadcast(
+        club_id, body.title, body.body, body.data, created_by=current_user.user_id
+    )
+    return NotificationBroadcastResult(recipients=recipients, task_id=task.id if task else None)
+
+
 @push_tokens_router.post("/")
 async def register_push_token(
     body: PushTokenRegister,
@@ -9,19 +9,23 @@ from app.core.dependencies import get_current_user
 from app.core.exceptions import NotFoundError
 from app.core.permissions import require_platform_admin
 from app.schemas.auth import CurrentUser
+from app.schemas.notification import PushMetricsRead
 from app.schemas.platform import (
     AddAdminRequest,
     AuditLogEntryRead,
     BootstrapRequest,
     BootstrapResponse,
     DeleteClubRequest,
+    JobRunRead,
     PlatformAdminRead,
     PlatformClubRead,
     ReactivateClubRequest,
     SetupStatusResponse,
     SuspendClubRequest,
 )
+from app.services.job_run_service import JobRunService
 from app.services.platform_service import PlatformService
+from app.services.push_delivery_service import PushDeliveryService
 
 router = APIRouter(prefix="/platform", tags=["platform"])
 
@@ -202,3 +206,42 @@ async def get_audit_log(
     service = PlatformService(db)
     entries = await service.get_audit_log(limit)
     return [AuditLogEntryRead(**e) for e in entries]
+
+
+@router.get("/job-runs", response_model=list[JobRunRead])
+async def list_job_runs(
+    current_user: Annotated[CurrentUser, Depends(get_current_user)],
+    db: Annotated[AsyncSession, Depends(get_db)],
+    job_name: str | None = Query(None),
+    status: str | None = Query(None),
+    limit: int = Query(50, ge=1, le=500),
+) -> list[JobRunRead]:
+    """Recent background job runs, newest first. Requires platform admin."""
+    require_platform_admin(current_user)
+    service = JobRunService(db)
+    runs = await service.get_runs(job_name=job_name, status=status, limit=limit)
+    return [JobRunRead.model_validate(r) for r in runs]
+
+
+@router.get("/job-runs/latest", response_model=list[JobRunRead])
+async def list_latest_job_runs(
+    current_user: Annotated[CurrentUser, Depends(get_current_user)],
+    db: Annotated[AsyncSession, Depends(get_db)],
+) -> list[JobRunRead]:
+    """The last run of each background job. Requires platform admin."""
+    require_platform_admin(current_user)
+    service = JobRunService(db)
+    runs = await service.get_latest_runs()
+    return [JobRunRead.model_validate(r) for r in runs]
+
+
+@router.get("/push-metrics", response_model=PushMetricsRead)
+async def get_push_metrics(
+    current_user: Annotated[CurrentUser, Depends(get_current_user)],
+    db: Annotated[AsyncSession, Depends(get_db)],
+    hours: int = Query(24, ge=1, le=720),
+) -> PushMetricsRead:
+    """Push delivery totals and throughput across all workers. Requires platform admin."""
+    require_platform_admin(current_user)
+    service = PushDeliveryService(db)
+    return PushMetricsRead(**await service.get_metrics(hours))
@@ -21,7 +21,9 @@ from app.schemas.play_cricket import (
     SyncAllResult,
     SyncResult,
 )
+from app.schemas.task import TaskEnqueued
 from app.services.play_cricket_sync_service import PlayCricketSyncService
+from app.services.task_service import TaskService
 
 router = APIRouter(prefix="/clubs/{club_id}/play-cricket", tags=["play-cricket"])
 
@@ -138,3 +140,20 @@ async def sync_all(
     async with client:
         service = PlayCricketSyncService(db, club_id, client)
         return await service.sync_all(site_id, body.season)
+
+
+@router.post("/sync/all/background", response_model=TaskEnqueued, status_code=202)
+async def sync_all_in_background(
+    club_id: Annotated[UUID, Path()],
+    body: PlayCricketSyncRequest,
+    current_user: Annotated[CurrentUser, Depends(get_current_user)],
+    db: Annotated[AsyncSession, Depends(get_db)],
+) -> TaskEnqueued:
+    """Queue a full sync; poll GET /clubs/{club_id}/tasks/{task_id} for the result."""
+    require_admin(current_user, club_id)
+    await _get_club_site_id(db, club_id)
+    service = TaskService(db, club_id)
+    task = await service.enqueue(
+        "play_cricket_sync", {"season": body.season}, created_by=current_user.user_id
+    )
+    return TaskEnqueued(task_id=task.id, status=task.status)
@@ -43,6 +43,17 @@ async def list_players(
     return [PlayerRead.model_validate(p) for p in players]
 
 
+@router.get("/selection-stats", response_model=list[PlayerSelectionStatsRead])
+async def list_player_selection_stats(
+    club_id: Annotated[UUID, Path()],
+    current_user: Annotated[CurrentUser, Depends(get_current_user)],
+    db: Annotated[AsyncSession, Depends(get_db)],
+) -> list[PlayerSelectionStatsRead]:
+    require_member(current_user, club_id)
+    service = LifecycleService(db, club_id)
+    return await service.get_club_selection_stats()
+
+
 @router.post("/", response_model=PlayerRead, status_code=201)
 async def create_player(
     club_id: Annotated[UUID, Path()],
@@ -1,15 +1,24 @@
 from typing import Annotated
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, Path
+from fastapi import APIRouter, Depends, Path, Request
 from fastapi.responses import Response
+from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.conditional import conditional_get, version_source
 from app.core.database import get_db
 from app.core.dependencies import get_current_user
 from app.core.exceptions import NotFoundError
 from app.core.permissions import require_admin_or_captain, require_member
+from app.models.batting_entry import BattingEntry
+from app.models.bowling_entry import BowlingEntry
+from app.models.fixture_type import FixtureType
 from app.models.match import Match
+from app.models.match_innings import MatchInnings
+from app.models.match_opposition_player import MatchOppositionPlayer
+from app.models.player import Player
+from app.models.team import Team
 from app.schemas.auth import CurrentUser
 from app.schemas.scoring import (
     FallOfWicketRead,
@@ -51,11 +60,32 @@ async def _get_match_club_id(match_id: UUID, db: AsyncSession) -> UUID:
 @router.get("/scorecard", response_model=MatchScorecardRead)
 async def get_scorecard(
     match_id: Annotated[UUID, Path()],
+    request: Request,
+    response: Response,
     current_user: Annotated[CurrentUser, Depends(get_current_user)],
     db: Annotated[AsyncSession, Depends(get_db)],
-) -> MatchScorecardRead:
+) -> MatchScorecardRead | Response:
     club_id = await _get_match_club_id(match_id, db)
     require_member(current_user, club_id)
+
+    match_innings = select(MatchInnings.id).where(MatchInnings.match_id == match_id)
+    match_row = select(Match).where(Match.id == match_id).subquery()
+    not_modified = await conditional_get(
+        request,
+        response,
+        db,
+        version_source(Match, Match.id == match_id),
+        version_source(MatchInnings, MatchInnings.match_id == match_id),
+        version_source(BattingEntry, BattingEntry.innings_id.in_(match_innings)),
+        version_source(BowlingEntry, BowlingEntry.innings_id.in_(match_innings)),
+        version_source(MatchOppositionPlayer, MatchOppositionPlayer.match_id == match_id),
+        version_source(Team, Team.id.in_(select(match_row.c.team_id))),
+        version_source(FixtureType, FixtureType.id.in_(select(match_row.c.fixture_type_id))),
+        version_source(Player, Player.id.in_(select(match_row.c.man_of_match_id))),
+    )
+    if not_modified:
+        return not_modified
+
     service = ScoringService(db)
     scorecard = await service.get_scorecard(match_id)
     if not scorecard:
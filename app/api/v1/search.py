@@ -0,0 +1,40 @@
+from datetime import datetime
+from typing import Annotated
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, Path, Query, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.database import get_db
+from app.core.dependencies import get_current_user
+from app.core.pagination import decode_cursor, encode_cursor
+from app.core.permissions import require_member
+from app.schemas.auth import CurrentUser
+from app.schemas.search import SearchResult
+from app.services.search_service import SearchService
+
+router = APIRouter(prefix="/clubs/{club_id}/search", tags=["search"])
+
+
+@router.get("/", response_model=list[SearchResult])
+async def search_club(
+    club_id: Annotated[UUID, Path()],
+    response: Response,
+    current_user: Annotated[CurrentUser, Depends(get_current_user)],
+    db: Annotated[AsyncSession, Depends(get_db)],
+    q: str = Query(..., min_length=1, max_length=200),
+    limit: int = Query(20, ge=1, le=50),
+    cursor: str | None = Query(None),
+) -> list[SearchResult]:
+    """Search the club's messages and announcements, best matches first. When
+    more remain, ``X-Next-Cursor`` holds the ``cursor`` for the next page."""
+    require_member(current_user, club_id)
+    after = decode_cursor(cursor, float, datetime, UUID) if cursor else None
+    service = SearchService(db, club_id)
+    results = await service.search(q, limit=limit, after=after)
+    if len(results) == limit:
+        last = results[-1]
+        response.headers["X-Next-Cursor"] = encode_cursor(
+            last["rank"], last["created_at"], last["id"]
+        )
+    return [SearchResult(**r) for r in results]
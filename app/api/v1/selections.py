@@ -40,7 +40,7 @@ async def set_selections(
 ) -> list[SelectionRead]:
     require_admin_or_captain(current_user, club_id)
     service = SelectionService(db)
-    selections = await service.set_selections(
-        match_id, [s.model_dump() for s in body]
+    selections, _ = await service.set_selections(
+        match_id, [s.model_dump() for s in body], actor_id=current_user.user_id
     )
     return [SelectionRead.model_validate(s) for s in selections]
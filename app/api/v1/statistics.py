@@ -1,12 +1,20 @@
 from typing import Annotated
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, Path, Query
+from fastapi import APIRouter, Depends, Path, Query, Request, Response
+from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.conditional import VersionSource, conditional_get, version_source
 from app.core.database import get_db
 from app.core.dependencies import get_current_user
 from app.core.permissions import require_member
+from app.models.fixture_type import FixtureType
+from app.models.match import Match
+from app.models.match_innings import MatchInnings
+from app.models.match_participation import MatchParticipation
+from app.models.player import Player
+from app.models.team import Team
 from app.schemas.auth import CurrentUser
 from app.schemas.statistics import (
     ClubMatchStatisticsRead,
@@ -20,16 +28,36 @@ from app.services.statistics_service import StatisticsService
 router = APIRouter(prefix="/clubs/{club_id}/match-statistics", tags=["statistics"])
 
 
+def _statistics_sources(club_id: UUID) -> tuple[VersionSource, ...]:
+    """Every table the statistics aggregates read from, scoped to the club."""
+    club_matches = select(Match.id).where(Match.club_id == club_id)
+    return (
+        version_source(Match, Match.club_id == club_id),
+        version_source(MatchInnings, MatchInnings.match_id.in_(club_matches)),
+        version_source(MatchParticipation, MatchParticipation.match_id.in_(club_matches)),
+        version_source(Player, Player.club_id == club_id),
+        version_source(Team, Team.club_id == club_id),
+        version_source(FixtureType, FixtureType.club_id == club_id),
+    )
+
+
 @router.get("/", response_model=ClubMatchStatisticsRead)
 async def get_club_match_statistics(
     club_id: Annotated[UUID, Path()],
+    request: Request,
+    response: Response,
     current_user: Annotated[CurrentUser, Depends(get_current_user)],
     db: Annotated[AsyncSession, Depends(get_db)],
     team_id: UUID | None = Query(None),
     season_id: UUID | None = Query(None),
     fixture_type_id: UUID | None = Query(None),
-) -> ClubMatchStatisticsRead:
+) -> ClubMatchStatisticsRead | Response:
     require_member(current_user, club_id)
+    not_modified = await conditional_get(
+        request, response, db, *_statistics_sources(club_id)
+    )
+    if not_modified:
+        return not_modified
     service = StatisticsService(db, club_id)
     stats = await service.get_club_statistics(
         team_id=team_id, season_id=season_id, fixture_type_id=fixture_type_id
@@ -40,11 +68,18 @@ async def get_club_match_statistics(
 @router.get("/teams", response_model=list[TeamMatchStatisticsRead])
 async def get_team_match_statistics(
     club_id: Annotated[UUID, Path()],
+    request: Request,
+    response: Response,
     current_user: Annotated[CurrentUser, Depends(get_current_user)],
     db: Annotated[AsyncSession, Depends(get_db)],
     season_id: UUID | None = Query(None),
-) -> list[TeamMatchStatisticsRead]:
+) -> list[TeamMatchStatisticsRead] | Response:
     require_member(current_user, club_id)
+    not_modified = await conditional_get(
+        request, response, db, *_statistics_sources(club_id)
+    )
+    if not_modified:
+        return not_modified
     service = StatisticsService(db, club_id)
     return await service.get_team_statistics(season_id=season_id)
 
@@ -52,12 +87,19 @@ async def get_team_match_statistics(
 @router.get("/types", response_model=list[MatchTypeStatisticsRead])
 async def get_match_type_statistics(
     club_id: Annotated[UUID, Path()],
+    request: Request,
+    response: Response,
     current_user: Annotated[CurrentUser, Depends(get_current_user)],
     db: Annotated[AsyncSession, Depends(get_db)],
     season_id: UUID | None = Query(None),
     team_id: UUID | None = Query(None),
-) -> list[MatchTypeStatisticsRead]:
+) -> list[MatchTypeStatisticsRead] | Response:
     require_member(current_user, club_id)
+    not_modified = await conditional_get(
+        request, response, db, *_statistics_sources(club_id)
+    )
+    if not_modified:
+        return not_modified
     service = StatisticsService(db, club_id)
     return await service.get_type_statistics(season_id=season_id, team_id=team_id)
 
@@ -65,12 +107,19 @@ async def get_match_type_statistics(
 @router.get("/players", response_model=list[PlayerMatchRecordRead])
 async def get_player_match_records(
     club_id: Annotated[UUID, Path()],
+    request: Request,
+    response: Response,
     current_user: Annotated[CurrentUser, Depends(get_current_user)],
     db: Annotated[AsyncSession, Depends(get_db)],
     player_id: UUID | None = Query(None),
     season_id: UUID | None = Query(None),
-) -> list[PlayerMatchRecordRead]:
+) -> list[PlayerMatchRecordRead] | Response:
     require_member(current_user, club_id)
+    not_modified = await conditional_get(
+        request, response, db, *_statistics_sources(club_id)
+    )
+    if not_modified:
+        return not_modified
     service = StatisticsService(db, club_id)
     return await service.get_player_records(player_id=player_id, season_id=season_id)
 
@@ -78,12 +127,19 @@ async def get_player_match_records(
 @router.get("/recent", response_model=list[RecentMatchResultRead])
 async def get_recent_match_results(
     club_id: Annotated[UUID, Path()],
+    request: Request,
+    response: Response,
     current_user: Annotated[CurrentUser, Depends(get_current_user)],
     db: Annotated[AsyncSession, Depends(get_db)],
     limit: int = Query(10, ge=1, le=50),
     team_id: UUID | None = Query(None),
     season_id: UUID | None = Query(None),
-) -> list[RecentMatchResultRead]:
+) -> list[RecentMatchResultRead] | Response:
     require_member(current_user, club_id)
+    not_modified = await conditional_get(
+        request, response, db, *_statistics_sources(club_id)
+    )
+    if not_modified:
+        return not_modified
     service = StatisticsService(db, club_id)
     return await service.get_recent_results(limit=limit, team_id=team_id, season_id=season_id)
@@ -0,0 +1,31 @@
+from typing import Annotated
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, Path
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.database import get_db
+from app.core.dependencies import get_current_user
+from app.core.exceptions import NotFoundError
+from app.core.permissions import require_member
+from app.schemas.auth import CurrentUser
+from app.schemas.task import TaskRead
+from app.services.task_service import TaskService
+
+router = APIRouter(prefix="/clubs/{club_id}/tasks", tags=["tasks"])
+
+
+@router.get("/{task_id}", response_model=TaskRead)
+async def get_task(
+    club_id: Annotated[UUID, Path()],
+    task_id: Annotated[UUID, Path()],
+    current_user: Annotated[CurrentUser, Depends(get_current_user)],
+    db: Annotated[AsyncSession, Depends(get_db)],
+) -> TaskRead:
+    """Status of a background task queued for this club."""
+    require_member(current_user, club_id)
+    service = TaskService(db, club_id)
+    task = await service.get_by_id(task_id)
+    if not task:
+        raise NotFoundError("Task not found")
+    return TaskRead.model_validate(task)
@@ -37,6 +37,59 @@ class Settings(BaseSettings):
     play_cricket_api_url: str = "https://www.play-cricket.com/api/v2"
     play_cricket_api_token: str = ""
 
+    # Background job scheduler
+    scheduler_enabled: bool = True
+    scheduler_shutdown_timeout: float = 30.0
+
+    # Background task queue
+    task_worker_in_process: bool = False  # run a worker inside each API service
+    task_worker_concurrency: int = 4
+    task_club_concurrency: int = 2
+    task_poll_interval: float = 1.0
+    task_lease_seconds: int = 900
+    task_retry_base_seconds: float = 10.0
+    task_retry_max_seconds: float = 3600.0
+
+    # Push notifications
+    push_provider: str = "expo"  # expo | none
+    push_api_url: str = "https://exp.host/--/api/v2/push/send"
+    push_access_token: str = ""
+    push_concurrency: int = 8  # provider requests in flight per delivery
+    push_max_retries: int = 3
+
+    # Notification retention: read notifications older than this move to the archive
+    notification_retention_days: int = 90
+    notification_archive_batch_size: int = 5000
+
+    # Realtime fan-out between workers: postgres (LISTEN/NOTIFY) | local (single process only)
+    realtime_broker: str = "postgres"
+
+    # Notification streams (SSE)
+    sse_max_connections: int = 1000  # open streams per worker
+    sse_heartbeat_seconds: float = 15.0
+
+    # Channel messaging WebSocket
+    ws_max_connections: int = 5000  # open sockets per worker
+    ws_send_queue_size: int = 256  # events buffered per socket before it is dropped as slow
+
+    # Channel read cursors are buffered per worker and written in one upsert this often
+    read_cursor_flush_seconds: float = 2.0
+
+    # Media uploads
+    media_storage_backend: str = "local"  # local
+    media_storage_path: str = "var/media"
+    media_public_url: str = "/media"
+    media_upload_max_bytes: int = 2 * 1024**3
+    # Largest PATCH body; keep nginx client_max_body_size for uploads in step
+    media_upload_chunk_max_bytes: int = 16 * 1024**2
+    media_upload_expiry_hours: int = 24  # unfinished uploads are discarded after this
+    # Derivatives render in a process pool inside the task worker; 0 = one process per core
+    media_derivative_workers: int = 0
+    media_derivative_max_source_bytes: int = 64 * 1024**2  # larger images keep their original
+
+    # Dashboard summaries are cached per club and dropped on writes; this is a backstop
+    summary_cache_seconds: float = 60.0
+
     # Pagination
     default_page_size: int = 20
     max_page_size: int = 100
@@ -0,0 +1,176 @@
+"""Fan-out of channel events to connected messaging WebSockets.
+
+Every write to a channel (new message, pin, delete, reaction) calls
+:func:`publish_channel_event` in its transaction. With the ``postgres``
+realtime broker the event travels as the payload of ``pg_notify`` on
+``channel_events``, so every worker's :class:`PostgresChannelHub` receives it
+on commit and delivers it to its own sockets subscribed to that channel.
+
+Each socket has a bounded send queue drained by its own writer task, so one
+slow client never delays the others: delivery is a non-blocking
+``put_nowait``, and a socket whose queue fills up is marked overflowed and
+disconnected. It reconnects and catches up through the REST message history.
+"""
+
+import asyncio
+import json
+import logging
+from collections.abc import Awaitable, Callable
+from uuid import UUID
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import get_settings
+from app.core.pubsub import (
+    ConnectionLimitError,
+    PostgresListener,
+    run_after_commit,
+    uses_postgres,
+)
+
+logger = logging.getLogger(__name__)
+
+CHANNEL = "channel_events"
+# NOTIFY payloads must stay under 8000 bytes; larger messages are sent by id
+MAX_PAYLOAD_BYTES = 7900
+
+
+class ChannelConnection:
+    def __init__(
+        self,
+        user_id: UUID,
+        send: Callable[[dict], Awaitable[None]],
+        queue_size: int | None = None,
+    ):
+        self.user_id = user_id
+        self.send = send
+        self.channels: set[UUID] = set()
+        self.queue: asyncio.Queue[dict] = asyncio.Queue(
+            queue_size or get_settings().ws_send_queue_size
+        )
+        self.overflowed = asyncio.Event()
+
+    def offer(self, event: dict) -> bool:
+        """Queue ``event`` without waiting; False (and overflowed) if the client is behind."""
+        if self.overflowed.is_set():
+            return False
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            self.overflowed.set()
+            return False
+        return True
+
+    async def drain(self) -> None:
+        """Send queued events in order until cancelled."""
+        while True:
+            event = await self.queue.get()
+            await self.send(event)
+
+
+class ChannelHub:
+    """In-process map of channels to the sockets subscribed to them."""
+
+    def __init__(self, max_connections: int | None = None, session_factory=None):
+        self.max_connections = max_connections or get_settings().ws_max_connections
+        self.session_factory = session_factory
+        self._connections: set[ChannelConnection] = set()
+        self._channels: dict[UUID, set[ChannelConnection]] = {}
+
+    @property
+    def connection_count(self) -> int:
+        return len(self._connections)
+
+    def connect(self, connection: ChannelConnection) -> None:
+        if len(self._connections) >= self.max_connections:
+            raise ConnectionLimitError()
+        self._connections.add(connection)
+
+    def disconnect(self, connection: ChannelConnection) -> None:
+        for channel_id in list(connection.channels):
+            self.leave(connection, channel_id)
+        self._connections.discard(connection)
+
+    def join(self, connection: ChannelConnection, channel_id: UUID) -> None:
+        connection.channels.add(channel_id)
+        self._channels.setdefault(channel_id, set()).add(connection)
+
+    def leave(self, connection: ChannelConnection, channel_id: UUID) -> None:
+        connection.channels.discard(channel_id)
+        subscribers = self._channels.get(channel_id)
+        if subscribers is not None:
+            subscribers.discard(connection)
+            if not subscribers:
+                del self._channels[channel_id]
+
+    def deliver(self, event: dict) -> int:
+        """Offer ``event`` to every subscriber of its channel; returns how many took it."""
+        subscribers = self._channels.get(UUID(event["channel_id"]), ())
+        return sum(connection.offer(event) for connection in list(subscribers))
+
+    async def start(self) -> None:
+        pass
+
+    async def stop(self) -> None:
+        pass
+
+
+class PostgresChannelHub(ChannelHub):
+    """Feeds :meth:`deliver` from ``LISTEN channel_events``."""
+
+    def __init__(self, max_connections: int | None = None, session_factory=None):
+        super().__init__(max_connections, session_factory)
+        self._listener = PostgresListener(CHANNEL, self._on_notify)
+        self._pending: set[asyncio.Task] = set()
+
+    async def start(self) -> None:
+        await self._listener.start()
+
+    async def stop(self) -> None:
+        await self._listener.stop()
+
+    def _on_notify(self, payload: str) -> None:
+        event = json.loads(payload)
+        if UUID(event["channel_id"]) not in self._channels:
+            return
+        if event["type"] == "message.created" and "message" not in event:
+            # Too large to inline: load it once here for all local subscribers
+            task = asyncio.create_task(self._load_and_deliver(event))
+            self._pending.add(task)
+            task.add_done_callback(self._pending.discard)
+            return
+        self.deliver(event)
+
+    async def _load_and_deliver(self, event: dict) -> None:
+        from app.services.messaging_service import MessagingService
+
+        session_factory = self.session_factory
+        if session_factory is None:
+            from app.core.database import async_session_factory as session_factory
+        async with session_factory() as db:
+            message = await MessagingService.get_message_for_event(db, UUID(event["message_id"]))
+        if message is not None:
+            self.deliver({**event, "message": message})
+
+
+def create_hub() -> ChannelHub:
+    return PostgresChannelHub() if uses_postgres() else ChannelHub()
+
+
+hub = create_hub()
+
+
+async def publish_channel_event(db: AsyncSession, event: dict) -> None:
+    """Deliver ``event`` to the channel's subscribers once the transaction commits.
+
+    ``event`` must be JSON-serialisable and carry ``type`` and ``channel_id``.
+    """
+    if not uses_postgres():
+        run_after_commit(db, lambda: hub.deliver(event))
+        return
+    payload = json.dumps(event)
+    if len(payload.encode()) > MAX_PAYLOAD_BYTES and "message" in event:
+        stripped = {k: v for k, v in event.items() if k != "message"}
+        payload = json.dumps({**stripped, "message_id": event["message"]["id"]})
+    await db.execute(select(func.pg_notify(CHANNEL, payload)))
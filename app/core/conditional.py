@@ -0,0 +1,135 @@
+"""HTTP conditional GET (ETag / Last-Modified) for read-mostly resources.
+
+A resource's version is a cheap fingerprint of the tables it is built from:
+row count, ``sum(xmin)`` and ``max(updated_at)`` per source, all gathered in a
+single SELECT. ``xmin`` changes on every insert and update and the count changes
+on every delete, so the fingerprint moves with any write -- including bulk Core
+statements and tables without an ``updated_at`` column -- without each write
+path having to bump a counter.
+
+Usage in an endpoint::
+
+    not_modified = await conditional_get(
+        request, response, db, version_source(FAQ, FAQ.club_id == club_id)
+    )
+    if not_modified:
+        return not_modified
+"""
+
+import hashlib
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from email.utils import format_datetime
+
+from fastapi import Request, Response
+from sqlalchemy import (
+    BigInteger,
+    ColumnElement,
+    Subquery,
+    Text,
+    cast,
+    func,
+    literal_column,
+    select,
+)
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import get_settings
+from app.models.base import Base
+
+CACHE_CONTROL = "private, no-cache"
+
+
+@dataclass(frozen=True)
+class VersionSource:
+    model: type[Base]
+    filters: tuple[ColumnElement[bool], ...]
+
+
+@dataclass(frozen=True)
+class ResourceVersion:
+    etag: str
+    last_modified: datetime | None
+
+
+def version_source(model: type[Base], *filters: ColumnElement[bool]) -> VersionSource:
+    """Describe one table (and the rows of it) that a response is built from."""
+    return VersionSource(model=model, filters=filters)
+
+
+def _source_aggregate(source: VersionSource, index: int) -> Subquery:
+    table = source.model.__table__
+    xmin = cast(cast(literal_column(f"{table.name}.xmin"), Text), BigInteger)
+    columns = [func.count().label("rows"), func.coalesce(func.sum(xmin), 0).label("xmin_sum")]
+    if "updated_at" in table.c:
+        columns.append(func.max(table.c.updated_at).label("last_modified"))
+    # Each aggregate yields exactly one row, so the sources cross join into one.
+    return select(*columns).select_from(table).where(*source.filters).subquery(f"v{index}")
+
+
+async def get_resource_version(
+    db: AsyncSession, request: Request, *sources: VersionSource
+) -> ResourceVersion:
+    """Fingerprint the given sources in one round trip and derive the validators."""
+    aggregates = [_source_aggregate(source, i) for i, source in enumerate(sources)]
+    columns = [col for aggregate in aggregates for col in aggregate.c]
+    row = (await db.execute(select(*columns))).one()
+
+    timestamps = [value for value in row if isinstance(value, datetime)]
+    last_modified = max(timestamps) if timestamps else None
+
+    # The path and query string are part of the tag so that differently filtered
+    # views of the same tables never share a validator; the app version guards
+    # against serving a 304 across a deploy that changed the response shape.
+    digest = hashlib.sha1(
+        "|".join(
+            [
+                get_settings().app_version,
+                request.url.path,
+                str(request.url.query),
+                *(str(value) for value in row),
+            ]
+        ).encode()
+    ).hexdigest()
+    return ResourceVersion(etag=f'W/"{digest}"', last_modified=last_modified)
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(
+        candidate.strip().removeprefix("W/") == opaque
+        for candidate in if_none_match.split(",")
+    )
+
+
+def _validator_headers(version: ResourceVersion) -> dict[str, str]:
+    headers = {"ETag": version.etag, "Cache-Control": CACHE_CONTROL}
+    if version.last_modified is not None:
+        headers["Last-Modified"] = format_datetime(
+            version.last_modified.astimezone(timezone.utc), usegmt=True
+        )
+    return headers
+
+
+async def conditional_get(
+    request: Request,
+    response: Response,
+    db: AsyncSession,
+    *sources: VersionSource,
+) -> Response | None:
+    """Return a 304 response if the client's copy is current, else stamp validators.
+
+    When ``None`` is returned the ETag/Last-Modified headers have been set on
+    ``response`` and the caller should build the body as usual.
+    """
+    version = await get_resource_version(db, request, *sources)
+    headers = _validator_headers(version)
+
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and _etag_matches(if_none_match, version.etag):
+        return Response(status_code=304, headers=headers)
+
+    response.headers.update(headers)
+    return None
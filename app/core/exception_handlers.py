@@ -3,6 +3,7 @@ from fastapi.responses import JSONResponse
 
 from app.core.exceptions import (
     AuthenticationError,
+    BadRequestError,
     ConflictError,
     ForbiddenError,
     NotFoundError,
@@ -33,3 +34,9 @@ def register_exception_handlers(app: FastAPI) -> None:
         request: Request, exc: ConflictError
     ) -> JSONResponse:
         return JSONResponse(status_code=409, content={"detail": exc.detail})
+
+    @app.exception_handler(BadRequestError)
+    async def bad_request_error_handler(
+        request: Request, exc: BadRequestError
+    ) -> JSONResponse:
+        return JSONResponse(status_code=400, content={"detail": exc.detail})
@@ -16,3 +16,8 @@ class NotFoundError(Exception):
 class ConflictError(Exception):
     def __init__(self, detail: str = "Conflict"):
         self.detail = detail
+
+
+class BadRequestError(Exception):
+    def __init__(self, detail: str = "Bad request"):
+        self.detail = detail
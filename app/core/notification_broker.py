@@ -0,0 +1,133 @@
+"""Wakes notification streams when a user's notifications change.
+
+Writers call :func:`notify_users` inside their transaction. With the
+``postgres`` realtime broker that issues ``pg_notify`` on the ``notifications``
+channel, which each worker listens on; with ``local`` it publishes in-process
+after commit (see :mod:`app.core.pubsub`).
+
+Subscribers get an :class:`asyncio.Event` that is set whenever their user has
+something new; the stream re-reads its state then, so idle streams cost no
+queries and a burst of changes costs one.
+"""
+
+import asyncio
+import logging
+from collections.abc import Iterable
+from uuid import UUID
+
+from sqlalchemy import String, func, literal, select
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import get_settings
+from app.core.pubsub import (
+    ConnectionLimitError,
+    PostgresListener,
+    run_after_commit,
+    uses_postgres,
+)
+
+logger = logging.getLogger(__name__)
+
+CHANNEL = "notifications"
+
+
+class Subscription:
+    def __init__(self, broker: "NotificationBroker", user_id: UUID):
+        self.broker = broker
+        self.user_id = user_id
+        self.wake = asyncio.Event()
+
+    def close(self) -> None:
+        self.broker._unsubscribe(self)
+
+
+class NotificationBroker:
+    """In-process fan-out from user ids to their open streams."""
+
+    def __init__(self, max_connections: int | None = None):
+        self.max_connections = max_connections or get_settings().sse_max_connections
+        self._subscriptions: dict[UUID, set[Subscription]] = {}
+        self._count = 0
+
+    @property
+    def connection_count(self) -> int:
+        return self._count
+
+    @property
+    def is_full(self) -> bool:
+        return self._count >= self.max_connections
+
+    def subscribe(self, user_id: UUID) -> Subscription:
+        if self.is_full:
+            raise ConnectionLimitError()
+        subscription = Subscription(self, user_id)
+        self._subscriptions.setdefault(user_id, set()).add(subscription)
+        self._count += 1
+        return subscription
+
+    def _unsubscribe(self, subscription: Subscription) -> None:
+        subscriptions = self._subscriptions.get(subscription.user_id)
+        if subscriptions is None or subscription not in subscriptions:
+            return
+        subscriptions.discard(subscription)
+        if not subscriptions:
+            del self._subscriptions[subscription.user_id]
+        self._count -= 1
+
+    def publish(self, user_ids: Iterable[UUID]) -> None:
+        for user_id in user_ids:
+            for subscription in self._subscriptions.get(user_id, ()):
+                subscription.wake.set()
+
+    def publish_all(self) -> None:
+        """Wake every stream, e.g. after events may have been missed."""
+        self.publish(list(self._subscriptions))
+
+    async def start(self) -> None:
+        pass
+
+    async def stop(self) -> None:
+        pass
+
+
+class PostgresNotificationBroker(NotificationBroker):
+    """Feeds :meth:`publish` from ``LISTEN notifications``."""
+
+    def __init__(self, max_connections: int | None = None):
+        super().__init__(max_connections)
+        self._listener = PostgresListener(CHANNEL, self._on_notify, on_connect=self.publish_all)
+
+    async def start(self) -> None:
+        await self._listener.start()
+
+    async def stop(self) -> None:
+        await self._listener.stop()
+
+    def _on_notify(self, payload: str) -> None:
+        try:
+            user_id = UUID(payload)
+        except ValueError:
+            logger.warning("Ignoring malformed notification payload %r", payload)
+            return
+        self.publish([user_id])
+
+
+def create_broker() -> NotificationBroker:
+    return PostgresNotificationBroker() if uses_postgres() else NotificationBroker()
+
+
+broker = create_broker()
+
+
+async def notify_users(db: AsyncSession, user_ids: Iterable[UUID]) -> None:
+    """Wake these users' streams once the current transaction commits."""
+    user_ids = set(user_ids)
+    if not user_ids:
+        return
+    if uses_postgres():
+        # One NOTIFY per user; Postgres folds duplicates within a transaction
+        payloads = literal(sorted(str(u) for u in user_ids), ARRAY(String))
+        await db.execute(select(func.pg_notify(CHANNEL, func.unnest(payloads))))
+    else:
+        run_after_commit(db, lambda: broker.publish(user_ids))
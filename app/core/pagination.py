@@ -1,6 +1,13 @@
-from typing import Generic, TypeVar
+import base64
+import json
+from datetime import datetime
+from typing import Any, Generic, TypeVar
+from uuid import UUID
 
 from pydantic import BaseModel
+from sqlalchemy import ColumnElement, literal, tuple_
+
+from app.core.exceptions import BadRequestError
 
 T = TypeVar("T")
 
@@ -15,3 +22,38 @@ class PaginatedResponse(BaseModel, Generic[T]):
     total: int
     offset: int
     limit: int
+
+
+# Keyset pagination: a cursor encodes the sort key of the last row on a page and
+# the next page is the rows strictly after it, which an index on the sort key
+# serves in constant time however deep the client has paged.
+
+
+def encode_cursor(*values: datetime | UUID | str | int | float) -> str:
+    """Opaque cursor for the sort key ``values`` of the last row on a page."""
+    raw = json.dumps([v.isoformat() if isinstance(v, datetime) else str(v) for v in values])
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, *types: type) -> tuple[Any, ...]:
+    """Decode a cursor from :func:`encode_cursor` back into values of ``types``."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        values = json.loads(raw)
+        if len(values) != len(types):
+            raise ValueError(cursor)
+        return tuple(
+            datetime.fromisoformat(v) if t is datetime else t(v)
+            for t, v in zip(types, values)
+        )
+    except (ValueError, TypeError) as exc:
+        raise BadRequestError("Invalid cursor") from exc
+
+
+def keyset_after(columns: list, values: tuple, *, descending: bool = True) -> ColumnElement:
+    """Rows after ``values`` in ``columns`` order, compared as one row value."""
+    # Bind each value as its column's type (e.g. timestamptz, not timestamp)
+    bound = tuple_(*(literal(v, c.type) for c, v in zip(columns, values)))
+    if descending:
+        return tuple_(*columns) < bound
+    return tuple_(*columns) > bound
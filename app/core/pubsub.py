@@ -0,0 +1,114 @@
+"""Building blocks for pushing database changes to connected clients.
+
+:class:`PostgresListener` keeps one dedicated connection ``LISTEN``-ing on a
+channel and hands each payload to a callback, reconnecting when the
+connection drops. :func:`run_after_commit` defers an in-process publish until
+the session's transaction commits, which is the ``local`` counterpart of
+``pg_notify`` (Postgres also only delivers notifications on commit).
+
+``REALTIME_BROKER`` picks between the two: ``postgres`` for any deployment
+with more than one worker, ``local`` when writers and subscribers share a
+single process.
+"""
+
+import asyncio
+import logging
+from collections.abc import Callable
+
+import asyncpg
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+_PENDING_KEY = "pubsub.after_commit"
+
+
+class ConnectionLimitError(Exception):
+    """This worker already serves as many client connections as it allows."""
+
+
+def uses_postgres() -> bool:
+    broker = get_settings().realtime_broker
+    if broker not in ("postgres", "local"):
+        raise ValueError(f"Unknown realtime broker {broker!r}")
+    return broker == "postgres"
+
+
+class PostgresListener:
+    def __init__(
+        self,
+        channel: str,
+        callback: Callable[[str], None],
+        *,
+        on_connect: Callable[[], None] | None = None,
+        keepalive: float = 30.0,
+    ):
+        url = make_url(get_settings().database_url).set(drivername="postgresql")
+        self._dsn = url.render_as_string(hide_password=False)
+        self.channel = channel
+        self.callback = callback
+        self.on_connect = on_connect
+        self.keepalive = keepalive
+        self._task: asyncio.Task | None = None
+
+    async def start(self) -> None:
+        if not self._task:
+            self._task = asyncio.create_task(self._listen(), name=f"listen:{self.channel}")
+
+    async def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def _listen(self) -> None:
+        while True:
+            conn = None
+            try:
+                conn = await asyncpg.connect(self._dsn)
+                await conn.add_listener(self.channel, self._on_notify)
+                if self.on_connect:
+                    # Anything sent while we were disconnected was lost
+                    self.on_connect()
+                while not conn.is_closed():
+                    await asyncio.sleep(self.keepalive)
+                    await conn.execute("SELECT 1")
+            except asyncio.CancelledError:
+                if conn is not None:
+                    await conn.close(timeout=5)
+                raise
+            except Exception:
+                logger.exception("Listener on %r lost its connection; reconnecting", self.channel)
+            if conn is not None and not conn.is_closed():
+                conn.terminate()
+            await asyncio.sleep(1)
+
+    def _on_notify(self, connection, pid: int, channel: str, payload: str) -> None:
+        try:
+            self.callback(payload)
+        except Exception:
+            logger.exception("Listener on %r could not handle %r", self.channel, payload)
+
+
+def run_after_commit(db: AsyncSession, func: Callable[[], None]) -> None:
+    """Call ``func`` once the session's current transaction commits; drop it on rollback."""
+    db.sync_session.info.setdefault(_PENDING_KEY, []).append(func)
+
+
+@event.listens_for(Session, "after_commit")
+def _run_pending(session: Session) -> None:
+    for func in session.info.pop(_PENDING_KEY, ()):
+        try:
+            func()
+        except Exception:
+            logger.exception("After-commit publish failed")
+
+
+@event.listens_for(Session, "after_rollback")
+def _drop_pending(session: Session) -> None:
+    session.info.pop(_PENDING_KEY, None)
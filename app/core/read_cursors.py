@@ -0,0 +1,102 @@
+"""Write-behind buffer for channel read cursors.
+
+Clients report the newest message they have seen as the user scrolls, which
+can be several times a second. :class:`ReadCursorBuffer` keeps only the
+furthest position per (user, channel) in memory and writes everything
+pending in one upsert every ``READ_CURSOR_FLUSH_SECONDS``, so a burst of
+reports costs one row write. A cursor lost in a crash just shows a few
+messages as unread again.
+"""
+
+import asyncio
+import logging
+from datetime import datetime
+from uuid import UUID
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+CursorKey = tuple[UUID, UUID]  # (user_id, channel_id)
+Position = tuple[datetime, UUID]  # (created_at, message_id)
+
+
+class ReadCursorBuffer:
+    def __init__(self, flush_seconds: float | None = None, session_factory=None):
+        self.flush_seconds = flush_seconds or get_settings().read_cursor_flush_seconds
+        self.session_factory = session_factory
+        self._pending: dict[CursorKey, Position] = {}
+        self._task: asyncio.Task | None = None
+
+    @property
+    def pending_count(self) -> int:
+        return len(self._pending)
+
+    def record(
+        self, user_id: UUID, channel_id: UUID, created_at: datetime, message_id: UUID
+    ) -> None:
+        """Note that the user has read up to this message; older positions are ignored."""
+        key = (user_id, channel_id)
+        position = (created_at, message_id)
+        current = self._pending.get(key)
+        if current is None or position > current:
+            self._pending[key] = position
+
+    async def flush(self, db: AsyncSession | None = None, *, user_id: UUID | None = None) -> int:
+        """Write pending cursors, all of them or only ``user_id``'s; returns how many.
+
+        With ``db`` the upsert joins that session's transaction and the caller
+        commits; otherwise it runs and commits in a session of its own.
+        """
+        from app.services.messaging_service import MessagingService
+
+        if user_id is None:
+            batch, self._pending = self._pending, {}
+        else:
+            keys = [key for key in self._pending if key[0] == user_id]
+            batch = {key: self._pending.pop(key) for key in keys}
+        if not batch:
+            return 0
+        try:
+            if db is not None:
+                await MessagingService.save_read_cursors(db, batch)
+            else:
+                session_factory = self.session_factory
+                if session_factory is None:
+                    from app.core.database import async_session_factory as session_factory
+                async with session_factory() as session:
+                    await MessagingService.save_read_cursors(session, batch)
+                    await session.commit()
+        except Exception:
+            # Keep them for the next flush, unless newer positions arrived meanwhile
+            for (user, channel), (created_at, message_id) in batch.items():
+                self.record(user, channel, created_at, message_id)
+            raise
+        return len(batch)
+
+    async def start(self) -> None:
+        if not self._task:
+            self._task = asyncio.create_task(self._run(), name="read-cursor-flush")
+
+    async def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        try:
+            await self.flush()
+        except Exception:
+            logger.exception("Could not write %d read cursors on shutdown", self.pending_count)
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.flush_seconds)
+            try:
+                await self.flush()
+            except Exception:
+                logger.exception("Read cursor flush failed; retrying next interval")
+
+
+read_cursors = ReadCursorBuffer()
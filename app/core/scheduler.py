@@ -0,0 +1,252 @@
+"""Lightweight in-process scheduler for periodic background jobs.
+
+Each service starts a :class:`Scheduler` in its lifespan with the jobs it owns.
+Every job runs in its own asyncio task, so request handling is never blocked.
+When several replicas run the same job, ``pg_try_advisory_xact_lock`` plus a
+claim row in ``job_runs`` (unique per job and scheduled slot) make sure each
+slot is executed exactly once. Every run is recorded with its duration, rows
+affected and error, for the platform admin job-run view.
+
+Usage::
+
+    scheduler = Scheduler()
+    scheduler.add_job("match_reminders", "0 * * * *", generate_reminders, jitter=60)
+    await scheduler.start()
+    ...
+    await scheduler.stop()
+"""
+
+import asyncio
+import logging
+import random
+import socket
+import time
+import traceback
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from uuid import UUID
+
+from sqlalchemy import func, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.config import get_settings
+from app.models.job_run import JobRun
+
+logger = logging.getLogger(__name__)
+
+JobFunc = Callable[[AsyncSession], Awaitable[int | None]]
+
+# (low, high) for the five cron fields; weekday 7 is an alias for Sunday (0)
+_CRON_FIELDS = ((0, 59), (0, 23), (1, 31), (1, 12), (0, 7))
+
+
+class CronSchedule:
+    """A standard five-field cron expression (minute hour day month weekday).
+
+    Fields accept ``*``, numbers, ranges (``1-5``), lists (``1,15``) and steps
+    (``*/15``, ``0-30/10``). Weekday 0 and 7 are Sunday. As in cron, when both
+    day and weekday are restricted a time matches if either does.
+    """
+
+    def __init__(self, expression: str):
+        parts = expression.split()
+        if len(parts) != len(_CRON_FIELDS):
+            raise ValueError(f"Cron expression must have 5 fields: {expression!r}")
+        self.expression = expression
+        self.minutes, self.hours, self.days, self.months, weekdays = (
+            _parse_field(part, low, high) for part, (low, high) in zip(parts, _CRON_FIELDS)
+        )
+        self.weekdays = {d % 7 for d in weekdays}
+        self._any_day = parts[2] == "*"
+        self._any_weekday = parts[4] == "*"
+
+    def _day_matches(self, when: datetime) -> bool:
+        day_ok = when.day in self.days
+        weekday_ok = (when.weekday() + 1) % 7 in self.weekdays
+        if self._any_day or self._any_weekday:
+            return day_ok and weekday_ok
+        return day_ok or weekday_ok
+
+    def next_after(self, after: datetime) -> datetime:
+        """The first matching minute strictly after ``after``."""
+        when = after.replace(second=0, microsecond=0) + timedelta(minutes=1)
+        limit = when + timedelta(days=366 * 5)
+        while when < limit:
+            if when.month not in self.months:
+                years, month = divmod(when.month, 12)
+                when = when.replace(
+                    year=when.year + years, month=month + 1, day=1, hour=0, minute=0
+                )
+            elif not self._day_matches(when):
+                when = (when + timedelta(days=1)).replace(hour=0, minute=0)
+            elif when.hour not in self.hours:
+                when = (when + timedelta(hours=1)).replace(minute=0)
+            elif when.minute not in self.minutes:
+                when += timedelta(minutes=1)
+            else:
+                return when
+        raise ValueError(f"Cron expression never matches: {self.expression!r}")
+
+
+def _parse_field(field: str, low: int, high: int) -> set[int]:
+    values: set[int] = set()
+    for part in field.split(","):
+        part, _, step_text = part.partition("/")
+        step = int(step_text) if step_text else 1
+        if part == "*":
+            start, end = low, high
+        elif "-" in part:
+            start_text, end_text = part.split("-", 1)
+            start, end = int(start_text), int(end_text)
+        else:
+            start = end = int(part)
+            if step_text:
+                end = high
+        if start < low or end > high or start > end or step < 1:
+            raise ValueError(f"Invalid cron field {field!r}")
+        values.update(range(start, end + 1, step))
+    return values
+
+
+@dataclass(frozen=True)
+class Job:
+    name: str
+    schedule: CronSchedule
+    func: JobFunc
+    # Random delay (seconds) added to each run so replicas and jobs don't all fire at once
+    jitter: float = 0.0
+
+
+class Scheduler:
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession] | None = None,
+        *,
+        instance: str | None = None,
+    ):
+        if session_factory is None:
+            from app.core.database import async_session_factory
+
+            session_factory = async_session_factory
+        self.session_factory = session_factory
+        self.instance = instance or socket.gethostname()
+        self.jobs: dict[str, Job] = {}
+        self._tasks: list[asyncio.Task] = []
+        self._stopping: asyncio.Event | None = None
+
+    def add_job(self, name: str, cron: str, func: JobFunc, *, jitter: float = 0.0) -> None:
+        if name in self.jobs:
+            raise ValueError(f"Job {name!r} is already registered")
+        self.jobs[name] = Job(name=name, schedule=CronSchedule(cron), func=func, jitter=jitter)
+
+    async def start(self) -> None:
+        if not get_settings().scheduler_enabled or self._tasks:
+            return
+        self._stopping = asyncio.Event()
+        self._tasks = [
+            asyncio.create_task(self._loop(job), name=f"job:{job.name}")
+            for job in self.jobs.values()
+        ]
+        logger.info("Scheduler started with jobs: %s", ", ".join(self.jobs) or "none")
+
+    async def stop(self, timeout: float | None = None) -> None:
+        """Stop scheduling; give in-flight runs ``timeout`` seconds, then cancel them."""
+        if not self._tasks:
+            return
+        if timeout is None:
+            timeout = get_settings().scheduler_shutdown_timeout
+        self._stopping.set()
+        _, pending = await asyncio.wait(self._tasks, timeout=timeout)
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+        self._tasks = []
+
+    async def _loop(self, job: Job) -> None:
+        while not self._stopping.is_set():
+            now = datetime.now(timezone.utc)
+            scheduled_at = job.schedule.next_after(now)
+            delay = (scheduled_at - now).total_seconds() + random.uniform(0, job.jitter)
+            try:
+                await asyncio.wait_for(self._stopping.wait(), timeout=delay)
+                return
+            except TimeoutError:
+                pass
+            try:
+                await self.run_job(job, scheduled_at)
+            except Exception:
+                # Bookkeeping failures (e.g. the database is down) must not kill the loop
+                logger.exception("Scheduler could not run job %s", job.name)
+
+    async def run_job(self, job: Job, scheduled_at: datetime) -> UUID | None:
+        """Run ``job`` for one schedule slot unless another replica has it.
+
+        Returns the ``job_runs`` id, or None if the slot was skipped.
+        """
+        async with self.session_factory() as db:
+            locked = await db.scalar(
+                select(func.pg_try_advisory_xact_lock(func.hashtext(f"job:{job.name}")))
+            )
+            if not locked:
+                return None
+            run_id = await self._claim(job, scheduled_at)
+            if run_id is None:
+                return None
+
+            started = time.monotonic()
+            try:
+                rows = await job.func(db)
+                await db.commit()
+            except asyncio.CancelledError:
+                await db.rollback()
+                await self._finish(run_id, started, "cancelled")
+                raise
+            except Exception:
+                await db.rollback()
+                logger.exception("Job %s failed", job.name)
+                await self._finish(run_id, started, "failed", error=traceback.format_exc())
+                return run_id
+
+        await self._finish(run_id, started, "succeeded", rows_affected=rows)
+        return run_id
+
+    async def _claim(self, job: Job, scheduled_at: datetime) -> UUID | None:
+        async with self.session_factory() as db:
+            run_id = await db.scalar(
+                pg_insert(JobRun)
+                .values(
+                    job_name=job.name,
+                    scheduled_at=scheduled_at,
+                    status="running",
+                    instance=self.instance,
+                )
+                .on_conflict_do_nothing(index_elements=[JobRun.job_name, JobRun.scheduled_at])
+                .returning(JobRun.id)
+            )
+            await db.commit()
+            return run_id
+
+    async def _finish(
+        self,
+        run_id: UUID,
+        started: float,
+        status: str,
+        *,
+        rows_affected: int | None = None,
+        error: str | None = None,
+    ) -> None:
+        async with self.session_factory() as db:
+            await db.execute(
+                update(JobRun)
+                .where(JobRun.id == run_id)
+                .values(
+                    status=status,
+                    finished_at=func.now(),
+                    duration_ms=int((time.monotonic() - started) * 1000),
+                    rows_affected=rows_affected,
+                    error=error,
+                )
+            )
+            await db.commit()
@@ -0,0 +1,160 @@
+"""Per-club cache of dashboard summaries.
+
+Summaries are small aggregates over a club's rows (counts, revenue) that
+admin dashboards request together and often. :meth:`SummaryCache.get`
+returns a club's cached value or loads and stores it.
+
+Invalidation is automatic. Services register the models their summaries
+read with :func:`invalidate_on_write`. Any ORM insert, update or delete of
+such a row drops every cached summary of its club once the transaction
+commits. With the ``postgres`` realtime broker the flush also issues
+``pg_notify`` on the ``summary_cache`` channel, so other workers drop theirs
+too. Writes made with Core statements bypass the unit of work; call
+:func:`invalidate_summaries` for those. Entries also expire after
+``summary_cache_seconds`` as a backstop for a missed notification.
+
+A session that has written to a club in its open transaction reads that
+club's summaries straight from the database and never caches them. It sees
+its own writes, and a value that a rollback could undo is never stored.
+"""
+
+import logging
+import time
+from collections.abc import Awaitable, Callable
+from typing import Any
+from uuid import UUID
+
+from sqlalchemy import String, event, func, literal, select
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.config import get_settings
+from app.core.pubsub import PostgresListener, uses_postgres
+
+logger = logging.getLogger(__name__)
+
+CHANNEL = "summary_cache"
+
+_WRITTEN_KEY = "summary_cache.written"
+_NOTIFIED_KEY = "summary_cache.notified"
+_watched: set[type] = set()
+
+
+class SummaryCache:
+    def __init__(self, ttl: float | None = None):
+        self.ttl = get_settings().summary_cache_seconds if ttl is None else ttl
+        # club id -> summary name -> (expires at, value)
+        self._entries: dict[UUID, dict[str, tuple[float, Any]]] = {}
+        # Bumped by every invalidation, so a load that raced one is not stored
+        self._generation = 0
+
+    async def get(
+        self, db: AsyncSession, club_id: UUID, name: str, load: Callable[[], Awaitable[Any]]
+    ) -> Any:
+        if club_id in db.sync_session.info.get(_WRITTEN_KEY, ()):
+            return await load()
+        now = time.monotonic()
+        entry = self._entries.get(club_id, {}).get(name)
+        if entry is not None and entry[0] > now:
+            return entry[1]
+        generation = self._generation
+        value = await load()
+        if generation == self._generation:
+            self._entries.setdefault(club_id, {})[name] = (now + self.ttl, value)
+        return value
+
+    def invalidate(self, club_ids: set[UUID]) -> None:
+        self._generation += 1
+        for club_id in club_ids:
+            self._entries.pop(club_id, None)
+
+    def clear(self) -> None:
+        self._generation += 1
+        self._entries.clear()
+
+    async def start(self) -> None:
+        pass
+
+    async def stop(self) -> None:
+        pass
+
+
+class PostgresSummaryCache(SummaryCache):
+    """Also drops entries on ``LISTEN summary_cache``, for writes in other workers."""
+
+    def __init__(self, ttl: float | None = None):
+        super().__init__(ttl)
+        self._listener = PostgresListener(CHANNEL, self._on_notify, on_connect=self.clear)
+
+    async def start(self) -> None:
+        await self._listener.start()
+
+    async def stop(self) -> None:
+        await self._listener.stop()
+
+    def _on_notify(self, payload: str) -> None:
+        try:
+            club_id = UUID(payload)
+        except ValueError:
+            logger.warning("Ignoring malformed summary cache payload %r", payload)
+            return
+        self.invalidate({club_id})
+
+
+def create_summary_cache() -> SummaryCache:
+    return PostgresSummaryCache() if uses_postgres() else SummaryCache()
+
+
+summary_cache = create_summary_cache()
+
+
+def invalidate_on_write(*models: type) -> None:
+    """Drop a club's summaries whenever rows of these club-scoped models change."""
+    _watched.update(models)
+
+
+async def invalidate_summaries(db: AsyncSession, club_id: UUID) -> None:
+    """Drop the club's summaries when the current transaction commits."""
+    await db.run_sync(_record_written, {club_id})
+
+
+def _record_written(session: Session, club_ids: set[UUID]) -> None:
+    session.info.setdefault(_WRITTEN_KEY, set()).update(club_ids)
+    if not uses_postgres():
+        return
+    notified = session.info.setdefault(_NOTIFIED_KEY, set())
+    pending = club_ids - notified
+    if pending:
+        # Postgres delivers these on commit only, and drops them on rollback
+        payloads = literal(sorted(str(c) for c in pending), ARRAY(String))
+        session.connection().execute(select(func.pg_notify(CHANNEL, func.unnest(payloads))))
+        notified.update(pending)
+
+
+@event.listens_for(Session, "after_flush")
+def _after_flush(session: Session, flush_context) -> None:
+    if not _watched:
+        return
+    changed = (
+        *session.new,
+        *session.deleted,
+        *(obj for obj in session.dirty if session.is_modified(obj)),
+    )
+    club_ids = {obj.club_id for obj in changed if type(obj) in _watched}
+    if club_ids:
+        _record_written(session, club_ids)
+
+
+@event.listens_for(Session, "after_commit")
+def _after_commit(session: Session) -> None:
+    session.info.pop(_NOTIFIED_KEY, None)
+    club_ids = session.info.pop(_WRITTEN_KEY, None)
+    if club_ids:
+        summary_cache.invalidate(club_ids)
+
+
+@event.listens_for(Session, "after_rollback")
+def _after_rollback(session: Session) -> None:
+    session.info.pop(_NOTIFIED_KEY, None)
+    session.info.pop(_WRITTEN_KEY, None)
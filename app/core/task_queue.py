@@ -0,0 +1,316 @@
+"""Postgres-backed background task queue.
+
+Request handlers :func:`enqueue` a task (a row in ``tasks``) and return its id
+straight away; a :class:`TaskWorker` -- standalone via ``python -m app.worker``
+or inside a service lifespan -- claims queued tasks with
+``SELECT ... FOR UPDATE SKIP LOCKED``, so any number of workers can share the
+table without handing out the same task twice.
+
+* Higher ``priority`` runs first, then oldest ``run_after``.
+* A club has at most ``task_club_concurrency`` tasks running. The check happens
+  at claim time, so workers claiming concurrently may briefly overshoot it.
+* Failures are retried with exponential backoff until ``max_attempts``; raise
+  :class:`PermanentTaskError` to fail immediately.
+* Tasks whose worker died are re-queued once their lease expires, or failed
+  if that was their last attempt.
+
+Handlers are registered per task kind::
+
+    @task_handler("play_cricket_sync")
+    async def sync(db: AsyncSession, task: Task) -> dict | None:
+        ...
+"""
+
+import asyncio
+import logging
+import random
+import socket
+import traceback
+from collections.abc import Awaitable, Callable
+from datetime import timedelta
+from uuid import UUID
+
+from sqlalchemy import func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlalchemy.orm import aliased
+
+from app.config import get_settings
+from app.models.task import Task
+
+logger = logging.getLogger(__name__)
+
+TaskHandler = Callable[[AsyncSession, Task], Awaitable[dict | None]]
+
+_handlers: dict[str, TaskHandler] = {}
+
+
+class PermanentTaskError(Exception):
+    """Raised by a handler when retrying cannot help (bad payload, missing config)."""
+
+
+def task_handler(kind: str) -> Callable[[TaskHandler], TaskHandler]:
+    def register(handler: TaskHandler) -> TaskHandler:
+        if kind in _handlers:
+            raise ValueError(f"Task kind {kind!r} already has a handler")
+        _handlers[kind] = handler
+        return handler
+
+    return register
+
+
+def registered_kinds() -> list[str]:
+    return sorted(_handlers)
+
+
+async def enqueue(
+    db: AsyncSession,
+    kind: str,
+    payload: dict | None = None,
+    *,
+    club_id: UUID | None = None,
+    priority: int = 0,
+    max_attempts: int = 5,
+    delay: float = 0.0,
+    created_by: UUID | None = None,
+) -> Task:
+    """Add a task in the caller's transaction; it becomes visible on commit."""
+    task = Task(
+        club_id=club_id,
+        kind=kind,
+        payload=payload or {},
+        priority=priority,
+        max_attempts=max_attempts,
+        run_after=func.now() + timedelta(seconds=delay),
+        created_by=created_by,
+    )
+    db.add(task)
+    await db.flush()
+    await db.refresh(task)
+    return task
+
+
+def retry_delay(attempts: int) -> float:
+    """Exponential backoff with +/-20% jitter for the next attempt, in seconds."""
+    settings = get_settings()
+    delay = min(
+        settings.task_retry_base_seconds * 2 ** (attempts - 1), settings.task_retry_max_seconds
+    )
+    return delay * random.uniform(0.8, 1.2)
+
+
+async def claim(
+    db: AsyncSession, worker_id: str, *, club_limit: int, kinds: list[str] | None = None
+) -> Task | None:
+    """Atomically move the next runnable task to ``running`` for this worker."""
+    running = aliased(Task)
+    club_running = (
+        select(func.count())
+        .where(running.club_id == Task.club_id, running.status == "running")
+        .scalar_subquery()
+    )
+    candidate = (
+        select(Task.id)
+        .where(
+            Task.status == "queued",
+            Task.run_after <= func.now(),
+            Task.club_id.is_(None) | (club_running < club_limit),
+        )
+        .order_by(Task.priority.desc(), Task.run_after)
+        .limit(1)
+        .with_for_update(skip_locked=True)
+    )
+    if kinds:
+        candidate = candidate.where(Task.kind.in_(kinds))
+
+    stmt = (
+        update(Task)
+        .where(Task.id == candidate.scalar_subquery())
+        .values(
+            status="running",
+            attempts=Task.attempts + 1,
+            locked_by=worker_id,
+            locked_at=func.now(),
+        )
+        .returning(Task)
+    )
+    result = await db.execute(
+        select(Task).from_statement(stmt).execution_options(populate_existing=True)
+    )
+    return result.scalar_one_or_none()
+
+
+async def requeue_expired(db: AsyncSession, lease_seconds: int) -> int:
+    """Put tasks whose worker stopped heartbeating back in the queue.
+
+    A task that has used all its attempts fails instead, so one that kills or
+    hangs every worker it runs on is not retried forever.
+    """
+    expired = [
+        Task.status == "running",
+        Task.locked_at < func.now() - timedelta(seconds=lease_seconds),
+    ]
+    await db.execute(
+        update(Task)
+        .where(*expired, Task.attempts >= Task.max_attempts)
+        .values(
+            status="failed",
+            last_error=f"Lease expired after {lease_seconds}s on its last attempt",
+            locked_by=None,
+            locked_at=None,
+            finished_at=func.now(),
+        )
+    )
+    result = await db.execute(
+        update(Task)
+        .where(*expired)
+        .values(status="queued", locked_by=None, locked_at=None, run_after=func.now())
+    )
+    return result.rowcount
+
+
+class TaskWorker:
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession] | None = None,
+        *,
+        concurrency: int | None = None,
+        club_limit: int | None = None,
+        kinds: list[str] | None = None,
+        worker_id: str | None = None,
+    ):
+        if session_factory is None:
+            from app.core.database import async_session_factory
+
+            session_factory = async_session_factory
+        settings = get_settings()
+        self.session_factory = session_factory
+        self.concurrency = concurrency or settings.task_worker_concurrency
+        self.club_limit = club_limit or settings.task_club_concurrency
+        self.kinds = kinds
+        self.worker_id = worker_id or f"{socket.gethostname()}:{id(self):x}"
+        self._loop_task: asyncio.Task | None = None
+        self._running: set[asyncio.Task] = set()
+        self._stopping = asyncio.Event()
+
+    async def start(self) -> None:
+        if self._loop_task:
+            return
+        self._stopping = asyncio.Event()
+        self._loop_task = asyncio.create_task(self._loop(), name=f"worker:{self.worker_id}")
+        logger.info("Task worker %s started (concurrency %d)", self.worker_id, self.concurrency)
+
+    async def stop(self, timeout: float | None = None) -> None:
+        """Stop claiming; let running tasks finish for ``timeout`` seconds, then re-queue them."""
+        if not self._loop_task:
+            return
+        if timeout is None:
+            timeout = get_settings().scheduler_shutdown_timeout
+        self._stopping.set()
+        # The loop only ever waits for a free slot or the poll interval
+        self._loop_task.cancel()
+        await asyncio.gather(self._loop_task, return_exceptions=True)
+        self._loop_task = None
+        if self._running:
+            _, pending = await asyncio.wait(self._running, timeout=timeout)
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+
+    async def _loop(self) -> None:
+        settings = get_settings()
+        slots = asyncio.Semaphore(self.concurrency)
+        next_sweep = 0.0
+        loop = asyncio.get_running_loop()
+
+        while not self._stopping.is_set():
+            await slots.acquire()
+            try:
+                async with self.session_factory() as db:
+                    if loop.time() >= next_sweep:
+                        await requeue_expired(db, settings.task_lease_seconds)
+                        next_sweep = loop.time() + settings.task_lease_seconds / 4
+                    task = await claim(
+                        db, self.worker_id, club_limit=self.club_limit, kinds=self.kinds
+                    )
+                    await db.commit()
+            except Exception:
+                logger.exception("Task worker %s could not claim a task", self.worker_id)
+                task = None
+
+            if task is None:
+                slots.release()
+                try:
+                    await asyncio.wait_for(
+                        self._stopping.wait(), timeout=settings.task_poll_interval
+                    )
+                except TimeoutError:
+                    pass
+                continue
+
+            execution = asyncio.create_task(self._execute(task), name=f"task:{task.id}")
+            self._running.add(execution)
+            execution.add_done_callback(self._running.discard)
+            execution.add_done_callback(lambda _: slots.release())
+
+    async def _execute(self, task: Task) -> None:
+        handler = _handlers.get(task.kind)
+        heartbeat = asyncio.create_task(self._heartbeat(task))
+        try:
+            async with self.session_factory() as db:
+                if handler is None:
+                    raise PermanentTaskError(f"No handler registered for task kind {task.kind!r}")
+                result = await handler(db, task)
+                await db.commit()
+        except asyncio.CancelledError:
+            # Shutting down: hand the task back without counting the attempt
+            await self._update(
+                task, status="queued", attempts=task.attempts - 1, locked_by=None, locked_at=None
+            )
+            raise
+        except Exception as exc:
+            await self._retry_or_fail(task, exc)
+            return
+        finally:
+            heartbeat.cancel()
+        await self._update(task, status="succeeded", result=result, finished_at=func.now())
+
+    async def _heartbeat(self, task: Task) -> None:
+        """Keep the lease on a long-running task fresh so it is not re-queued."""
+        interval = get_settings().task_lease_seconds / 3
+        while True:
+            await asyncio.sleep(interval)
+            await self._update(task, locked_at=func.now())
+
+    async def _retry_or_fail(self, task: Task, exc: Exception) -> None:
+        error = "".join(traceback.format_exception(exc))
+        if isinstance(exc, PermanentTaskError) or task.attempts >= task.max_attempts:
+            logger.error("Task %s (%s) failed: %s", task.id, task.kind, exc)
+            await self._update(task, status="failed", last_error=error, finished_at=func.now())
+            return
+        delay = retry_delay(task.attempts)
+        logger.warning(
+            "Task %s (%s) attempt %d failed, retrying in %.0fs: %s",
+            task.id,
+            task.kind,
+            task.attempts,
+            delay,
+            exc,
+        )
+        await self._update(
+            task,
+            status="queued",
+            last_error=error,
+            locked_by=None,
+            locked_at=None,
+            run_after=func.now() + timedelta(seconds=delay),
+        )
+
+    async def _update(self, task: Task, **values) -> None:
+        # Only while this worker still holds the task; an expired lease may have moved it on
+        async with self.session_factory() as db:
+            await db.execute(
+                update(Task)
+                .where(Task.id == task.id, Task.locked_by == self.worker_id)
+                .values(**values)
+            )
+            await db.commit()
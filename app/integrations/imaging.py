@@ -0,0 +1,100 @@
+"""Image derivatives: resized, web-optimised copies of an uploaded image.
+
+:func:`render_derivatives` is CPU-bound and runs in worker processes. It
+takes and returns plain bytes, so it pickles cheaply and never touches the
+database, storage or the event loop. Pillow (``pip install .[media]``) is
+imported inside the worker, so the API processes do not need it.
+"""
+
+import io
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+
+from app.config import get_settings
+
+
+@dataclass(frozen=True)
+class DerivativeSpec:
+    name: str
+    max_size: int  # longest edge, in pixels
+    quality: int = 80
+
+
+# Smallest first; pick_derivative relies on the order
+DERIVATIVE_SPECS = (
+    DerivativeSpec("thumb", 320, quality=75),
+    DerivativeSpec("small", 640),
+    DerivativeSpec("medium", 1280),
+    DerivativeSpec("large", 2048, quality=85),
+)
+DERIVATIVE_FORMAT = "webp"
+DERIVATIVE_CONTENT_TYPE = "image/webp"
+
+
+class ImageError(Exception):
+    """The source could not be rendered; retrying will not help."""
+
+
+def render_derivatives(source: bytes, specs: tuple[DerivativeSpec, ...]) -> dict[str, bytes]:
+    """WebP renditions of ``source`` for each spec, never upscaled."""
+    try:
+        from PIL import Image, ImageOps
+    except ImportError as exc:
+        raise ImageError("Pillow is not installed (pip install .[media])") from exc
+
+    largest = max(spec.max_size for spec in specs)
+    try:
+        with Image.open(io.BytesIO(source)) as original:
+            # JPEG: let the decoder downscale while decoding, far cheaper than resizing
+            original.draft("RGB", (largest, largest))
+            image = ImageOps.exif_transpose(original)
+            if image.mode not in ("RGB", "RGBA"):
+                image = image.convert("RGBA" if "transparency" in image.info else "RGB")
+
+            rendered = {}
+            # Largest first, each resized from the previous: cheaper than from the original
+            for spec in sorted(specs, key=lambda s: s.max_size, reverse=True):
+                if max(image.size) > spec.max_size:
+                    image.thumbnail((spec.max_size, spec.max_size), Image.Resampling.LANCZOS)
+                out = io.BytesIO()
+                image.save(out, DERIVATIVE_FORMAT, quality=spec.quality)
+                rendered[spec.name] = out.getvalue()
+            return rendered
+    except (OSError, Image.DecompressionBombError) as exc:
+        # A plain message: the PIL exception need not unpickle in the parent process
+        raise ImageError(f"Cannot render image: {exc}") from None
+
+
+def pick_derivative(derivatives: dict[str, str] | None, width: int | None) -> str | None:
+    """URL of the smallest derivative at least ``width`` pixels wide, else the largest."""
+    if not derivatives or width is None:
+        return None
+    available = [spec for spec in DERIVATIVE_SPECS if spec.name in derivatives]
+    for spec in available:
+        if spec.max_size >= width:
+            return derivatives[spec.name]
+    return derivatives[available[-1].name] if available else None
+
+
+_executor: ProcessPoolExecutor | None = None
+
+
+def get_executor() -> ProcessPoolExecutor:
+    """The shared pool for derivative rendering, created on first use."""
+    global _executor
+    if _executor is None:
+        workers = get_settings().media_derivative_workers or os.cpu_count() or 1
+        # Spawned, not forked: a fork would copy the event loop and pooled DB sockets
+        _executor = ProcessPoolExecutor(
+            max_workers=workers, mp_context=multiprocessing.get_context("spawn")
+        )
+    return _executor
+
+
+def shutdown_executor() -> None:
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(cancel_futures=True)
+        _executor = None
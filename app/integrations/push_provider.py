@@ -0,0 +1,99 @@
+"""Push notification providers.
+
+A provider sends one batch of messages per request and reports, per message,
+whether it was delivered, whether the device token is dead (and should be
+pruned), or whether it failed. Transport-level failures that are worth
+retrying raise :class:`TransientPushError`.
+
+:class:`ExpoPushProvider` speaks the Expo push API, which the mobile app uses.
+Point ``PUSH_API_URL`` at ``app.integrations.push_stub`` to exercise the whole
+pipeline locally without sending real pushes.
+"""
+
+from dataclasses import dataclass, field
+from typing import Any, Literal, Protocol
+
+import httpx
+
+from app.config import get_settings
+
+PushStatus = Literal["ok", "invalid_token", "error"]
+
+
+class TransientPushError(Exception):
+    """The whole batch failed in a way that may succeed on retry (5xx, 429, timeout)."""
+
+
+@dataclass(frozen=True)
+class PushMessage:
+    token: str
+    title: str
+    body: str | None = None
+    data: dict[str, Any] = field(default_factory=dict)
+
+
+@dataclass(frozen=True)
+class PushOutcome:
+    token: str
+    status: PushStatus
+    error: str | None = None
+
+
+class PushProvider(Protocol):
+    max_batch_size: int
+
+    async def send(self, messages: list[PushMessage]) -> list[PushOutcome]:
+        """Send one batch; returns an outcome per message, in order."""
+        ...
+
+    async def aclose(self) -> None: ...
+
+
+class ExpoPushProvider:
+    # Expo accepts at most 100 messages per request
+    max_batch_size = 100
+
+    def __init__(self, url: str, access_token: str = "", timeout: float = 10.0):
+        headers = {"Accept": "application/json", "Accept-Encoding": "gzip, deflate"}
+        if access_token:
+            headers["Authorization"] = f"Bearer {access_token}"
+        self.url = url
+        self._client = httpx.AsyncClient(headers=headers, timeout=timeout)
+
+    async def send(self, messages: list[PushMessage]) -> list[PushOutcome]:
+        payload = [
+            {"to": m.token, "title": m.title, "body": m.body, "data": m.data, "sound": "default"}
+            for m in messages
+        ]
+        try:
+            response = await self._client.post(self.url, json=payload)
+        except httpx.TransportError as exc:
+            raise TransientPushError(str(exc)) from exc
+        if response.status_code == 429 or response.status_code >= 500:
+            raise TransientPushError(f"Push API returned {response.status_code}")
+        response.raise_for_status()
+
+        tickets = response.json()["data"]
+        return [_expo_outcome(m.token, ticket) for m, ticket in zip(messages, tickets)]
+
+    async def aclose(self) -> None:
+        await self._client.aclose()
+
+
+def _expo_outcome(token: str, ticket: dict) -> PushOutcome:
+    if ticket.get("status") == "ok":
+        return PushOutcome(token, "ok")
+    error = (ticket.get("details") or {}).get("error") or ticket.get("message")
+    if error == "DeviceNotRegistered":
+        return PushOutcome(token, "invalid_token", error)
+    return PushOutcome(token, "error", error)
+
+
+def get_push_provider() -> PushProvider | None:
+    """The configured provider, or None when push delivery is disabled."""
+    settings = get_settings()
+    if settings.push_provider == "expo":
+        return ExpoPushProvider(settings.push_api_url, settings.push_access_token)
+    if settings.push_provider == "none":
+        return None
+    raise ValueError(f"Unknown push provider {settings.push_provider!r}")
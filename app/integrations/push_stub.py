@@ -0,0 +1,44 @@
+"""Local stand-in for the Expo push API.
+
+Run it with ``uvicorn app.integrations.push_stub:app --port 8090`` and set
+``PUSH_API_URL=http://localhost:8090/push/send``. Tokens containing
+``invalid`` are reported as ``DeviceNotRegistered``; a batch containing a token
+with ``flaky`` fails with a 503 the first time it is seen, so retries can be
+exercised. Every accepted message is kept in ``sent`` for inspection.
+"""
+
+from fastapi import FastAPI, Response
+
+app = FastAPI(title="Push API stub")
+
+sent: list[dict] = []
+_flaky_seen: set[str] = set()
+
+
+@app.post("/push/send")
+async def send(messages: list[dict], response: Response) -> dict:
+    flaky = {m["to"] for m in messages if "flaky" in m["to"]} - _flaky_seen
+    if flaky:
+        _flaky_seen.update(flaky)
+        response.status_code = 503
+        return {"errors": [{"code": "UNAVAILABLE"}]}
+
+    tickets = []
+    for message in messages:
+        if "invalid" in message["to"]:
+            tickets.append(
+                {
+                    "status": "error",
+                    "message": f"{message['to']} is not a registered push notification recipient",
+                    "details": {"error": "DeviceNotRegistered"},
+                }
+            )
+        else:
+            sent.append(message)
+            tickets.append({"status": "ok", "id": f"ticket-{len(sent)}"})
+    return {"data": tickets}
+
+
+@app.get("/push/sent")
+async def list_sent() -> list[dict]:
+    return sent
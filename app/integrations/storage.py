@@ -0,0 +1,112 @@
+"""Object storage for uploaded media.
+
+A backend stores opaque byte objects under string keys. Uploads are written
+at an offset, so a resumed upload overwrites whatever a broken request left
+behind, and every read and write streams in bounded chunks: no method ever
+holds a whole file in memory.
+
+:class:`LocalStorage` keeps objects as files under ``MEDIA_STORAGE_PATH``,
+served by the web server from ``MEDIA_PUBLIC_URL``. An S3-compatible backend
+would map each upload request to a multipart part and ``move`` to
+CompleteMultipartUpload/CopyObject behind the same interface.
+"""
+
+import asyncio
+import os
+from collections.abc import AsyncIterator
+from pathlib import Path
+from typing import BinaryIO, Protocol
+
+from app.config import get_settings
+
+# Writes are coalesced to this size before hitting the disk, reads use it too
+BLOCK_SIZE = 1024 * 1024
+
+
+class StorageBackend(Protocol):
+    async def write_at(self, key: str, offset: int, chunks: AsyncIterator[bytes]) -> int:
+        """Write ``chunks`` at ``offset``, dropping anything after it; returns bytes written."""
+        ...
+
+    def read(self, key: str) -> AsyncIterator[bytes]:
+        """The object's bytes in blocks of at most ``BLOCK_SIZE``."""
+        ...
+
+    async def exists(self, key: str) -> bool: ...
+
+    async def move(self, source: str, destination: str) -> None:
+        """Atomically rename ``source`` to ``destination``, replacing it if present."""
+        ...
+
+    async def delete(self, key: str) -> None: ...
+
+    def url(self, key: str) -> str: ...
+
+
+class LocalStorage:
+    def __init__(self, root: str | Path, public_url: str):
+        self.root = Path(root).resolve()
+        self.public_url = public_url.rstrip("/")
+
+    def _path(self, key: str) -> Path:
+        path = (self.root / key).resolve()
+        if not path.is_relative_to(self.root):
+            raise ValueError(f"Storage key escapes the storage root: {key!r}")
+        return path
+
+    async def write_at(self, key: str, offset: int, chunks: AsyncIterator[bytes]) -> int:
+        path = self._path(key)
+        file = await asyncio.to_thread(_open_at, path, offset)
+        written = 0
+        buffer = bytearray()
+        try:
+            async for chunk in chunks:
+                buffer += chunk
+                if len(buffer) >= BLOCK_SIZE:
+                    await asyncio.to_thread(file.write, buffer)
+                    written += len(buffer)
+                    buffer = bytearray()
+            if buffer:
+                await asyncio.to_thread(file.write, buffer)
+                written += len(buffer)
+        finally:
+            await asyncio.to_thread(file.close)
+        return written
+
+    async def read(self, key: str) -> AsyncIterator[bytes]:
+        file = await asyncio.to_thread(open, self._path(key), "rb")
+        try:
+            while block := await asyncio.to_thread(file.read, BLOCK_SIZE):
+                yield block
+        finally:
+            await asyncio.to_thread(file.close)
+
+    async def exists(self, key: str) -> bool:
+        return await asyncio.to_thread(self._path(key).is_file)
+
+    async def move(self, source: str, destination: str) -> None:
+        target = self._path(destination)
+        await asyncio.to_thread(target.parent.mkdir, parents=True, exist_ok=True)
+        await asyncio.to_thread(os.replace, self._path(source), target)
+
+    async def delete(self, key: str) -> None:
+        await asyncio.to_thread(self._path(key).unlink, missing_ok=True)
+
+    def url(self, key: str) -> str:
+        return f"{self.public_url}/{key}"
+
+
+def _open_at(path: Path, offset: int) -> BinaryIO:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    file = open(path, "r+b" if path.exists() else "wb")
+    file.seek(offset)
+    file.truncate()
+    return file
+
+
+def get_storage() -> StorageBackend:
+    """The configured media storage backend."""
+    settings = get_settings()
+    if settings.media_storage_backend == "local":
+        return LocalStorage(settings.media_storage_path, settings.media_public_url)
+    raise ValueError(f"Unknown media storage backend {settings.media_storage_backend!r}")
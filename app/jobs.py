@@ -0,0 +1,93 @@
+"""Scheduled background jobs.
+
+Each job takes a session and returns the number of rows it affected; the
+scheduler commits on success and records the run in ``job_runs``. Services pick
+the jobs they own by name with :func:`create_scheduler`.
+"""
+
+import logging
+from datetime import date, datetime, timedelta, timezone
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import get_settings
+from app.core.scheduler import JobFunc, Scheduler
+from app.core.task_queue import enqueue
+from app.models.club import Club
+from app.services.media_upload_service import MediaUploadService
+from app.services.notification_service import NotificationService
+
+logger = logging.getLogger(__name__)
+
+
+async def generate_match_reminders(db: AsyncSession) -> int:
+    return await NotificationService(db).generate_match_reminders()
+
+
+async def generate_payment_reminders(db: AsyncSession) -> int:
+    return await NotificationService(db).generate_payment_reminders()
+
+
+async def generate_selection_deadline_alerts(db: AsyncSession) -> int:
+    return await NotificationService(db).generate_selection_deadline_alerts()
+
+
+async def reconcile_unread_counts(db: AsyncSession) -> int:
+    return await NotificationService(db).reconcile_unread_counts()
+
+
+async def archive_read_notifications(db: AsyncSession) -> int:
+    """Move old read notifications to the archive, committing after every batch."""
+    settings = get_settings()
+    cutoff = datetime.now(timezone.utc) - timedelta(days=settings.notification_retention_days)
+    service = NotificationService(db)
+    total = 0
+    while moved := await service.archive_read_batch(
+        cutoff, settings.notification_archive_batch_size
+    ):
+        await db.commit()
+        total += moved
+    return total
+
+
+async def discard_stale_uploads(db: AsyncSession) -> int:
+    hours = get_settings().media_upload_expiry_hours
+    cutoff = datetime.now(timezone.utc) - timedelta(hours=hours)
+    return await MediaUploadService.discard_stale(db, cutoff)
+
+
+async def sync_play_cricket(db: AsyncSession) -> int:
+    """Queue a Play-Cricket sync task for every club linked to Play-Cricket."""
+    if not get_settings().play_cricket_api_token:
+        logger.info("Play-Cricket API token not configured; skipping sync")
+        return 0
+
+    result = await db.execute(select(Club.id).where(Club.play_cricket_id.is_not(None)))
+    club_ids = result.scalars().all()
+    for club_id in club_ids:
+        await enqueue(
+            db, "play_cricket_sync", {"season": date.today().year}, club_id=club_id, priority=-1
+        )
+    return len(club_ids)
+
+
+# name -> (cron schedule, job, jitter seconds)
+JOBS: dict[str, tuple[str, JobFunc, float]] = {
+    "match_reminders": ("0 * * * *", generate_match_reminders, 120),
+    "payment_reminders": ("0 9 * * *", generate_payment_reminders, 300),
+    "selection_deadline_alerts": ("20 * * * *", generate_selection_deadline_alerts, 120),
+    "play_cricket_sync": ("30 3 * * *", sync_play_cricket, 600),
+    "unread_counts_reconcile": ("15 4 * * *", reconcile_unread_counts, 300),
+    "notification_archive": ("45 4 * * *", archive_read_notifications, 300),
+    "media_upload_cleanup": ("30 * * * *", discard_stale_uploads, 300),
+}
+
+
+def create_scheduler(*names: str) -> Scheduler:
+    """A scheduler with the named jobs from :data:`JOBS` registered."""
+    scheduler = Scheduler()
+    for name in names:
+        cron, func, jitter = JOBS[name]
+        scheduler.add_job(name, cron, func, jitter=jitter)
+    return scheduler
@@ -10,8 +10,32 @@ from app.core.exception_handlers import register_exception_handlers
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
+    from app.core.channel_hub import hub
+    from app.core.notification_broker import broker
+    from app.core.read_cursors import read_cursors
+    from app.core.summary_cache import summary_cache
+    from app.integrations.imaging import shutdown_executor
+    from app.jobs import JOBS, create_scheduler
+    from app.tasks import create_worker
+
+    scheduler = create_scheduler(*JOBS)
+    worker = create_worker()
+    await scheduler.start()
+    await broker.start()
+    await hub.start()
+    await read_cursors.start()
+    await summary_cache.start()
+    if get_settings().task_worker_in_process:
+        await worker.start()
     yield
-    # Shutdown: dispose engine
+    # Shutdown: stop background jobs, tasks and streams, then dispose engine
+    await worker.stop()
+    shutdown_executor()
+    await summary_cache.stop()
+    await read_cursors.stop()
+    await hub.stop()
+    await broker.stop()
+    await scheduler.stop()
     from app.core.database import engine
 
     await engine.dispose()
@@ -4,6 +4,7 @@ from app.models.base import Base
 from app.models.batting_entry import BattingEntry
 from app.models.bowling_entry import BowlingEntry
 from app.models.channel import Channel
+from app.models.channel_read_cursor import ChannelReadCursor
 from app.models.club import Club
 from app.models.club_key_person import ClubKeyPerson
 from app.models.club_member import ClubMember
@@ -12,6 +13,7 @@ from app.models.faq import FAQ
 from app.models.fee_config import FeeConfig
 from app.models.fixture_series import FixtureSeries
 from app.models.fixture_type import FixtureType
+from app.models.job_run import JobRun
 from app.models.match import Match
 from app.models.match_audit_log import MatchAuditLog
 from app.models.match_availability import MatchAvailability
@@ -21,6 +23,7 @@ from app.models.match_participation import MatchParticipation
 from app.models.media_gallery import MediaGallery
 from app.models.media_item import MediaItem
 from app.models.media_tag import MediaTag
+from app.models.media_upload import MediaUpload
 from app.models.merchandise_category import MerchandiseCategory
 from app.models.merchandise_item import MerchandiseItem
 from app.models.merchandise_order import MerchandiseOrder
@@ -29,6 +32,8 @@ from app.models.merchandise_variant import MerchandiseVariant
 from app.models.message import Message
 from app.models.message_reaction import MessageReaction
 from app.models.notification import Notification
+from app.models.notification_archive import NotificationArchive
+from app.models.notification_counter import NotificationCounter
 from app.models.payment import Payment
 from app.models.pending_club_registration import PendingClubRegistration
 from app.models.platform_admin import PlatformAdmin
@@ -48,6 +53,7 @@ from app.models.role import Role
 from app.models.role_permission import RolePermission
 from app.models.season import Season
 from app.models.selection_withdrawal import SelectionWithdrawal
+from app.models.task import Task
 from app.models.team import Team
 from app.models.team_selection import TeamSelection
 from app.models.team_selection_config import TeamSelectionConfig
@@ -59,6 +65,7 @@ __all__ = [
     "BattingEntry",
     "BowlingEntry",
     "Channel",
+    "ChannelReadCursor",
     "Club",
     "ClubKeyPerson",
     "ClubMember",
@@ -73,9 +80,11 @@ __all__ = [
     "MatchInnings",
     "MatchOppositionPlayer",
     "MatchParticipation",
+    "JobRun",
     "MediaGallery",
     "MediaItem",
     "MediaTag",
+    "MediaUpload",
     "MerchandiseCategory",
     "MerchandiseItem",
     "MerchandiseOrder",
@@ -84,6 +93,8 @@ __all__ = [
     "Message",
     "MessageReaction",
     "Notification",
+    "NotificationArchive",
+    "NotificationCounter",
     "Payment",
     "PendingClubRegistration",
     "PlatformAdmin",
@@ -103,6 +114,7 @@ __all__ = [
     "RolePermission",
     "Season",
     "SelectionWithdrawal",
+    "Task",
     "Team",
     "TeamSelection",
     "TeamSelectionConfig",
@@ -1,8 +1,8 @@
 import uuid
 from datetime import datetime
 
-from sqlalchemy import Boolean, CheckConstraint, DateTime, String, Text
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import Boolean, CheckConstraint, Computed, DateTime, Index, String, Text
+from sqlalchemy.dialects.postgresql import TSVECTOR, UUID
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.models.base import Base, ClubScopedMixin, TimestampMixin
@@ -37,10 +37,21 @@ class Announcement(Base, ClubScopedMixin, TimestampMixin):
     published_at: Mapped[datetime | None] = mapped_column(
         DateTime(timezone=True), nullable=True
     )
+    # Full-text search, title weighted above body; see app/services/search_service.py
+    search_vector: Mapped[str | None] = mapped_column(
+        TSVECTOR,
+        Computed(
+            "setweight(to_tsvector('english', title), 'A')"
+            " || setweight(to_tsvector('english', coalesce(body, '')), 'B')",
+            persisted=True,
+        ),
+        deferred=True,
+    )
 
     __table_args__ = (
         CheckConstraint(
             "type IN ('general', 'match', 'team', 'urgent', 'event')",
             name="ck_announcement_type",
         ),
+        Index("idx_announcements_search", "search_vector", postgresql_using="gin"),
     )
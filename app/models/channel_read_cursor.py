@@ -0,0 +1,33 @@
+import uuid
+from datetime import datetime
+
+from sqlalchemy import DateTime, ForeignKey, func
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.base import Base
+
+
+class ChannelReadCursor(Base):
+    """The newest message a member has read in a channel.
+
+    ``last_read_created_at`` duplicates the message's ``created_at`` so unread
+    counts are a range scan of ``idx_messages_channel_created`` after
+    ``(last_read_created_at, last_read_message_id)``.
+    """
+
+    __tablename__ = "channel_read_cursors"
+
+    user_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True)
+    channel_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("channels.id", ondelete="CASCADE"), primary_key=True
+    )
+    last_read_message_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), nullable=False
+    )
+    last_read_created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False
+    )
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), onupdate=func.now()
+    )
@@ -1,7 +1,7 @@
 import uuid
 
-from sqlalchemy import ForeignKey, String, Text
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import BigInteger, ForeignKey, Index, String, Text, text
+from sqlalchemy.dialects.postgresql import JSONB, UUID
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.models.base import Base, ClubScopedMixin, TimestampMixin
@@ -24,3 +24,22 @@ class MediaItem(Base, ClubScopedMixin, TimestampMixin):
     uploaded_by: Mapped[uuid.UUID | None] = mapped_column(
         UUID(as_uuid=True), index=True
     )
+    # Set for files uploaded through /media/uploads; identical files share one object
+    content_hash: Mapped[str | None] = mapped_column(String(64), index=True)
+    content_type: Mapped[str | None] = mapped_column(String(100))
+    size_bytes: Mapped[int | None] = mapped_column(BigInteger)
+    # Resized WebP copies of uploaded images, {spec name: url}; see app.integrations.imaging
+    derivatives: Mapped[dict | None] = mapped_column(JSONB)
+
+    __table_args__ = (
+        # Club and gallery listings: newest first, keyset on (created_at, id)
+        Index(
+            "idx_media_items_club_created", "club_id", text("created_at DESC"), text("id DESC")
+        ),
+        Index(
+            "idx_media_items_gallery_created",
+            "gallery_id",
+            text("created_at DESC"),
+            text("id DESC"),
+        ),
+    )
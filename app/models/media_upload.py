@@ -0,0 +1,36 @@
+import uuid
+
+from sqlalchemy import BigInteger, CheckConstraint, ForeignKey, String, Text
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.base import Base, ClubScopedMixin, TimestampMixin
+
+
+class MediaUpload(Base, ClubScopedMixin, TimestampMixin):
+    """An upload in progress; its MediaItem is created when the last byte arrives."""
+
+    __tablename__ = "media_uploads"
+
+    id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), primary_key=True, default=uuid.uuid4
+    )
+    uploaded_by: Mapped[uuid.UUID | None] = mapped_column(UUID(as_uuid=True))
+    filename: Mapped[str] = mapped_column(String(255), nullable=False)
+    content_type: Mapped[str] = mapped_column(String(100), nullable=False)
+    total_bytes: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    received_bytes: Mapped[int] = mapped_column(BigInteger, nullable=False, server_default="0")
+    status: Mapped[str] = mapped_column(String(20), nullable=False, server_default="uploading")
+    # Copied onto the MediaItem on completion
+    gallery_id: Mapped[uuid.UUID | None] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("media_galleries.id", ondelete="SET NULL")
+    )
+    title: Mapped[str | None] = mapped_column(String(200))
+    description: Mapped[str | None] = mapped_column(Text)
+    media_item_id: Mapped[uuid.UUID | None] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("media_items.id", ondelete="SET NULL")
+    )
+
+    __table_args__ = (
+        CheckConstraint("status IN ('uploading', 'completed')", name="ck_media_upload_status"),
+    )
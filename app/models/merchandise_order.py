@@ -1,7 +1,7 @@
 import uuid
 from decimal import Decimal
 
-from sqlalchemy import CheckConstraint, Numeric, String, Text
+from sqlalchemy import CheckConstraint, Index, Numeric, String, Text, text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column
 
@@ -26,4 +26,18 @@ class MerchandiseOrder(Base, ClubScopedMixin, TimestampMixin):
             "status IN ('pending', 'confirmed', 'ready', 'collected', 'cancelled')",
             name="ck_merch_order_status",
         ),
+        # Order listings: newest first, keyset on (created_at, id), optionally by status
+        Index(
+            "idx_merch_orders_club_created",
+            "club_id",
+            text("created_at DESC"),
+            text("id DESC"),
+        ),
+        Index(
+            "idx_merch_orders_club_status_created",
+            "club_id",
+            "status",
+            text("created_at DESC"),
+            text("id DESC"),
+        ),
     )
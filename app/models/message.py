@@ -1,7 +1,7 @@
 import uuid
 
-from sqlalchemy import Boolean, ForeignKey, Text
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import Boolean, Computed, ForeignKey, Index, Text, text
+from sqlalchemy.dialects.postgresql import TSVECTOR, UUID
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.models.base import Base, TimestampMixin
@@ -15,7 +15,7 @@ class Message(Base, TimestampMixin):
     )
     channel_id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True), ForeignKey("channels.id", ondelete="CASCADE"),
-        nullable=False, index=True,
+        nullable=False,
     )
     sender_id: Mapped[uuid.UUID | None] = mapped_column(
         UUID(as_uuid=True), index=True
@@ -23,3 +23,15 @@ class Message(Base, TimestampMixin):
     content: Mapped[str] = mapped_column(Text, nullable=False)
     is_pinned: Mapped[bool] = mapped_column(Boolean, nullable=False, server_default="false")
     is_deleted: Mapped[bool] = mapped_column(Boolean, nullable=False, server_default="false")
+    # Full-text search; see app/services/search_service.py
+    search_vector: Mapped[str | None] = mapped_column(
+        TSVECTOR, Computed("to_tsvector('english', content)", persisted=True), deferred=True
+    )
+
+    __table_args__ = (
+        # Channel scrollback: newest first, keyset on (created_at, id)
+        Index(
+            "idx_messages_channel_created", "channel_id", text("created_at DESC"), text("id DESC")
+        ),
+        Index("idx_messages_search", "search_vector", postgresql_using="gin"),
+    )
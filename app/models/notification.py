@@ -1,7 +1,7 @@
 import uuid
 from datetime import datetime
 
-from sqlalchemy import Boolean, DateTime, String, Text, func
+from sqlalchemy import Boolean, DateTime, Index, String, Text, func, text
 from sqlalchemy.dialects.postgresql import JSON, UUID
 from sqlalchemy.orm import Mapped, mapped_column
 
@@ -14,14 +14,38 @@ class Notification(Base, ClubScopedMixin):
     id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True), primary_key=True, default=uuid.uuid4
     )
-    user_id: Mapped[uuid.UUID] = mapped_column(
-        UUID(as_uuid=True), nullable=False, index=True
-    )
+    user_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), nullable=False)
     type: Mapped[str] = mapped_column(String(50), nullable=False)
     title: Mapped[str] = mapped_column(String(255), nullable=False)
     body: Mapped[str | None] = mapped_column(Text)
     data: Mapped[dict] = mapped_column(JSON, nullable=False, default=dict)
     is_read: Mapped[bool] = mapped_column(Boolean, default=False)
+    # Identifies generated notifications (e.g. "match_reminder:<match_id>") so they
+    # are only ever sent once per user; NULL for ad-hoc notifications.
+    dedupe_key: Mapped[str | None] = mapped_column(String(255))
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), server_default=func.now()
     )
+
+    __table_args__ = (
+        # Inbox pages: newest first, keyset on (created_at, id)
+        Index(
+            "idx_notifications_user_created", "user_id", text("created_at DESC"), text("id DESC")
+        ),
+        Index(
+            "idx_notifications_user_unread",
+            "user_id",
+            text("created_at DESC"),
+            text("id DESC"),
+            postgresql_where=text("is_read = false"),
+        ),
+        # Retention sweep
+        Index("idx_notifications_created_at", "created_at"),
+        Index(
+            "uq_notifications_user_dedupe_key",
+            "user_id",
+            "dedupe_key",
+            unique=True,
+            postgresql_where=text("dedupe_key IS NOT NULL"),
+        ),
+    )
@@ -19,3 +19,5 @@ class PollOption(Base):
     )
     text: Mapped[str] = mapped_column(String(255), nullable=False)
     display_order: Mapped[int] = mapped_column(Integer, nullable=False, server_default="0")
+    # Maintained by MessagingService.vote_on_poll in the same statement as the vote
+    vote_count: Mapped[int] = mapped_column(Integer, nullable=False, server_default="0")
@@ -21,6 +21,8 @@ class TeamSelectionConfig(Base, TimestampMixin):
     reliability_weight: Mapped[Decimal] = mapped_column(Numeric(4, 2), default=Decimal("0.15"))
     season_distribution_weight: Mapped[Decimal] = mapped_column(Numeric(4, 2), default=Decimal("0.10"))
     late_withdrawal_hours: Mapped[int] = mapped_column(Integer, default=48)
+    selection_deadline_hours: Mapped[int] = mapped_column(Integer, default=48)
+    target_players: Mapped[int] = mapped_column(Integer, default=11)
     late_withdrawal_penalty: Mapped[Decimal] = mapped_column(Numeric(4, 2), default=Decimal("0.10"))
     max_late_withdrawal_penalty: Mapped[Decimal] = mapped_column(Numeric(4, 2), default=Decimal("0.50"))
     min_attendance_score: Mapped[Decimal] = mapped_column(Numeric(4, 2), default=Decimal("0.00"))
@@ -23,3 +23,24 @@ class AvailabilityUpdate(BaseModel):
 class BulkAvailabilityUpdate(BaseModel):
     match_ids: list[UUID]
     status: str = Field(..., pattern=AVAILABILITY_STATUS_PATTERN)
+
+
+class AvailabilityEntry(BaseModel):
+    match_id: UUID
+    player_id: UUID
+    status: str = Field(..., pattern=AVAILABILITY_STATUS_PATTERN)
+
+
+class AdminBulkAvailabilityUpdate(BaseModel):
+    entries: list[AvailabilityEntry] = Field(..., min_length=1)
+
+
+class AvailabilityMatrixRead(BaseModel):
+    """Compact players x matches grid: ``statuses[i][j]`` is the code for
+    ``player_ids[i]`` at ``match_ids[j]``; ``codes`` maps each code to its status."""
+
+    season_id: UUID
+    match_ids: list[UUID]
+    player_ids: list[UUID]
+    statuses: list[str]
+    codes: dict[str, str]
@@ -1,7 +1,7 @@
 from datetime import datetime
 from uuid import UUID
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 
 # --- Galleries ---
@@ -49,6 +49,12 @@ class MediaItemRead(BaseModel):
     url: str
     thumbnail_url: str | None
     uploaded_by: UUID | None
+    content_type: str | None = None
+    size_bytes: int | None = None
+    # Resized copies by size name (thumb, small, medium, large); None until generated
+    derivatives: dict[str, str] | None = None
+    # The best size for the ``width`` the client asked for, else the original
+    display_url: str | None = None
     created_at: datetime | None = None
     tags: list[str] = []
 
@@ -69,6 +75,31 @@ class MediaItemUpdate(BaseModel):
     thumbnail_url: str | None = None
 
 
+# --- Uploads ---
+
+class MediaUploadCreate(BaseModel):
+    filename: str = Field(..., max_length=255)
+    content_type: str = Field(..., max_length=100)
+    total_bytes: int = Field(..., gt=0)
+    gallery_id: UUID | None = None
+    title: str | None = Field(None, max_length=200)
+    description: str | None = None
+
+
+class MediaUploadRead(BaseModel):
+    model_config = {"from_attributes": True}
+
+    id: UUID
+    status: str
+    filename: str
+    content_type: str
+    total_bytes: int
+    # Where the next PATCH must start
+    received_bytes: int
+    media_item_id: UUID | None = None
+    media_item: MediaItemRead | None = None
+
+
 # --- Tags ---
 
 class MediaTagRead(BaseModel):
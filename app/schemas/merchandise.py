@@ -2,7 +2,7 @@ from datetime import datetime
 from decimal import Decimal
 from uuid import UUID
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 
 # --- Categories ---
@@ -104,11 +104,11 @@ class MerchVariantUpdate(BaseModel):
 class OrderItemInput(BaseModel):
     item_id: UUID
     variant_id: UUID | None = None
-    quantity: int
+    quantity: int = Field(..., gt=0)
 
 
 class MerchOrderCreate(BaseModel):
-    items: list[OrderItemInput]
+    items: list[OrderItemInput] = Field(..., min_length=1)
     notes: str | None = None
 
 
@@ -24,8 +24,25 @@ class ChannelCreate(BaseModel):
     channel_type: str = "general"
 
 
+class ChannelUnreadRead(BaseModel):
+    channel_id: UUID
+    # Capped at UNREAD_COUNT_CAP (100); show "99+" from there
+    unread_count: int
+    last_read_message_id: UUID | None = None
+
+
+class ChannelReadUpdate(BaseModel):
+    message_id: UUID
+
+
 # --- Messages ---
 
+class ReactionSummary(BaseModel):
+    emoji: str
+    count: int
+    reacted_by_me: bool = False
+
+
 class MessageRead(BaseModel):
     model_config = {"from_attributes": True}
 
@@ -37,7 +54,7 @@ class MessageRead(BaseModel):
     is_deleted: bool
     created_at: datetime | None = None
     sender_name: str | None = None
-    reactions: list[dict] | None = None
+    reactions: list[ReactionSummary] | None = None
 
 
 class MessageCreate(BaseModel):
@@ -25,3 +25,27 @@ class PushTokenRegister(BaseModel):
 
 class PushTokenRemove(BaseModel):
     token: str
+
+
+class NotificationBroadcast(BaseModel):
+    title: str
+    body: str | None = None
+    data: dict = {}
+
+
+class NotificationBroadcastResult(BaseModel):
+    recipients: int
+    task_id: UUID | None
+
+
+class PushMetricsRead(BaseModel):
+    hours: int
+    deliveries: int
+    messages: int
+    sent: int
+    failed: int
+    pruned: int
+    batches: int
+    retries: int
+    seconds: float
+    messages_per_second: float | None
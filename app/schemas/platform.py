@@ -70,3 +70,18 @@ class AuditLogEntryRead(BaseModel):
     target_id: UUID | None = None
     details: dict = {}
     created_at: dt.datetime
+
+
+class JobRunRead(BaseModel):
+    model_config = {"from_attributes": True}
+
+    id: UUID
+    job_name: str
+    scheduled_at: dt.datetime
+    started_at: dt.datetime
+    finished_at: dt.datetime | None
+    duration_ms: int | None
+    rows_affected: int | None
+    status: str
+    error: str | None
+    instance: str | None
@@ -104,6 +104,8 @@ class TeamSelectionConfigRead(BaseModel):
     reliability_weight: Decimal
     season_distribution_weight: Decimal
     late_withdrawal_hours: int
+    selection_deadline_hours: int
+    target_players: int
     late_withdrawal_penalty: Decimal
     max_late_withdrawal_penalty: Decimal
     min_attendance_score: Decimal
@@ -135,6 +137,8 @@ class TeamSelectionConfigUpdate(BaseModel):
     reliability_weight: Decimal | None = None
     season_distribution_weight: Decimal | None = None
     late_withdrawal_hours: int | None = None
+    selection_deadline_hours: int | None = None
+    target_players: int | None = None
     late_withdrawal_penalty: Decimal | None = None
     max_late_withdrawal_penalty: Decimal | None = None
     min_attendance_score: Decimal | None = None
@@ -0,0 +1,16 @@
+from datetime import datetime
+from typing import Literal
+from uuid import UUID
+
+from pydantic import BaseModel
+
+
+class SearchResult(BaseModel):
+    kind: Literal["message", "announcement"]
+    id: UUID
+    channel_id: UUID | None = None
+    title: str | None = None
+    # HTML: the text is escaped and matched terms are wrapped in <mark>
+    snippet: str
+    rank: float
+    created_at: datetime
@@ -0,0 +1,25 @@
+from datetime import datetime
+from uuid import UUID
+
+from pydantic import BaseModel
+
+
+class TaskRead(BaseModel):
+    model_config = {"from_attributes": True}
+
+    id: UUID
+    kind: str
+    status: str
+    attempts: int
+    max_attempts: int
+    priority: int
+    run_after: datetime
+    created_at: datetime
+    finished_at: datetime | None
+    result: dict | None
+    last_error: str | None
+
+
+class TaskEnqueued(BaseModel):
+    task_id: UUID
+    status: str
@@ -1,13 +1,33 @@
 from uuid import UUID
 
-from sqlalchemy import select
+from sqlalchemy import (
+    Boolean,
+    String,
+    case,
+    column,
+    func,
+    literal,
+    literal_column,
+    select,
+    true,
+    values,
+)
+from sqlalchemy.dialects.postgresql import UUID as PG_UUID
+from sqlalchemy.dialects.postgresql import aggregate_order_by
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.models.match import Match
 from app.models.match_availability import MatchAvailability
 from app.models.player import Player
+from app.models.season import Season
 from app.models.team import Team
 from app.models.team_selection import TeamSelection
 
+# One character per (player, match) cell in the season availability matrix.
+AVAILABILITY_CODES = {"available": "A", "unavailable": "U", "pending": "P"}
+NO_RESPONSE_CODE = "-"
+
 
 class AvailabilityService:
     def __init__(self, db: AsyncSession, club_id: UUID):
@@ -41,19 +61,71 @@ class AvailabilityService:
         await self.db.refresh(avail)
         return avail
 
-    async def bulk_set(self, match_ids: list[UUID], user_id: UUID, status: str) -> int:
-        # Find the player for this user in this club
-        stmt = select(Player).where(Player.club_id == self.club_id, Player.user_id == user_id)
+    async def bulk_set(self, match_ids: list[UUID], user_id: UUID, status: str) -> list[dict]:
+        """Set the current user's availability for many matches at once."""
+        stmt = select(Player.id).where(Player.club_id == self.club_id, Player.user_id == user_id)
         result = await self.db.execute(stmt)
-        player = result.scalar_one_or_none()
-        if not player:
-            return 0
+        player_id = result.scalar_one_or_none()
+        if not player_id:
+            return [{"match_id": match_id, "result": "not_found"} for match_id in match_ids]
+
+        results = await self.bulk_set_for_players(
+            [(match_id, player_id, status) for match_id in match_ids]
+        )
+        return [{"match_id": r["match_id"], "result": r["result"]} for r in results]
+
+    async def bulk_set_for_players(
+        self, entries: list[tuple[UUID, UUID, str]]
+    ) -> list[dict]:
+        """Upsert (match_id, player_id, status) entries in a single statement.
+
+        Entries whose match or player is not in this club are skipped by the
+        statement itself and reported as ``not_found``; the rest are reported as
+        ``created`` or ``updated``. Repeated (match, player) pairs keep the last status.
+        """
+        requested = {(match_id, player_id): status for match_id, player_id, status in entries}
+        if not requested:
+            return []
+
+        rows = values(
+            column("match_id", PG_UUID(as_uuid=True)),
+            column("player_id", PG_UUID(as_uuid=True)),
+            column("status", String),
+            name="requested",
+        ).data([(*key, status) for key, status in requested.items()])
+
+        upsert = pg_insert(MatchAvailability).from_select(
+            ["id", "match_id", "player_id", "status"],
+            select(func.gen_random_uuid(), rows.c.match_id, rows.c.player_id, rows.c.status)
+            .select_from(rows)
+            .join(Match, (Match.id == rows.c.match_id) & (Match.club_id == self.club_id))
+            .join(Player, (Player.id == rows.c.player_id) & (Player.club_id == self.club_id)),
+        )
+        upsert = upsert.on_conflict_do_update(
+            index_elements=[MatchAvailability.match_id, MatchAvailability.player_id],
+            set_={"status": upsert.excluded.status, "updated_at": func.now()},
+        ).returning(
+            MatchAvailability.match_id,
+            MatchAvailability.player_id,
+            # xmax is only zero on rows this statement inserted rather than updated
+            literal_column("(xmax = 0)", Boolean).label("created"),
+        )
+        result = await self.db.execute(upsert)
+        written = {(r.match_id, r.player_id): r.created for r in result.all()}
 
-        count = 0
-        for match_id in match_ids:
-            await self.set_availability(match_id, player.id, status)
-            count += 1
-        return count
+        return [
+            {
+                "match_id": match_id,
+                "player_id": player_id,
+                "status": status,
+                "result": (
+                    "not_found"
+                    if (match_id, player_id) not in written
+                    else "created" if written[(match_id, player_id)] else "updated"
+                ),
+            }
+            for (match_id, player_id), status in requested.items()
+        ]
 
     async def get_availability_summary(self, match_id: UUID) -> list[dict]:
         """Get availability for all club players for a match, with selection status."""
@@ -88,6 +160,79 @@ class AvailabilityService:
             for player, team_name in player_rows
         ]
 
+    async def get_season_matrix(self, season_id: UUID) -> dict | None:
+        """Players x matches availability for a season, in a single query.
+
+        Each player gets one string with a status code per season match, in the
+        same order as ``match_ids``. Returns None if the season is not in this club.
+        """
+        season_matches = (
+            select(
+                Match.id,
+                func.row_number()
+                .over(order_by=(Match.date, Match.time, Match.id))
+                .label("position"),
+            )
+            .where(Match.club_id == self.club_id, Match.season_id == season_id)
+            .cte("season_matches")
+        )
+        code = case(
+            *(
+                (MatchAvailability.status == status, status_code)
+                for status, status_code in AVAILABILITY_CODES.items()
+            ),
+            else_=NO_RESPONSE_CODE,
+        )
+        grid = (
+            select(
+                Player.id.label("player_id"),
+                Player.name,
+                func.coalesce(
+                    func.string_agg(
+                        code, aggregate_order_by(literal(""), season_matches.c.position)
+                    ).filter(season_matches.c.id.is_not(None)),
+                    "",
+                ).label("codes"),
+            )
+            .select_from(Player)
+            .outerjoin(season_matches, true())
+            .outerjoin(
+                MatchAvailability,
+                (MatchAvailability.match_id == season_matches.c.id)
+                & (MatchAvailability.player_id == Player.id),
+            )
+            .where(Player.club_id == self.club_id)
+            .group_by(Player.id)
+            .cte("grid")
+        )
+
+        def ordered(column, *order_by):
+            return select(func.array_agg(aggregate_order_by(column, *order_by))).scalar_subquery()
+
+        stmt = select(
+            select(Season.id)
+            .where(Season.id == season_id, Season.club_id == self.club_id)
+            .scalar_subquery()
+            .label("season_id"),
+            ordered(season_matches.c.id, season_matches.c.position).label("match_ids"),
+            ordered(grid.c.player_id, grid.c.name, grid.c.player_id).label("player_ids"),
+            ordered(grid.c.codes, grid.c.name, grid.c.player_id).label("statuses"),
+        )
+        row = (await self.db.execute(stmt)).one()
+        if row.season_id is None:
+            return None
+
+        return {
+            "season_id": row.season_id,
+            "match_ids": row.match_ids or [],
+            "player_ids": row.player_ids or [],
+            "statuses": row.statuses or [],
+            "codes": {
+                **{code: status for status, code in AVAILABILITY_CODES.items()},
+                NO_RESPONSE_CODE: "no_response",
+            },
+        }
+
     async def send_availability_requests(self, match_id: UUID) -> int:
         """Create notification stubs for players who haven't responded."""
         avail_stmt = select(MatchAvailability.player_id).where(
@@ -0,0 +1,30 @@
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.job_run import JobRun
+
+
+class JobRunService:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def get_runs(
+        self, *, job_name: str | None = None, status: str | None = None, limit: int = 50
+    ) -> list[JobRun]:
+        stmt = select(JobRun).order_by(JobRun.started_at.desc()).limit(limit)
+        if job_name:
+            stmt = stmt.where(JobRun.job_name == job_name)
+        if status:
+            stmt = stmt.where(JobRun.status == status)
+        result = await self.db.execute(stmt)
+        return list(result.scalars().all())
+
+    async def get_latest_runs(self) -> list[JobRun]:
+        """The most recent run of every job that has ever run."""
+        stmt = (
+            select(JobRun)
+            .distinct(JobRun.job_name)
+            .order_by(JobRun.job_name, JobRun.started_at.desc())
+        )
+        result = await self.db.execute(stmt)
+        return list(result.scalars().all())
@@ -1,7 +1,8 @@
 from datetime import datetime, timedelta, timezone
 from uuid import UUID, uuid4
 
-from sqlalchemy import case, func, select
+from sqlalchemy import Row, Select, case, func, insert, literal, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.match import Match
@@ -11,8 +12,85 @@ from app.models.match_participation import MatchParticipation
 from app.models.payment import Payment
 from app.models.player import Player
 from app.models.profile import Profile
+from app.models.selection_withdrawal import SelectionWithdrawal
 from app.models.team import Team
 from app.models.team_selection import TeamSelection
+from app.models.team_selection_config import TeamSelectionConfig
+
+DEADLINE_ALERT_WINDOW_DAYS = 7
+DEFAULT_SELECTION_DEADLINE_HOURS = 48
+DEFAULT_TARGET_PLAYERS = 11
+
+
+def _deadline_alerts_query(now: datetime, club_id: UUID | None = None) -> Select:
+    """Upcoming matches with their availability/selection counts and club config.
+
+    The counts are grouped once over the upcoming-match set instead of being
+    queried per match, so the whole alert list is a single round trip.
+    """
+    filters = [
+        Match.status == "upcoming",
+        Match.date <= (now + timedelta(days=DEADLINE_ALERT_WINDOW_DAYS)).date(),
+    ]
+    if club_id is not None:
+        filters.append(Match.club_id == club_id)
+    upcoming = select(Match.id).where(*filters).cte("upcoming_matches")
+
+    available = (
+        select(MatchAvailability.match_id, func.count().label("total"))
+        .join(upcoming, MatchAvailability.match_id == upcoming.c.id)
+        .where(MatchAvailability.status == "available")
+        .group_by(MatchAvailability.match_id)
+        .subquery("available")
+    )
+    selected = (
+        select(TeamSelection.match_id, func.count().label("total"))
+        .join(upcoming, TeamSelection.match_id == upcoming.c.id)
+        .group_by(TeamSelection.match_id)
+        .subquery("selected")
+    )
+
+    return (
+        select(
+            Match,
+            Team.name.label("team_name"),
+            func.coalesce(available.c.total, 0).label("available_count"),
+            func.coalesce(selected.c.total, 0).label("selected_count"),
+            func.coalesce(
+                TeamSelectionConfig.selection_deadline_hours, DEFAULT_SELECTION_DEADLINE_HOURS
+            ).label("deadline_hours"),
+            func.coalesce(
+                TeamSelectionConfig.target_players, DEFAULT_TARGET_PLAYERS
+            ).label("target_players"),
+        )
+        .join(upcoming, Match.id == upcoming.c.id)
+        .outerjoin(Team, Match.team_id == Team.id)
+        .outerjoin(TeamSelectionConfig, TeamSelectionConfig.club_id == Match.club_id)
+        .outerjoin(available, available.c.match_id == Match.id)
+        .outerjoin(selected, selected.c.match_id == Match.id)
+        .order_by(Match.date.asc())
+    )
+
+
+def _deadline_alert(row: Row, now: datetime) -> dict:
+    match = row.Match
+    match_dt = datetime.combine(match.date, match.time, tzinfo=timezone.utc)
+    deadline = match_dt - timedelta(hours=row.deadline_hours)
+    hours_until = max(0.0, (deadline - now).total_seconds() / 3600)
+
+    return {
+        "alert_id": str(uuid4()),
+        "match_id": match.id,
+        "match_date": match.date.isoformat(),
+        "match_description": f"{match.venue} vs {match.opponent}",
+        "opponent_name": match.opponent,
+        "team_name": row.team_name,
+        "deadline_at": deadline.isoformat(),
+        "hours_until_deadline": round(hours_until, 1),
+        "available_count": row.available_count,
+        "selected_count": row.selected_count,
+        "target_players": row.target_players,
+    }
 
 
 class LifecycleService:
@@ -82,54 +160,21 @@ class LifecycleService:
     async def get_deadline_alerts(self) -> list[dict]:
         """Upcoming matches with deadlines."""
         now = datetime.now(timezone.utc)
-        upcoming_cutoff = now + timedelta(days=7)
+        result = await self.db.execute(_deadline_alerts_query(now, club_id=self.club_id))
+        return [_deadline_alert(row, now) for row in result.all()]
 
-        stmt = (
-            select(Match, Team.name.label("team_name"))
-            .outerjoin(Team, Match.team_id == Team.id)
-            .where(
-                Match.club_id == self.club_id,
-                Match.status == "upcoming",
-                Match.date <= upcoming_cutoff.date(),
-            )
-            .order_by(Match.date.asc())
-        )
-        result = await self.db.execute(stmt)
-        rows = result.all()
-
-        alerts = []
-        for match, team_name in rows:
-            # Count available and selected
-            avail_count_stmt = select(func.count(MatchAvailability.id)).where(
-                MatchAvailability.match_id == match.id,
-                MatchAvailability.status == "available",
-            )
-            sel_count_stmt = select(func.count(TeamSelection.id)).where(
-                TeamSelection.match_id == match.id
-            )
-
-            avail_count = (await self.db.execute(avail_count_stmt)).scalar_one()
-            sel_count = (await self.db.execute(sel_count_stmt)).scalar_one()
-
-            # Deadline is 48h before match
-            match_dt = datetime.combine(match.date, match.time, tzinfo=timezone.utc)
-            deadline = match_dt - timedelta(hours=48)
-            hours_until = max(0.0, (deadline - now).total_seconds() / 3600)
-
-            alerts.append({
-                "alert_id": str(uuid4()),
-                "match_id": match.id,
-                "match_date": match.date.isoformat(),
-                "match_description": f"{match.venue} vs {match.opponent}",
-                "opponent_name": match.opponent,
-                "team_name": team_name,
-                "deadline_at": deadline.isoformat(),
-                "hours_until_deadline": round(hours_until, 1),
-                "available_count": avail_count,
-                "selected_count": sel_count,
-                "target_players": 11,
-            })
+    @staticmethod
+    async def get_deadline_alerts_for_all_clubs(db: AsyncSession) -> dict[UUID, list[dict]]:
+        """Deadline alerts for every club in one pass, keyed by club_id.
 
+        Used by the hourly ``selection_deadline_alerts`` job; request handlers
+        should use ``get_deadline_alerts``.
+        """
+        now = datetime.now(timezone.utc)
+        result = await db.execute(_deadline_alerts_query(now))
+        alerts: dict[UUID, list[dict]] = {}
+        for row in result.all():
+            alerts.setdefault(row.Match.club_id, []).append(_deadline_alert(row, now))
         return alerts
 
     async def get_audit_log(
@@ -139,7 +184,7 @@ class LifecycleService:
             select(
                 MatchAuditLog,
                 Player.name.label("player_name"),
-                Profile.display_name.label("actor_name"),
+                Profile.full_name.label("actor_name"),
             )
             .outerjoin(Player, MatchAuditLog.player_id == Player.id)
             .outerjoin(Profile, MatchAuditLog.actor_id == Profile.id)
@@ -215,44 +260,50 @@ class LifecycleService:
     async def confirm_participation(
         self, match_id: UUID, participations: list[dict], actor_id: UUID | None = None
     ) -> dict:
-        for p_data in participations:
-            player_id = p_data["player_id"]
+        if not participations:
+            return {"success": True}
 
-            # Upsert participation
-            stmt = select(MatchParticipation).where(
-                MatchParticipation.match_id == match_id,
-                MatchParticipation.player_id == player_id,
-            )
-            result = await self.db.execute(stmt)
-            existing = result.scalar_one_or_none()
-
-            if existing:
-                existing.status = p_data["status"]
-                existing.was_substitute = p_data.get("was_substitute", False)
-                existing.substitute_for_player_id = p_data.get("substitute_for_player_id")
-                existing.no_show_reason = p_data.get("no_show_reason")
-            else:
-                entry = MatchParticipation(
-                    match_id=match_id,
-                    player_id=player_id,
-                    status=p_data["status"],
-                    was_substitute=p_data.get("was_substitute", False),
-                    substitute_for_player_id=p_data.get("substitute_for_player_id"),
-                    no_show_reason=p_data.get("no_show_reason"),
-                )
-                self.db.add(entry)
-
-            # Audit log
-            audit = MatchAuditLog(
-                match_id=match_id,
-                player_id=player_id,
-                action="confirm_participation",
-                new_state=p_data["status"],
-                actor_id=actor_id,
+        # One row per player; a repeated player_id keeps its last entry, as the
+        # per-row upsert used to. ON CONFLICT can't touch the same row twice.
+        by_player = {p_data["player_id"]: p_data for p_data in participations}
+        rows = [
+            {
+                "match_id": match_id,
+                "player_id": player_id,
+                "status": p_data["status"],
+                "was_substitute": p_data.get("was_substitute", False),
+                "substitute_for_player_id": p_data.get("substitute_for_player_id"),
+                "no_show_reason": p_data.get("no_show_reason"),
+            }
+            for player_id, p_data in by_player.items()
+        ]
+        upsert = pg_insert(MatchParticipation).values(rows)
+        upsert = upsert.on_conflict_do_update(
+            index_elements=[MatchParticipation.match_id, MatchParticipation.player_id],
+            set_={
+                "status": upsert.excluded.status,
+                "was_substitute": upsert.excluded.was_substitute,
+                "substitute_for_player_id": upsert.excluded.substitute_for_player_id,
+                "no_show_reason": upsert.excluded.no_show_reason,
+            },
+        )
+        await self.db.execute(upsert)
+
+        await self.db.execute(
+            insert(MatchAuditLog).values(
+                [
+                    {
+                        "match_id": match_id,
+                        "player_id": p_data["player_id"],
+                        "action": "confirm_participation",
+                        "new_state": p_data["status"],
+                        "actor_id": actor_id,
+                        "details": {},
+                    }
+                    for p_data in participations
+                ]
             )
-            self.db.add(audit)
-
-        await self.db.flush()
+        )
         return {"success": True}
 
     async def record_withdrawal(
@@ -320,37 +371,37 @@ class LifecycleService:
 
     async def finalize_selection(self, match_id: UUID, actor_id: UUID | None = None) -> dict:
         """Mark all selected players as confirmed participants."""
-        sel_stmt = select(TeamSelection.player_id).where(
-            TeamSelection.match_id == match_id
+        # Players who already have a participation row (withdrawn, substitute...)
+        # keep it; only the missing ones are added as played.
+        await self.db.execute(
+            pg_insert(MatchParticipation)
+            .from_select(
+                ["id", "match_id", "player_id", "status"],
+                select(
+                    func.gen_random_uuid(),
+                    TeamSelection.match_id,
+                    TeamSelection.player_id,
+                    literal("played"),
+                ).where(TeamSelection.match_id == match_id),
+            )
+            .on_conflict_do_nothing(
+                index_elements=[MatchParticipation.match_id, MatchParticipation.player_id]
+            )
         )
-        sel_result = await self.db.execute(sel_stmt)
-        player_ids = [r[0] for r in sel_result.all()]
 
-        for pid in player_ids:
-            stmt = select(MatchParticipation).where(
-                MatchParticipation.match_id == match_id,
-                MatchParticipation.player_id == pid,
+        await self.db.execute(
+            insert(MatchAuditLog).from_select(
+                ["id", "match_id", "action", "new_state", "actor_id", "details"],
+                select(
+                    func.gen_random_uuid(),
+                    literal(match_id),
+                    literal("finalize_selection"),
+                    literal("finalized"),
+                    literal(actor_id, type_=MatchAuditLog.actor_id.type),
+                    func.json_build_object("player_count", func.count()),
+                ).where(TeamSelection.match_id == match_id),
             )
-            result = await self.db.execute(stmt)
-            existing = result.scalar_one_or_none()
-
-            if not existing:
-                entry = MatchParticipation(
-                    match_id=match_id,
-                    player_id=pid,
-                    status="played",
-                )
-                self.db.add(entry)
-
-        audit = MatchAuditLog(
-            match_id=match_id,
-            action="finalize_selection",
-            new_state="finalized",
-            actor_id=actor_id,
-            details={"player_count": len(player_ids)},
         )
-        self.db.add(audit)
-        await self.db.flush()
         return {"success": True}
 
     async def record_abandoned(
@@ -383,51 +434,101 @@ class LifecycleService:
         await self.db.flush()
         return {"success": True}
 
-    async def get_selection_stats(self, player_id: UUID) -> dict:
-        """Stats for a player's selection history."""
-        # Matches available
-        avail_stmt = select(func.count(MatchAvailability.id)).where(
-            MatchAvailability.player_id == player_id,
-            MatchAvailability.status == "available",
+    def _selection_stats_query(self, player_id: UUID | None = None) -> Select:
+        """Selection history counters for the club's players, one row per player.
+
+        Each source table is aggregated once (conditionally where it holds several
+        counters) and joined back to the player list, so a whole squad costs the
+        same single query as one player.
+        """
+        filters = [Player.club_id == self.club_id]
+        if player_id is not None:
+            filters.append(Player.id == player_id)
+        players = select(Player.id, Player.name).where(*filters).cte("stat_players")
+
+        availability = (
+            select(MatchAvailability.player_id, func.count().label("available"))
+            .join(players, MatchAvailability.player_id == players.c.id)
+            .where(MatchAvailability.status == "available")
+            .group_by(MatchAvailability.player_id)
+            .subquery("availability")
         )
-        avail_count = (await self.db.execute(avail_stmt)).scalar_one()
-
-        # Matches selected
-        sel_stmt = select(func.count(TeamSelection.id)).where(
-            TeamSelection.player_id == player_id,
+        selections = (
+            select(TeamSelection.player_id, func.count().label("selected"))
+            .join(players, TeamSelection.player_id == players.c.id)
+            .group_by(TeamSelection.player_id)
+            .subquery("selections")
         )
-        sel_count = (await self.db.execute(sel_stmt)).scalar_one()
-
-        # Matches played
-        played_stmt = select(func.count(MatchParticipation.id)).where(
-            MatchParticipation.player_id == player_id,
-            MatchParticipation.status == "played",
+        participation = (
+            select(
+                MatchParticipation.player_id,
+                func.count().filter(MatchParticipation.status == "played").label("played"),
+                func.count().filter(MatchParticipation.status == "no_show").label("no_shows"),
+                func.count().filter(MatchParticipation.status == "withdrawn").label("withdrawals"),
+            )
+            .join(players, MatchParticipation.player_id == players.c.id)
+            .group_by(MatchParticipation.player_id)
+            .subquery("participation")
         )
-        played_count = (await self.db.execute(played_stmt)).scalar_one()
-
-        # No shows
-        noshow_stmt = select(func.count(MatchParticipation.id)).where(
-            MatchParticipation.player_id == player_id,
-            MatchParticipation.status == "no_show",
+        late_withdrawals = (
+            select(SelectionWithdrawal.player_id, func.count().label("late"))
+            .join(players, SelectionWithdrawal.player_id == players.c.id)
+            .where(SelectionWithdrawal.is_late.is_(True))
+            .group_by(SelectionWithdrawal.player_id)
+            .subquery("late_withdrawals")
         )
-        noshow_count = (await self.db.execute(noshow_stmt)).scalar_one()
 
-        # Withdrawals
-        withdrawal_stmt = select(func.count(MatchParticipation.id)).where(
-            MatchParticipation.player_id == player_id,
-            MatchParticipation.status == "withdrawn",
+        return (
+            select(
+                players.c.id.label("player_id"),
+                func.coalesce(availability.c.available, 0).label("matches_available"),
+                func.coalesce(selections.c.selected, 0).label("matches_selected"),
+                func.coalesce(participation.c.played, 0).label("matches_played"),
+                func.coalesce(participation.c.no_shows, 0).label("no_shows"),
+                func.coalesce(participation.c.withdrawals, 0).label("withdrawals"),
+                func.coalesce(late_withdrawals.c.late, 0).label("late_withdrawals"),
+            )
+            .select_from(players)
+            .outerjoin(availability, availability.c.player_id == players.c.id)
+            .outerjoin(selections, selections.c.player_id == players.c.id)
+            .outerjoin(participation, participation.c.player_id == players.c.id)
+            .outerjoin(late_withdrawals, late_withdrawals.c.player_id == players.c.id)
+            .order_by(players.c.name)
         )
-        withdrawal_count = (await self.db.execute(withdrawal_stmt)).scalar_one()
-
-        selection_rate = round(sel_count / avail_count * 100, 1) if avail_count > 0 else 0.0
 
+    @staticmethod
+    def _selection_stats(row: Row) -> dict:
+        available = row.matches_available
+        selected = row.matches_selected
         return {
-            "player_id": player_id,
-            "matches_available": avail_count,
-            "matches_selected": sel_count,
-            "matches_played": played_count,
-            "selection_rate": selection_rate,
-            "no_shows": noshow_count,
-            "withdrawals": withdrawal_count,
-            "late_withdrawals": 0,
+            "player_id": row.player_id,
+            "matches_available": available,
+            "matches_selected": selected,
+            "matches_played": row.matches_played,
+            "selection_rate": round(selected / available * 100, 1) if available > 0 else 0.0,
+            "no_shows": row.no_shows,
+            "withdrawals": row.withdrawals,
+            "late_withdrawals": row.late_withdrawals,
         }
+
+    async def get_selection_stats(self, player_id: UUID) -> dict:
+        """Stats for a player's selection history."""
+        result = await self.db.execute(self._selection_stats_query(player_id))
+        row = result.one_or_none()
+        if row is None:
+            return {
+                "player_id": player_id,
+                "matches_available": 0,
+                "matches_selected": 0,
+                "matches_played": 0,
+                "selection_rate": 0.0,
+                "no_shows": 0,
+                "withdrawals": 0,
+                "late_withdrawals": 0,
+            }
+        return self._selection_stats(row)
+
+    async def get_club_selection_stats(self) -> list[dict]:
+        """Selection stats for every player in the club, in one query."""
+        result = await self.db.execute(self._selection_stats_query())
+        return [self._selection_stats(row) for row in result.all()]
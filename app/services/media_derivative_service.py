@@ -0,0 +1,96 @@
+"""Derivative generation for uploaded images.
+
+Completing an upload enqueues a ``media_derivatives`` task for the new
+file's content hash. A worker renders every size in a process pool, so the
+event loop only moves bytes, and stores the results under keys derived from
+the hash. Everything keyed by the hash is shared: an identical upload reuses
+the stored derivatives without rendering, and one task fills in every item
+pointing at the same file.
+"""
+
+import asyncio
+import uuid
+
+from sqlalchemy import func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import get_settings
+from app.integrations.imaging import (
+    DERIVATIVE_FORMAT,
+    DERIVATIVE_SPECS,
+    get_executor,
+    render_derivatives,
+)
+from app.integrations.storage import StorageBackend, get_storage
+from app.models.media_item import MediaItem
+
+DERIVATIVES_TASK_KIND = "media_derivatives"
+
+
+def derivative_key(content_hash: str, name: str) -> str:
+    return f"derivatives/{content_hash[:2]}/{content_hash}/{name}.{DERIVATIVE_FORMAT}"
+
+
+class MediaDerivativeService:
+    def __init__(self, db: AsyncSession, storage: StorageBackend | None = None):
+        self.db = db
+        self.storage = storage or get_storage()
+
+    async def find_existing(self, content_hash: str) -> dict[str, str] | None:
+        """Derivatives already generated for this file, if any."""
+        stmt = (
+            select(MediaItem.derivatives)
+            .where(MediaItem.content_hash == content_hash, MediaItem.derivatives.is_not(None))
+            .limit(1)
+        )
+        return await self.db.scalar(stmt)
+
+    async def generate(self, content_hash: str, source_key: str) -> dict:
+        """Render (or reuse) the derivatives of one file and attach them to its items."""
+        keys = {spec.name: derivative_key(content_hash, spec.name) for spec in DERIVATIVE_SPECS}
+        cached = all(await asyncio.gather(*(self.storage.exists(k) for k in keys.values())))
+        if not cached:
+            source = await self._read(source_key)
+            if source is None:
+                return {"skipped": "source too large"}
+            loop = asyncio.get_running_loop()
+            rendered = await loop.run_in_executor(
+                get_executor(), render_derivatives, source, DERIVATIVE_SPECS
+            )
+            del source
+            for name, data in rendered.items():
+                # Only complete files reach the final key, which counts as cached forever
+                partial = f"{keys[name]}.{uuid.uuid4().hex}.partial"
+                try:
+                    await self.storage.write_at(partial, 0, _chunks(data))
+                    await self.storage.move(partial, keys[name])
+                except Exception:
+                    await self.storage.delete(partial)
+                    raise
+
+        urls = {name: self.storage.url(key) for name, key in keys.items()}
+        stmt = (
+            update(MediaItem)
+            .where(MediaItem.content_hash == content_hash, MediaItem.media_type == "image")
+            .values(
+                derivatives=urls,
+                thumbnail_url=func.coalesce(MediaItem.thumbnail_url, urls["thumb"]),
+            )
+            .returning(MediaItem.id)
+            .execution_options(synchronize_session=False)
+        )
+        result = await self.db.execute(stmt)
+        return {"items": len(result.all()), "cached": cached}
+
+    async def _read(self, key: str) -> bytes | None:
+        limit = get_settings().media_derivative_max_source_bytes
+        data = bytearray()
+        async for block in self.storage.read(key):
+            data += block
+            if len(data) > limit:
+                return None
+        return bytes(data)
+
+
+async def _chunks(data: bytes):
+    yield data
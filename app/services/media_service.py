@@ -1,9 +1,13 @@
+from datetime import datetime
 from uuid import UUID
 
-from sqlalchemy import Column, ForeignKey, Table, func, select
+from sqlalchemy import Column, ForeignKey, Index, ScalarSelect, Select, Table, func, select
 from sqlalchemy.dialects.postgresql import UUID as PGUUID
+from sqlalchemy.dialects.postgresql import aggregate_order_by
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.pagination import keyset_after
+from app.core.summary_cache import invalidate_on_write, summary_cache
 from app.models.base import Base
 from app.models.media_gallery import MediaGallery
 from app.models.media_item import MediaItem
@@ -16,9 +20,14 @@ media_item_tags = Table(
     Base.metadata,
     Column("media_item_id", PGUUID(as_uuid=True), ForeignKey("media_items.id"), primary_key=True),
     Column("media_tag_id", PGUUID(as_uuid=True), ForeignKey("media_tags.id"), primary_key=True),
+    # Tag filter: items carrying a tag, without scanning the (item, tag) primary key
+    Index("idx_media_item_tags_tag_item", "media_tag_id", "media_item_id"),
     extend_existing=True,
 )
 
+# Media item columns, resolved once rather than per row
+ITEM_COLUMNS = tuple(MediaItem.__table__.columns)
+
 
 class MediaGalleryService(BaseService[MediaGallery]):
     def __init__(self, db: AsyncSession, club_id: UUID):
@@ -73,43 +82,65 @@ class MediaItemService(BaseService[MediaItem]):
     def __init__(self, db: AsyncSession, club_id: UUID):
         super().__init__(model=MediaItem, db=db, club_id=club_id)
 
-    async def get_all_with_tags(self, gallery_id: UUID | None = None) -> list[dict]:
-        stmt = self._scoped_query().order_by(MediaItem.created_at.desc())
+    async def get_all_with_tags(
+        self,
+        gallery_id: UUID | None = None,
+        *,
+        tag_id: UUID | None = None,
+        limit: int = 50,
+        after: tuple[datetime, UUID] | None = None,
+    ) -> list[dict]:
+        """A page of items, newest first, starting after the ``(created_at, id)`` key."""
+        stmt = (
+            select(*ITEM_COLUMNS)
+            .where(MediaItem.club_id == self.club_id)
+            .order_by(MediaItem.created_at.desc(), MediaItem.id.desc())
+            .limit(limit)
+        )
         if gallery_id:
             stmt = stmt.where(MediaItem.gallery_id == gallery_id)
-        result = await self.db.execute(stmt)
-        items = list(result.scalars().all())
-
-        items_data = []
-        for item in items:
-            tags = await self._get_tags(item.id)
-            items_data.append({
-                **{c.key: getattr(item, c.key) for c in MediaItem.__table__.columns},
-                "tags": tags,
-            })
-        return items_data
+        if tag_id:
+            stmt = stmt.where(
+                select(media_item_tags.c.media_item_id)
+                .where(
+                    media_item_tags.c.media_tag_id == tag_id,
+                    media_item_tags.c.media_item_id == MediaItem.id,
+                )
+                .exists()
+            )
+        if after:
+            stmt = stmt.where(keyset_after([MediaItem.created_at, MediaItem.id], after))
+        return await self._with_tags(stmt)
 
     async def get_with_tags(self, item_id: UUID) -> dict | None:
-        item = await self.get_by_id(item_id)
-        if not item:
-            return None
-        tags = await self._get_tags(item.id)
-        return {
-            **{c.key: getattr(item, c.key) for c in MediaItem.__table__.columns},
-            "tags": tags,
-        }
+        stmt = select(*ITEM_COLUMNS).where(
+            MediaItem.club_id == self.club_id, MediaItem.id == item_id
+        )
+        items = await self._with_tags(stmt)
+        return items[0] if items else None
 
     async def create(self, *, uploaded_by: UUID, **kwargs) -> MediaItem:
         return await super().create(uploaded_by=uploaded_by, **kwargs)
 
-    async def _get_tags(self, item_id: UUID) -> list[str]:
+    async def _with_tags(self, items: Select) -> list[dict]:
+        """Rows of ``items`` as dicts with their tag names, in the same query.
+
+        ``items`` is paged first; only its rows are joined to their tags and
+        grouped, with the names collected by ``array_agg``.
+        """
+        page = items.subquery("page")
+        tag_names = func.array_agg(aggregate_order_by(MediaTag.name, MediaTag.name)).filter(
+            MediaTag.name.is_not(None)
+        )
         stmt = (
-            select(MediaTag.name)
-            .join(media_item_tags, MediaTag.id == media_item_tags.c.media_tag_id)
-            .where(media_item_tags.c.media_item_id == item_id)
+            select(page, tag_names.label("tags"))
+            .outerjoin(media_item_tags, media_item_tags.c.media_item_id == page.c.id)
+            .outerjoin(MediaTag, MediaTag.id == media_item_tags.c.media_tag_id)
+            .group_by(*page.c)
+            .order_by(page.c.created_at.desc(), page.c.id.desc())
         )
         result = await self.db.execute(stmt)
-        return [r[0] for r in result.all()]
+        return [{**row, "tags": row["tags"] or []} for row in result.mappings().all()]
 
 
 class MediaTagService(BaseService[MediaTag]):
@@ -123,17 +154,18 @@ class MediaTagService(BaseService[MediaTag]):
         return list(result.scalars().all())
 
     async def get_summary(self) -> dict:
-        galleries = (await self.db.execute(
-            select(func.count()).where(MediaGallery.club_id == self.club_id)
-        )).scalar_one()
-        items = (await self.db.execute(
-            select(func.count()).where(MediaItem.club_id == self.club_id)
-        )).scalar_one()
-        tags = (await self.db.execute(
-            select(func.count()).where(MediaTag.club_id == self.club_id)
-        )).scalar_one()
-        return {
-            "total_galleries": galleries,
-            "total_items": items,
-            "total_tags": tags,
-        }
+        return await summary_cache.get(self.db, self.club_id, "media", self._load_summary)
+
+    async def _load_summary(self) -> dict:
+        def count(model) -> ScalarSelect:
+            return select(func.count()).where(model.club_id == self.club_id).scalar_subquery()
+
+        stmt = select(
+            count(MediaGallery).label("total_galleries"),
+            count(MediaItem).label("total_items"),
+            count(MediaTag).label("total_tags"),
+        )
+        return dict((await self.db.execute(stmt)).mappings().one())
+
+
+invalidate_on_write(MediaGallery, MediaItem, MediaTag)
@@ -0,0 +1,221 @@
+import hashlib
+from collections.abc import AsyncIterator
+from datetime import datetime
+from uuid import UUID
+
+from sqlalchemy import select
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import get_settings
+from app.core.exceptions import BadRequestError, ConflictError, NotFoundError
+from app.core.task_queue import enqueue
+from app.integrations.storage import StorageBackend, get_storage
+from app.models.media_item import MediaItem
+from app.models.media_upload import MediaUpload
+from app.services.media_derivative_service import DERIVATIVES_TASK_KIND, MediaDerivativeService
+
+ALLOWED_TYPES = ("image/", "video/")
+LOCK_NOT_AVAILABLE = "55P03"
+
+
+def staging_key(upload_id: UUID) -> str:
+    return f"uploads/{upload_id}"
+
+
+def content_key(content_hash: str) -> str:
+    return f"objects/{content_hash[:2]}/{content_hash}"
+
+
+class MediaUploadService:
+    """Resumable uploads that become MediaItems.
+
+    The client creates an upload with its size, then sends the bytes in one or
+    more ``append`` calls, each starting at the offset received so far. The
+    bytes stream straight into storage. The last chunk hashes the file and
+    creates the MediaItem. The file is then moved to a content-addressed key,
+    or dropped if an identical file is already stored. Images get their
+    resized derivatives from a background task, or straight away from an
+    identical file that already has them. An upload whose staged bytes have
+    gone missing starts again from offset 0.
+    """
+
+    def __init__(
+        self, db: AsyncSession, club_id: UUID, storage: StorageBackend | None = None
+    ):
+        self.db = db
+        self.club_id = club_id
+        self.storage = storage or get_storage()
+
+    async def create(
+        self,
+        *,
+        uploaded_by: UUID,
+        filename: str,
+        content_type: str,
+        total_bytes: int,
+        gallery_id: UUID | None = None,
+        title: str | None = None,
+        description: str | None = None,
+    ) -> MediaUpload:
+        if not content_type.startswith(ALLOWED_TYPES):
+            raise BadRequestError("Only image and video uploads are supported")
+        if total_bytes > get_settings().media_upload_max_bytes:
+            raise BadRequestError("File is too large")
+        upload = MediaUpload(
+            club_id=self.club_id,
+            uploaded_by=uploaded_by,
+            filename=filename,
+            content_type=content_type,
+            total_bytes=total_bytes,
+            received_bytes=0,
+            status="uploading",
+            gallery_id=gallery_id,
+            title=title,
+            description=description,
+        )
+        self.db.add(upload)
+        await self.db.flush()
+        return upload
+
+    async def get(self, upload_id: UUID) -> MediaUpload | None:
+        stmt = select(MediaUpload).where(
+            MediaUpload.id == upload_id, MediaUpload.club_id == self.club_id
+        )
+        upload = (await self.db.execute(stmt)).scalar_one_or_none()
+        if upload is not None:
+            await self._check_staged(upload)
+        return upload
+
+    async def append(
+        self, upload_id: UUID, offset: int, chunks: AsyncIterator[bytes]
+    ) -> tuple[MediaUpload, MediaItem | None]:
+        """Write ``chunks`` at ``offset``; returns the upload and, once complete, its item.
+
+        The upload row stays locked while the chunk streams in, so a second
+        request for the same upload fails fast with a conflict instead of
+        interleaving writes. Behind nginx the body is already buffered, so
+        the lock is held for a local disk write, not for a slow client.
+        """
+        stmt = (
+            select(MediaUpload)
+            .where(MediaUpload.id == upload_id, MediaUpload.club_id == self.club_id)
+            .with_for_update(nowait=True)
+        )
+        try:
+            upload = (await self.db.execute(stmt)).scalar_one_or_none()
+        except DBAPIError as exc:
+            if getattr(exc.orig, "sqlstate", None) == LOCK_NOT_AVAILABLE:
+                raise ConflictError("Another request is writing to this upload") from exc
+            raise
+        if upload is None:
+            raise NotFoundError("Upload not found")
+        if upload.status != "uploading":
+            raise ConflictError("Upload is already complete")
+        await self._check_staged(upload)
+        if offset != upload.received_bytes:
+            raise ConflictError(f"Upload offset is {upload.received_bytes}")
+
+        remaining = upload.total_bytes - offset
+        written = await self.storage.write_at(
+            staging_key(upload.id), offset, _limit(chunks, remaining)
+        )
+        upload.received_bytes = offset + written
+        item = None
+        if upload.received_bytes == upload.total_bytes:
+            item = await self._complete(upload)
+        await self.db.flush()
+        return upload, item
+
+    async def _complete(self, upload: MediaUpload) -> MediaItem:
+        staged = staging_key(upload.id)
+        digest = hashlib.sha256()
+        async for block in self.storage.read(staged):
+            digest.update(block)
+        content_hash = digest.hexdigest()
+
+        key = content_key(content_hash)
+        duplicate = await self.storage.exists(key)
+
+        media_type = "video" if upload.content_type.startswith("video/") else "image"
+        derivatives = None
+        if media_type == "image":
+            if duplicate:
+                derivatives = await MediaDerivativeService(self.db, self.storage).find_existing(
+                    content_hash
+                )
+            if derivatives is None:
+                await enqueue(
+                    self.db,
+                    DERIVATIVES_TASK_KIND,
+                    {"content_hash": content_hash},
+                    club_id=self.club_id,
+                )
+
+        item = MediaItem(
+            club_id=self.club_id,
+            gallery_id=upload.gallery_id,
+            title=upload.title or upload.filename,
+            description=upload.description,
+            media_type=media_type,
+            url=self.storage.url(key),
+            thumbnail_url=derivatives["thumb"] if derivatives else None,
+            uploaded_by=upload.uploaded_by,
+            content_hash=content_hash,
+            content_type=upload.content_type,
+            size_bytes=upload.total_bytes,
+            derivatives=derivatives,
+        )
+        self.db.add(item)
+        await self.db.flush()
+        upload.status = "completed"
+        upload.media_item_id = item.id
+        await self.db.flush()
+
+        # Storage last, once the rows are written. If the commit still fails,
+        # the staged bytes are gone and the next request restarts the upload.
+        if duplicate:
+            await self.storage.delete(staged)
+        else:
+            await self.storage.move(staged, key)
+        return item
+
+    async def _check_staged(self, upload: MediaUpload) -> None:
+        """Restart an unfinished upload whose staged bytes are missing from storage."""
+        if (
+            upload.status == "uploading"
+            and upload.received_bytes
+            and not await self.storage.exists(staging_key(upload.id))
+        ):
+            upload.received_bytes = 0
+
+    @staticmethod
+    async def discard_stale(
+        db: AsyncSession, older_than: datetime, storage: StorageBackend | None = None
+    ) -> int:
+        """Delete unfinished uploads last touched before ``older_than`` and their bytes."""
+        storage = storage or get_storage()
+        stmt = (
+            select(MediaUpload)
+            .where(MediaUpload.status == "uploading", MediaUpload.updated_at < older_than)
+            .with_for_update(skip_locked=True)
+        )
+        uploads = (await db.execute(stmt)).scalars().all()
+        for upload in uploads:
+            await storage.delete(staging_key(upload.id))
+            await db.delete(upload)
+        await db.flush()
+        return len(uploads)
+
+
+async def _limit(chunks: AsyncIterator[bytes], remaining: int) -> AsyncIterator[bytes]:
+    """Pass ``chunks`` through, refusing a request larger than a chunk or the rest of the file."""
+    limit = min(remaining, get_settings().media_upload_chunk_max_bytes)
+    seen = 0
+    async for chunk in chunks:
+        seen += len(chunk)
+        if seen > limit:
+            if seen > remaining:
+                raise BadRequestError("More bytes than the upload's declared size")
+            raise BadRequestError("Chunk is larger than the maximum upload chunk size")
+        yield chunk
@@ -1,9 +1,15 @@
+from collections import defaultdict
+from datetime import datetime
 from decimal import Decimal
-from uuid import UUID
+from uuid import UUID, uuid4
 
-from sqlalchemy import func, select
+from sqlalchemy import Integer, Select, and_, column, func, insert, select, update, values
+from sqlalchemy.dialects.postgresql import UUID as PG_UUID
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.exceptions import BadRequestError, ConflictError
+from app.core.pagination import keyset_after
+from app.core.summary_cache import invalidate_on_write, invalidate_summaries, summary_cache
 from app.models.merchandise_category import MerchandiseCategory
 from app.models.merchandise_item import MerchandiseItem
 from app.models.merchandise_order import MerchandiseOrder
@@ -58,42 +64,40 @@ class MerchItemService(BaseService[MerchandiseItem]):
         return list(result.scalars().all())
 
     async def get_summary(self) -> dict:
-        total = await self.db.execute(
-            select(func.count()).where(MerchandiseItem.club_id == self.club_id)
-        )
-        active = await self.db.execute(
-            select(func.count()).where(
-                MerchandiseItem.club_id == self.club_id,
-                MerchandiseItem.is_active.is_(True),
-            )
-        )
-        categories = await self.db.execute(
-            select(func.count()).where(MerchandiseCategory.club_id == self.club_id)
-        )
-        low_stock = await self.db.execute(
-            select(func.count()).where(
-                MerchandiseItem.club_id == self.club_id,
-                MerchandiseItem.is_active.is_(True),
-                MerchandiseItem.stock_quantity <= MerchandiseItem.low_stock_threshold,
+        return await summary_cache.get(self.db, self.club_id, "merch_items", self._load_summary)
+
+    async def _load_summary(self) -> dict:
+        active = MerchandiseItem.is_active.is_(True)
+        items = (
+            select(
+                func.count().label("total_items"),
+                func.count().filter(active).label("active_items"),
+                func.count()
+                .filter(
+                    active,
+                    MerchandiseItem.stock_quantity <= MerchandiseItem.low_stock_threshold,
+                )
+                .label("low_stock_count"),
             )
+            .where(MerchandiseItem.club_id == self.club_id)
+            .subquery("items")
         )
-        orders = await self.db.execute(
-            select(func.count()).where(MerchandiseOrder.club_id == self.club_id)
+        categories = (
+            select(func.count())
+            .where(MerchandiseCategory.club_id == self.club_id)
+            .scalar_subquery()
         )
-        pending = await self.db.execute(
-            select(func.count()).where(
-                MerchandiseOrder.club_id == self.club_id,
-                MerchandiseOrder.status == "pending",
-            )
+        orders = _order_totals(self.club_id).subquery("orders")
+        # Each aggregate yields exactly one row, so they cross join into one
+        stmt = select(
+            items.c.total_items,
+            items.c.active_items,
+            categories.label("total_categories"),
+            items.c.low_stock_count,
+            orders.c.total_orders,
+            orders.c.pending_orders,
         )
-        return {
-            "total_items": total.scalar_one(),
-            "active_items": active.scalar_one(),
-            "total_categories": categories.scalar_one(),
-            "low_stock_count": low_stock.scalar_one(),
-            "total_orders": orders.scalar_one(),
-            "pending_orders": pending.scalar_one(),
-        }
+        return dict((await self.db.execute(stmt)).mappings().one())
 
 
 class MerchVariantService:
@@ -145,89 +149,142 @@ class MerchOrderService:
         self.db = db
         self.club_id = club_id
 
-    async def get_all(self) -> list[dict]:
+    async def get_all(
+        self,
+        *,
+        status: str | None = None,
+        created_from: datetime | None = None,
+        created_to: datetime | None = None,
+        limit: int = 50,
+        after: tuple[datetime, UUID] | None = None,
+    ) -> list[dict]:
+        """A page of orders, newest first, starting after the ``(created_at, id)`` key."""
         stmt = (
-            select(MerchandiseOrder, Profile.display_name.label("user_name"))
-            .outerjoin(Profile, MerchandiseOrder.user_id == Profile.id)
+            self._orders_query()
             .where(MerchandiseOrder.club_id == self.club_id)
-            .order_by(MerchandiseOrder.created_at.desc())
+            .order_by(MerchandiseOrder.created_at.desc(), MerchandiseOrder.id.desc())
+            .limit(limit)
         )
-        result = await self.db.execute(stmt)
-        rows = result.all()
-
-        orders = []
-        for order, user_name in rows:
-            items = await self._get_order_items(order.id)
-            orders.append({
-                "id": order.id,
-                "club_id": order.club_id,
-                "user_id": order.user_id,
-                "status": order.status,
-                "total_amount": order.total_amount,
-                "notes": order.notes,
-                "created_at": order.created_at,
-                "items": items,
-                "user_name": user_name,
-            })
-        return orders
+        if status:
+            stmt = stmt.where(MerchandiseOrder.status == status)
+        if created_from:
+            stmt = stmt.where(MerchandiseOrder.created_at >= created_from)
+        if created_to:
+            stmt = stmt.where(MerchandiseOrder.created_at < created_to)
+        if after:
+            stmt = stmt.where(
+                keyset_after([MerchandiseOrder.created_at, MerchandiseOrder.id], after)
+            )
+        return await self._with_items(stmt)
 
     async def get_by_id(self, order_id: UUID) -> dict | None:
-        stmt = (
-            select(MerchandiseOrder, Profile.display_name.label("user_name"))
-            .outerjoin(Profile, MerchandiseOrder.user_id == Profile.id)
-            .where(MerchandiseOrder.id == order_id)
+        orders = await self._with_items(
+            self._orders_query().where(MerchandiseOrder.id == order_id)
         )
-        result = await self.db.execute(stmt)
-        row = result.one_or_none()
-        if not row:
-            return None
-        order, user_name = row
-        items = await self._get_order_items(order.id)
-        return {
-            "id": order.id,
-            "club_id": order.club_id,
-            "user_id": order.user_id,
-            "status": order.status,
-            "total_amount": order.total_amount,
-            "notes": order.notes,
-            "created_at": order.created_at,
-            "items": items,
-            "user_name": user_name,
-        }
+        return orders[0] if orders else None
+
+    @staticmethod
+    def _orders_query() -> Select:
+        return select(
+            MerchandiseOrder.id,
+            MerchandiseOrder.club_id,
+            MerchandiseOrder.user_id,
+            MerchandiseOrder.status,
+            MerchandiseOrder.total_amount,
+            MerchandiseOrder.notes,
+            MerchandiseOrder.created_at,
+            Profile.full_name.label("user_name"),
+        ).outerjoin(Profile, MerchandiseOrder.user_id == Profile.id)
+
+    async def _with_items(self, orders: Select) -> list[dict]:
+        """Run ``orders`` and attach their items, fetched for all of them in one query."""
+        rows = (await self.db.execute(orders)).mappings().all()
+        items = await self._get_order_items([row["id"] for row in rows])
+        return [{**row, "items": items.get(row["id"], [])} for row in rows]
 
     async def create_order(self, user_id: UUID, items_input: list[dict], notes: str | None) -> dict:
+        """Place an order, reserving its stock or failing without touching any.
+
+        Stock is taken from the variant when one is ordered, else from the
+        item. All lines are priced from one query and reserved with one
+        conditional UPDATE per table, so concurrent orders can never take the
+        same units twice.
+        """
+        item_ids = {line["item_id"] for line in items_input}
+        variant_ids = {line["variant_id"] for line in items_input if line.get("variant_id")}
+        stmt = (
+            select(
+                MerchandiseItem.id,
+                MerchandiseItem.name,
+                MerchandiseItem.base_price,
+                MerchandiseVariant.id.label("variant_id"),
+                MerchandiseVariant.name.label("variant_name"),
+                MerchandiseVariant.price_adjustment,
+            )
+            .outerjoin(
+                MerchandiseVariant,
+                and_(
+                    MerchandiseVariant.item_id == MerchandiseItem.id,
+                    MerchandiseVariant.id.in_(variant_ids),
+                    MerchandiseVariant.is_active.is_(True),
+                ),
+            )
+            .where(
+                MerchandiseItem.id.in_(item_ids),
+                MerchandiseItem.club_id == self.club_id,
+                MerchandiseItem.is_active.is_(True),
+            )
+        )
+        rows = (await self.db.execute(stmt)).all()
+        items = {row.id: row for row in rows}
+        variants = {row.variant_id: row for row in rows if row.variant_id}
+
         total = Decimal("0")
         order_items_data = []
-
-        for item_input in items_input:
-            item_stmt = select(MerchandiseItem).where(MerchandiseItem.id == item_input["item_id"])
-            item_result = await self.db.execute(item_stmt)
-            item = item_result.scalar_one_or_none()
-            if not item:
-                continue
+        item_quantities: dict[UUID, int] = defaultdict(int)
+        variant_quantities: dict[UUID, int] = defaultdict(int)
+        labels: dict[UUID, str] = {}
+        for line in items_input:
+            item = items.get(line["item_id"])
+            variant_id = line.get("variant_id")
+            variant = variants.get(variant_id) if variant_id else None
+            # A variant's row carries its own item's id; it must be the one ordered
+            if item is None or (variant_id and (variant is None or variant.id != item.id)):
+                raise BadRequestError("Item is not available")
 
             unit_price = item.base_price
-            variant_name = None
-
-            if item_input.get("variant_id"):
-                var_stmt = select(MerchandiseVariant).where(
-                    MerchandiseVariant.id == item_input["variant_id"]
-                )
-                var_result = await self.db.execute(var_stmt)
-                variant = var_result.scalar_one_or_none()
-                if variant:
-                    unit_price += variant.price_adjustment
-                    variant_name = variant.name
-
-            total += unit_price * item_input["quantity"]
+            if variant:
+                unit_price += variant.price_adjustment
+                variant_quantities[variant_id] += line["quantity"]
+                labels[variant_id] = f"{item.name} ({variant.variant_name})"
+            else:
+                item_quantities[item.id] += line["quantity"]
+                labels[item.id] = item.name
+            total += unit_price * line["quantity"]
             order_items_data.append({
+                "id": uuid4(),
                 "item_id": item.id,
-                "variant_id": item_input.get("variant_id"),
-                "quantity": item_input["quantity"],
+                "variant_id": variant_id,
+                "quantity": line["quantity"],
                 "unit_price": unit_price,
                 "item_name": item.name,
-                "variant_name": variant_name,
+                "variant_name": variant.variant_name if variant else None,
             })
+        if not order_items_data:
+            raise BadRequestError("An order needs at least one item")
+
+        # A savepoint, so a partly covered order leaves every stock count as it was
+        async with self.db.begin_nested():
+            # Items before variants, like every stock change, so row locks never cross
+            short = await self._adjust_stock(MerchandiseItem, item_quantities, release=False)
+            short |= await self._adjust_stock(
+                MerchandiseVariant, variant_quantities, release=False
+            )
+            if short:
+                names = ", ".join(sorted(labels[i] for i in short))
+                raise ConflictError(f"Not enough stock: {names}")
+        # Stock counts feed the low-stock summary, and Core updates skip its tracking
+        await invalidate_summaries(self.db, self.club_id)
 
         order = MerchandiseOrder(
             club_id=self.club_id,
@@ -237,21 +294,28 @@ class MerchOrderService:
         )
         self.db.add(order)
         await self.db.flush()
-
-        for oi_data in order_items_data:
-            oi = MerchandiseOrderItem(order_id=order.id, **oi_data)
-            self.db.add(oi)
-        await self.db.flush()
-        await self.db.refresh(order)
-
+        await self.db.execute(
+            insert(MerchandiseOrderItem).values(
+                [{**data, "order_id": order.id} for data in order_items_data]
+            )
+        )
         return await self.get_by_id(order.id)
 
     async def update_status(self, order_id: UUID, status: str) -> dict | None:
-        stmt = select(MerchandiseOrder).where(MerchandiseOrder.id == order_id)
+        """Change an order's status; cancelling it puts its stock back."""
+        stmt = (
+            select(MerchandiseOrder)
+            .where(MerchandiseOrder.id == order_id)
+            .with_for_update()
+        )
         result = await self.db.execute(stmt)
         order = result.scalar_one_or_none()
         if not order:
             return None
+        if order.status == "cancelled" and status != "cancelled":
+            raise ConflictError("A cancelled order cannot be reopened")
+        if status == "cancelled" and order.status != "cancelled":
+            await self._release_stock(order.id)
         order.status = status
         await self.db.flush()
         return await self.get_by_id(order_id)
@@ -260,42 +324,103 @@ class MerchOrderService:
         return await self.update_status(order_id, "cancelled")
 
     async def get_order_summary(self) -> dict:
-        base = select(func.count()).where(MerchandiseOrder.club_id == self.club_id)
-        total = (await self.db.execute(base)).scalar_one()
-        pending = (await self.db.execute(
-            base.where(MerchandiseOrder.status == "pending")
-        )).scalar_one()
-        confirmed = (await self.db.execute(
-            base.where(MerchandiseOrder.status == "confirmed")
-        )).scalar_one()
-        revenue_stmt = (
-            select(func.coalesce(func.sum(MerchandiseOrder.total_amount), 0))
-            .where(
-                MerchandiseOrder.club_id == self.club_id,
-                MerchandiseOrder.status.notin_(["cancelled"]),
-            )
+        return await summary_cache.get(self.db, self.club_id, "merch_orders", self._load_summary)
+
+    async def _load_summary(self) -> dict:
+        result = await self.db.execute(_order_totals(self.club_id))
+        return dict(result.mappings().one())
+
+    async def _release_stock(self, order_id: UUID) -> None:
+        stmt = select(
+            MerchandiseOrderItem.item_id,
+            MerchandiseOrderItem.variant_id,
+            MerchandiseOrderItem.quantity,
+        ).where(MerchandiseOrderItem.order_id == order_id)
+        item_quantities: dict[UUID, int] = defaultdict(int)
+        variant_quantities: dict[UUID, int] = defaultdict(int)
+        for item_id, variant_id, quantity in (await self.db.execute(stmt)).all():
+            # Lines whose item or variant has since been deleted have nothing to restock
+            if variant_id:
+                variant_quantities[variant_id] += quantity
+            elif item_id:
+                item_quantities[item_id] += quantity
+        await self._adjust_stock(MerchandiseItem, item_quantities, release=True)
+        await self._adjust_stock(MerchandiseVariant, variant_quantities, release=True)
+        await invalidate_summaries(self.db, self.club_id)
+
+    async def _adjust_stock(
+        self,
+        model: type[MerchandiseItem] | type[MerchandiseVariant],
+        quantities: dict[UUID, int],
+        *,
+        release: bool,
+    ) -> set[UUID]:
+        """Take (or with ``release``, return) stock; returns the ids that were short.
+
+        The rows are locked in id order before the UPDATE, so two orders for
+        the same things always queue behind each other instead of deadlocking.
+        A reservation only applies where ``stock_quantity`` covers it, checked
+        against the locked, current value.
+        """
+        if not quantities:
+            return set()
+        locked = (
+            select(model.id)
+            .where(model.id.in_(list(quantities)))
+            .order_by(model.id)
+            .with_for_update()
+            .cte("locked")
         )
-        revenue = (await self.db.execute(revenue_stmt)).scalar_one()
-        return {
-            "total_orders": total,
-            "pending_orders": pending,
-            "confirmed_orders": confirmed,
-            "total_revenue": revenue,
-        }
-
-    async def _get_order_items(self, order_id: UUID) -> list[dict]:
-        stmt = select(MerchandiseOrderItem).where(MerchandiseOrderItem.order_id == order_id)
-        result = await self.db.execute(stmt)
-        items = list(result.scalars().all())
-        return [
-            {
-                "id": oi.id,
-                "item_id": oi.item_id,
-                "variant_id": oi.variant_id,
-                "quantity": oi.quantity,
-                "unit_price": oi.unit_price,
-                "item_name": oi.item_name,
-                "variant_name": oi.variant_name,
-            }
-            for oi in items
-        ]
+        changes = values(
+            column("id", PG_UUID(as_uuid=True)), column("quantity", Integer), name="changes"
+        ).data(list(quantities.items()))
+        if release:
+            stock = model.stock_quantity + changes.c.quantity
+        else:
+            stock = model.stock_quantity - changes.c.quantity
+        stmt = (
+            update(model)
+            .where(model.id == changes.c.id, model.id.in_(select(locked.c.id)))
+            .values(stock_quantity=stock)
+            .returning(model.id)
+            .execution_options(synchronize_session=False)
+        )
+        if not release:
+            stmt = stmt.where(model.stock_quantity >= changes.c.quantity)
+        updated = set((await self.db.execute(stmt)).scalars())
+        return set(quantities) - updated
+
+    async def _get_order_items(self, order_ids: list[UUID]) -> dict[UUID, list[dict]]:
+        if not order_ids:
+            return {}
+        stmt = select(
+            MerchandiseOrderItem.order_id,
+            MerchandiseOrderItem.id,
+            MerchandiseOrderItem.item_id,
+            MerchandiseOrderItem.variant_id,
+            MerchandiseOrderItem.quantity,
+            MerchandiseOrderItem.unit_price,
+            MerchandiseOrderItem.item_name,
+            MerchandiseOrderItem.variant_name,
+        ).where(MerchandiseOrderItem.order_id.in_(order_ids))
+        items: dict[UUID, list[dict]] = defaultdict(list)
+        for row in (await self.db.execute(stmt)).mappings():
+            item = dict(row)
+            items[item.pop("order_id")].append(item)
+        return items
+
+
+def _order_totals(club_id: UUID) -> Select:
+    """Order counts by status and revenue, in one pass over the club's orders."""
+    status = MerchandiseOrder.status
+    return select(
+        func.count().label("total_orders"),
+        func.count().filter(status == "pending").label("pending_orders"),
+        func.count().filter(status == "confirmed").label("confirmed_orders"),
+        func.coalesce(
+            func.sum(MerchandiseOrder.total_amount).filter(status != "cancelled"), 0
+        ).label("total_revenue"),
+    ).where(MerchandiseOrder.club_id == club_id)
+
+
+invalidate_on_write(MerchandiseCategory, MerchandiseItem, MerchandiseOrder)
@@ -1,15 +1,40 @@
+from collections.abc import Mapping
+from datetime import datetime
 from uuid import UUID
 
-from sqlalchemy import delete, func, select
+from sqlalchemy import (
+    Delete,
+    Insert,
+    and_,
+    delete,
+    false,
+    func,
+    literal,
+    literal_column,
+    select,
+    true,
+    tuple_,
+    update,
+)
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.channel_hub import publish_channel_event
+from app.core.pagination import keyset_after
 from app.models.channel import Channel
+from app.models.channel_read_cursor import ChannelReadCursor
 from app.models.message import Message
 from app.models.message_reaction import MessageReaction
 from app.models.poll import Poll
 from app.models.poll_option import PollOption
 from app.models.poll_vote import PollVote
 from app.models.profile import Profile
+from app.schemas.messaging import MessageRead
+
+# Unread counts stop here; clients show "99+" beyond it
+UNREAD_COUNT_CAP = 100
+NIL_UUID = UUID(int=0)
+NEVER_READ = literal_column("'-infinity'::timestamptz")
 
 
 class MessagingService:
@@ -27,34 +52,36 @@ class MessagingService:
     # --- Messages ---
 
     async def get_messages(
-        self, channel_id: UUID, *, offset: int = 0, limit: int = 50
+        self,
+        channel_id: UUID,
+        current_user_id: UUID,
+        *,
+        limit: int = 50,
+        after: tuple[datetime, UUID] | None = None,
+        offset: int = 0,
     ) -> list[dict]:
+        """A page of a channel, newest first, starting after the ``(created_at, id)`` key.
+
+        Two queries whatever the page size: the messages, then the reactions
+        for the whole page grouped by message and emoji.
+        """
         stmt = (
-            select(Message, Profile.display_name.label("sender_name"))
+            select(Message, Profile.full_name.label("sender_name"))
             .outerjoin(Profile, Message.sender_id == Profile.id)
             .where(Message.channel_id == channel_id, Message.is_deleted.is_(False))
-            .order_by(Message.created_at.desc())
-            .offset(offset)
+            .order_by(Message.created_at.desc(), Message.id.desc())
             .limit(limit)
         )
+        if after:
+            stmt = stmt.where(keyset_after([Message.created_at, Message.id], after))
+        elif offset:
+            stmt = stmt.offset(offset)
         result = await self.db.execute(stmt)
         rows = result.all()
+        reactions = await self._get_reactions([msg.id for msg, _ in rows], current_user_id)
 
-        messages = []
-        for msg, sender_name in rows:
-            # Get reactions for this message
-            react_stmt = (
-                select(
-                    MessageReaction.emoji,
-                    func.count().label("count"),
-                )
-                .where(MessageReaction.message_id == msg.id)
-                .group_by(MessageReaction.emoji)
-            )
-            react_result = await self.db.execute(react_stmt)
-            reactions = [{"emoji": r.emoji, "count": r.count} for r in react_result.all()]
-
-            messages.append({
+        return [
+            {
                 "id": msg.id,
                 "channel_id": msg.channel_id,
                 "sender_id": msg.sender_id,
@@ -63,15 +90,52 @@ class MessagingService:
                 "is_deleted": msg.is_deleted,
                 "created_at": msg.created_at,
                 "sender_name": sender_name,
-                "reactions": reactions,
-            })
-        return messages
+                "reactions": reactions.get(msg.id, []),
+            }
+            for msg, sender_name in rows
+        ]
+
+    async def _get_reactions(
+        self, message_ids: list[UUID], current_user_id: UUID
+    ) -> dict[UUID, list[dict]]:
+        """Reaction counts per message and emoji, in the order emojis were first used."""
+        if not message_ids:
+            return {}
+        stmt = (
+            select(
+                MessageReaction.message_id,
+                MessageReaction.emoji,
+                func.count().label("count"),
+                func.bool_or(MessageReaction.user_id == current_user_id).label("reacted_by_me"),
+            )
+            .where(MessageReaction.message_id.in_(message_ids))
+            .group_by(MessageReaction.message_id, MessageReaction.emoji)
+            .order_by(MessageReaction.message_id, func.min(MessageReaction.created_at))
+        )
+        result = await self.db.execute(stmt)
+        reactions: dict[UUID, list[dict]] = {}
+        for row in result.all():
+            reactions.setdefault(row.message_id, []).append(
+                {"emoji": row.emoji, "count": row.count, "reacted_by_me": row.reacted_by_me}
+            )
+        return reactions
 
     async def send_message(self, channel_id: UUID, sender_id: UUID, content: str) -> Message:
         msg = Message(channel_id=channel_id, sender_id=sender_id, content=content)
         self.db.add(msg)
         await self.db.flush()
         await self.db.refresh(msg)
+        sender_name = await self.db.scalar(
+            select(Profile.full_name).where(Profile.id == sender_id)
+        )
+        await publish_channel_event(
+            self.db,
+            {
+                "type": "message.created",
+                "channel_id": str(channel_id),
+                "message": _message_payload(msg, sender_name),
+            },
+        )
         return msg
 
     async def toggle_pin(self, message_id: UUID, is_pinned: bool) -> Message:
@@ -82,6 +146,15 @@ class MessagingService:
             msg.is_pinned = is_pinned
             await self.db.flush()
             await self.db.refresh(msg)
+            await publish_channel_event(
+                self.db,
+                {
+                    "type": "message.pinned",
+                    "channel_id": str(msg.channel_id),
+                    "message_id": str(msg.id),
+                    "is_pinned": is_pinned,
+                },
+            )
         return msg
 
     async def delete_message(self, message_id: UUID) -> bool:
@@ -92,6 +165,14 @@ class MessagingService:
             return False
         msg.is_deleted = True
         await self.db.flush()
+        await publish_channel_event(
+            self.db,
+            {
+                "type": "message.deleted",
+                "channel_id": str(msg.channel_id),
+                "message_id": str(msg.id),
+            },
+        )
         return True
 
     async def add_reaction(self, message_id: UUID, user_id: UUID, emoji: str) -> dict:
@@ -105,29 +186,54 @@ class MessagingService:
         existing = result.scalar_one_or_none()
         if existing:
             await self.db.delete(existing)
-            await self.db.flush()
-            return {"action": "removed"}
-        reaction = MessageReaction(message_id=message_id, user_id=user_id, emoji=emoji)
-        self.db.add(reaction)
+            action = "removed"
+        else:
+            self.db.add(MessageReaction(message_id=message_id, user_id=user_id, emoji=emoji))
+            action = "added"
         await self.db.flush()
-        return {"action": "added"}
+
+        channel_id = await self.get_message_channel_id(self.db, message_id)
+        await publish_channel_event(
+            self.db,
+            {
+                "type": f"reaction.{action}",
+                "channel_id": str(channel_id),
+                "message_id": str(message_id),
+                "emoji": emoji,
+                "user_id": str(user_id),
+            },
+        )
+        return {"action": action}
 
     # --- Polls ---
 
-    async def get_polls(self, current_user_id: UUID) -> list[dict]:
+    async def get_polls(
+        self,
+        current_user_id: UUID,
+        *,
+        limit: int = 50,
+        after: tuple[datetime, UUID] | None = None,
+    ) -> list[dict]:
+        """A page of the club's polls, newest first, starting after the ``(created_at, id)`` key.
+
+        Three queries whatever the page size: the polls, then the options and
+        the caller's votes for the whole page.
+        """
         stmt = (
-            select(Poll, Profile.display_name.label("creator_name"))
+            select(Poll, Profile.full_name.label("creator_name"))
             .outerjoin(Profile, Poll.created_by == Profile.id)
             .where(Poll.club_id == self.club_id)
-            .order_by(Poll.created_at.desc())
+            .order_by(Poll.created_at.desc(), Poll.id.desc())
+            .limit(limit)
         )
+        if after:
+            stmt = stmt.where(keyset_after([Poll.created_at, Poll.id], after))
         result = await self.db.execute(stmt)
         rows = result.all()
+        options = await self._get_poll_options([poll.id for poll, _ in rows], current_user_id)
 
-        polls = []
-        for poll, creator_name in rows:
-            options = await self._get_poll_options(poll.id, current_user_id)
-            polls.append({
+        return [
+            {
                 "id": poll.id,
                 "channel_id": poll.channel_id,
                 "club_id": poll.club_id,
@@ -136,10 +242,11 @@ class MessagingService:
                 "is_closed": poll.is_closed,
                 "allow_multiple": poll.allow_multiple,
                 "created_at": poll.created_at,
-                "options": options,
+                "options": options.get(poll.id, []),
                 "creator_name": creator_name,
-            })
-        return polls
+            }
+            for poll, creator_name in rows
+        ]
 
     async def create_poll(
         self, channel_id: UUID, created_by: UUID, question: str,
@@ -155,13 +262,14 @@ class MessagingService:
         self.db.add(poll)
         await self.db.flush()
 
-        for i, opt in enumerate(options):
-            option = PollOption(poll_id=poll.id, text=opt["text"], display_order=i)
-            self.db.add(option)
+        poll_options = [
+            PollOption(poll_id=poll.id, text=opt["text"], display_order=i)
+            for i, opt in enumerate(options)
+        ]
+        self.db.add_all(poll_options)
         await self.db.flush()
         await self.db.refresh(poll)
 
-        poll_options = await self._get_poll_options(poll.id, created_by)
         return {
             "id": poll.id,
             "channel_id": poll.channel_id,
@@ -171,61 +279,85 @@ class MessagingService:
             "is_closed": poll.is_closed,
             "allow_multiple": poll.allow_multiple,
             "created_at": poll.created_at,
-            "options": poll_options,
+            "options": [
+                {
+                    "id": opt.id,
+                    "text": opt.text,
+                    "display_order": opt.display_order,
+                    "vote_count": 0,
+                    "voted_by_me": False,
+                }
+                for opt in poll_options
+            ],
         }
 
     async def vote_on_poll(self, option_id: UUID, user_id: UUID) -> dict:
-        # Get the poll for this option
+        """Toggle the user's vote on an option.
+
+        Each change to ``poll_votes`` and the matching ``vote_count`` update
+        run as one statement, so concurrent votes cannot drift the counts.
+        """
         stmt = (
-            select(PollOption, Poll)
-            .join(Poll, PollOption.poll_id == Poll.id)
+            select(Poll.id, Poll.is_closed, Poll.allow_multiple)
+            .join(PollOption, PollOption.poll_id == Poll.id)
             .where(PollOption.id == option_id)
         )
         result = await self.db.execute(stmt)
-        row = result.one_or_none()
-        if not row:
+        poll = result.one_or_none()
+        if not poll:
             return {"success": False, "error": "Option not found"}
-        option, poll = row
 
         if poll.is_closed:
             return {"success": False, "error": "Poll is closed"}
 
-        # Check if already voted on this option
-        existing = await self.db.execute(
-            select(PollVote).where(
+        # Already voted on this option: remove the vote (toggle)
+        removed = await self._count_votes(
+            delete(PollVote).where(
                 PollVote.poll_option_id == option_id,
                 PollVote.user_id == user_id,
-            )
+            ),
+            -1,
         )
-        if existing.scalar_one_or_none():
-            # Remove vote (toggle)
-            await self.db.execute(
-                delete(PollVote).where(
-                    PollVote.poll_option_id == option_id,
-                    PollVote.user_id == user_id,
-                )
-            )
-            await self.db.flush()
+        if removed:
             return {"success": True, "action": "removed"}
 
         # If not allow_multiple, remove existing votes on other options
         if not poll.allow_multiple:
-            all_options = await self.db.execute(
-                select(PollOption.id).where(PollOption.poll_id == poll.id)
-            )
-            option_ids = [r[0] for r in all_options.all()]
-            await self.db.execute(
+            await self._count_votes(
                 delete(PollVote).where(
-                    PollVote.poll_option_id.in_(option_ids),
+                    PollVote.poll_option_id == PollOption.id,
+                    PollOption.poll_id == poll.id,
                     PollVote.user_id == user_id,
-                )
+                ),
+                -1,
             )
 
-        vote = PollVote(poll_option_id=option_id, user_id=user_id)
-        self.db.add(vote)
-        await self.db.flush()
+        await self._count_votes(
+            pg_insert(PollVote)
+            .values(poll_option_id=option_id, user_id=user_id)
+            .on_conflict_do_nothing(constraint="uq_poll_vote_option_user"),
+            1,
+        )
         return {"success": True, "action": "added"}
 
+    async def _count_votes(self, change: Delete | Insert, delta: int) -> int:
+        """Run ``change`` on poll_votes and move each touched option's count by ``delta``.
+
+        ``change`` is an INSERT or DELETE; the options it actually touched come
+        back through RETURNING in a CTE, so a vote that lost a race (already
+        inserted, already deleted) leaves the counts alone. Returns how many
+        options were updated.
+        """
+        changed = change.returning(PollVote.poll_option_id).cte("changed_votes")
+        stmt = (
+            update(PollOption)
+            .where(PollOption.id == changed.c.poll_option_id)
+            .values(vote_count=PollOption.vote_count + delta)
+            .execution_options(synchronize_session=False)
+        )
+        result = await self.db.execute(stmt)
+        return result.rowcount
+
     async def close_poll(self, poll_id: UUID) -> Poll:
         stmt = select(Poll).where(Poll.id == poll_id)
         result = await self.db.execute(stmt)
@@ -236,36 +368,137 @@ class MessagingService:
             await self.db.refresh(poll)
         return poll
 
-    async def _get_poll_options(self, poll_id: UUID, current_user_id: UUID) -> list[dict]:
-        stmt = (
-            select(PollOption)
-            .where(PollOption.poll_id == poll_id)
-            .order_by(PollOption.display_order)
+    async def _get_poll_options(
+        self, poll_ids: list[UUID], current_user_id: UUID
+    ) -> dict[UUID, list[dict]]:
+        """Options per poll in display order, with counts and the caller's votes."""
+        if not poll_ids:
+            return {}
+        # Columns rather than entities: vote_count changes outside the ORM
+        options_stmt = (
+            select(
+                PollOption.id,
+                PollOption.poll_id,
+                PollOption.text,
+                PollOption.display_order,
+                PollOption.vote_count,
+            )
+            .where(PollOption.poll_id.in_(poll_ids))
+            .order_by(PollOption.poll_id, PollOption.display_order)
         )
-        result = await self.db.execute(stmt)
-        options = list(result.scalars().all())
+        votes_stmt = (
+            select(PollVote.poll_option_id)
+            .join(PollOption, PollVote.poll_option_id == PollOption.id)
+            .where(PollOption.poll_id.in_(poll_ids), PollVote.user_id == current_user_id)
+        )
+        options = (await self.db.execute(options_stmt)).all()
+        my_votes = set((await self.db.execute(votes_stmt)).scalars().all())
 
-        option_data = []
+        by_poll: dict[UUID, list[dict]] = {}
         for opt in options:
-            count_stmt = select(func.count()).where(PollVote.poll_option_id == opt.id)
-            count_result = await self.db.execute(count_stmt)
-            vote_count = count_result.scalar_one()
-
-            voted_stmt = select(PollVote).where(
-                PollVote.poll_option_id == opt.id,
-                PollVote.user_id == current_user_id,
-            )
-            voted_result = await self.db.execute(voted_stmt)
-            voted_by_me = voted_result.scalar_one_or_none() is not None
-
-            option_data.append({
+            by_poll.setdefault(opt.poll_id, []).append({
                 "id": opt.id,
                 "text": opt.text,
                 "display_order": opt.display_order,
-                "vote_count": vote_count,
-                "voted_by_me": voted_by_me,
+                "vote_count": opt.vote_count,
+                "voted_by_me": opt.id in my_votes,
             })
-        return option_data
+        return by_poll
+
+    # --- Read cursors ---
+
+    async def get_unread_counts(self, user_id: UUID) -> list[dict]:
+        """Unread messages in each of the club's channels for ``user_id``, in one query.
+
+        Each count is a range scan of ``idx_messages_channel_created`` after
+        the member's read cursor, stopped at ``UNREAD_COUNT_CAP``. The user's
+        own messages and deleted ones are not unread.
+        """
+        # No cursor yet: everything in the channel is unread
+        cursor_key = tuple_(
+            func.coalesce(ChannelReadCursor.last_read_created_at, NEVER_READ),
+            func.coalesce(ChannelReadCursor.last_read_message_id, literal(NIL_UUID)),
+        )
+        unread = (
+            select(Message.id)
+            .where(
+                Message.channel_id == Channel.id,
+                tuple_(Message.created_at, Message.id) > cursor_key,
+                Message.is_deleted == false(),
+                Message.sender_id.is_distinct_from(user_id),
+            )
+            .limit(UNREAD_COUNT_CAP)
+            .lateral("unread")
+        )
+        stmt = (
+            select(
+                Channel.id.label("channel_id"),
+                ChannelReadCursor.last_read_message_id,
+                func.count(unread.c.id).label("unread_count"),
+            )
+            .outerjoin(
+                ChannelReadCursor,
+                and_(
+                    ChannelReadCursor.channel_id == Channel.id,
+                    ChannelReadCursor.user_id == user_id,
+                ),
+            )
+            .outerjoin(unread, true())
+            .where(Channel.club_id == self.club_id)
+            .group_by(Channel.id, ChannelReadCursor.last_read_message_id)
+            .order_by(Channel.created_at, Channel.id)
+        )
+        result = await self.db.execute(stmt)
+        return [dict(row) for row in result.mappings().all()]
+
+    @staticmethod
+    async def get_message_position(
+        db: AsyncSession, channel_id: UUID, message_id: UUID
+    ) -> tuple[UUID, datetime] | None:
+        """The club and ``created_at`` of a message in ``channel_id``, if it is there."""
+        stmt = (
+            select(Channel.club_id, Message.created_at)
+            .join(Message, Message.channel_id == Channel.id)
+            .where(Channel.id == channel_id, Message.id == message_id)
+        )
+        row = (await db.execute(stmt)).one_or_none()
+        return tuple(row) if row else None
+
+    @staticmethod
+    async def save_read_cursors(
+        db: AsyncSession, cursors: Mapping[tuple[UUID, UUID], tuple[datetime, UUID]]
+    ) -> None:
+        """Upsert ``{(user_id, channel_id): (created_at, message_id)}`` in one statement.
+
+        A cursor only moves forward, so a late or out-of-order write never
+        marks messages unread again.
+        """
+        if not cursors:
+            return
+        # Sorted so concurrent flushes lock cursor rows in the same order
+        rows = [
+            {
+                "user_id": user_id,
+                "channel_id": channel_id,
+                "last_read_created_at": created_at,
+                "last_read_message_id": message_id,
+            }
+            for (user_id, channel_id), (created_at, message_id) in sorted(cursors.items())
+        ]
+        stmt = pg_insert(ChannelReadCursor).values(rows)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[ChannelReadCursor.user_id, ChannelReadCursor.channel_id],
+            set_={
+                "last_read_created_at": stmt.excluded.last_read_created_at,
+                "last_read_message_id": stmt.excluded.last_read_message_id,
+                "updated_at": func.now(),
+            },
+            where=tuple_(
+                ChannelReadCursor.last_read_created_at, ChannelReadCursor.last_read_message_id
+            )
+            < tuple_(stmt.excluded.last_read_created_at, stmt.excluded.last_read_message_id),
+        )
+        await db.execute(stmt)
 
     # --- Helper to get channel's club_id ---
 
@@ -275,8 +508,26 @@ class MessagingService:
         result = await db.execute(stmt)
         return result.scalar_one_or_none()
 
+    @staticmethod
+    async def get_message_for_event(db: AsyncSession, message_id: UUID) -> dict | None:
+        """A message as carried by ``message.created`` channel events."""
+        stmt = (
+            select(Message, Profile.full_name)
+            .outerjoin(Profile, Message.sender_id == Profile.id)
+            .where(Message.id == message_id)
+        )
+        row = (await db.execute(stmt)).one_or_none()
+        return _message_payload(*row) if row else None
+
     @staticmethod
     async def get_message_channel_id(db: AsyncSession, message_id: UUID) -> UUID | None:
         stmt = select(Message.channel_id).where(Message.id == message_id)
         result = await db.execute(stmt)
         return result.scalar_one_or_none()
+
+
+def _message_payload(msg: Message, sender_name: str | None) -> dict:
+    message = MessageRead.model_validate(msg)
+    message.sender_name = sender_name
+    message.reactions = []
+    return message.model_dump(mode="json")
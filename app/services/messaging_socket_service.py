@@ -0,0 +1,123 @@
+import asyncio
+import json
+import logging
+from uuid import UUID
+
+from fastapi import WebSocket
+
+from app.core.channel_hub import ChannelConnection, ChannelHub
+from app.core.exceptions import ForbiddenError
+from app.core.permissions import require_member
+from app.schemas.auth import CurrentUser
+from app.services.messaging_service import MessagingService
+
+logger = logging.getLogger(__name__)
+
+# Close codes (RFC 6455 / IANA registry)
+CLOSE_TRY_AGAIN_LATER = 1013
+
+
+class MessagingSocketService:
+    """One client's messaging WebSocket.
+
+    Client frames (JSON)::
+
+        {"type": "subscribe", "channel_id": ...}
+        {"type": "unsubscribe", "channel_id": ...}
+        {"type": "send", "channel_id": ..., "content": ..., "client_id": ...}
+        {"type": "ping"}
+
+    The server replies with ``subscribed``/``unsubscribed``, ``ack`` (carrying
+    the client's ``client_id`` and the stored message id), ``pong`` or
+    ``error``, and pushes channel events (``message.created``,
+    ``message.pinned``, ``message.deleted``, ``reaction.added``,
+    ``reaction.removed``) for subscribed channels. Replies and events share
+    the connection's send queue, so they arrive in order.
+    """
+
+    def __init__(
+        self,
+        websocket: WebSocket,
+        user: CurrentUser,
+        connection: ChannelConnection,
+        hub: ChannelHub,
+        session_factory=None,
+    ):
+        if session_factory is None:
+            from app.core.database import async_session_factory
+
+            session_factory = async_session_factory
+        self.websocket = websocket
+        self.user = user
+        self.connection = connection
+        self.hub = hub
+        self.session_factory = session_factory
+        self._channel_clubs: dict[UUID, UUID | None] = {}
+
+    async def run(self) -> None:
+        """Serve the socket until the client leaves or falls too far behind."""
+        writer = asyncio.create_task(self.connection.drain())
+        reader = asyncio.create_task(self._read())
+        overflow = asyncio.create_task(self.connection.overflowed.wait())
+        tasks = {writer, reader, overflow}
+        try:
+            done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+            if overflow in done:
+                logger.info("Dropping slow messaging socket for user %s", self.user.user_id)
+                await self.websocket.close(code=CLOSE_TRY_AGAIN_LATER, reason="Too far behind")
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            self.hub.disconnect(self.connection)
+
+    async def _read(self) -> None:
+        async for text in self.websocket.iter_text():
+            try:
+                frame = json.loads(text)
+                reply = await self.handle(frame)
+            except (ValueError, KeyError, TypeError, AttributeError):
+                reply = {"type": "error", "detail": "Malformed frame"}
+            except ForbiddenError as exc:
+                reply = {"type": "error", "detail": exc.detail}
+            if reply is not None:
+                self.connection.offer(reply)
+
+    async def handle(self, frame: dict) -> dict | None:
+        kind = frame.get("type")
+        if kind == "ping":
+            return {"type": "pong"}
+        if kind not in ("subscribe", "unsubscribe", "send"):
+            return {"type": "error", "detail": f"Unknown frame type {kind!r}"}
+
+        channel_id = UUID(frame["channel_id"])
+        if kind == "unsubscribe":
+            self.hub.leave(self.connection, channel_id)
+            return {"type": "unsubscribed", "channel_id": str(channel_id)}
+
+        club_id = await self._authorize(channel_id)
+        if kind == "subscribe":
+            self.hub.join(self.connection, channel_id)
+            return {"type": "subscribed", "channel_id": str(channel_id)}
+
+        content = frame["content"]
+        if not isinstance(content, str) or not content.strip():
+            return {"type": "error", "detail": "Message content is required"}
+        async with self.session_factory() as db:
+            service = MessagingService(db, club_id)
+            msg = await service.send_message(channel_id, self.user.user_id, content)
+            await db.commit()
+        return {"type": "ack", "client_id": frame.get("client_id"), "message_id": str(msg.id)}
+
+    async def _authorize(self, channel_id: UUID) -> UUID:
+        """The channel's club, if the user is a member of it."""
+        if channel_id not in self._channel_clubs:
+            async with self.session_factory() as db:
+                self._channel_clubs[channel_id] = await MessagingService.get_channel_club_id(
+                    db, channel_id
+                )
+        club_id = self._channel_clubs[channel_id]
+        if club_id is None:
+            raise ForbiddenError("Channel not found")
+        require_member(self.user, club_id)
+        return club_id
@@ -1,47 +1,118 @@
+from collections import Counter
+from collections.abc import Mapping
 from datetime import datetime, timedelta, timezone
 from uuid import UUID
 
-from sqlalchemy import func, select, update
+from sqlalchemy import (
+    JSON,
+    Select,
+    String,
+    cast,
+    column,
+    delete,
+    exists,
+    false,
+    func,
+    insert,
+    literal,
+    select,
+    update,
+    values,
+)
+from sqlalchemy.dialects.postgresql import UUID as PG_UUID
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.notification_broker import notify_users
+from app.core.pagination import keyset_after
+from app.core.permissions import ADMIN_ROLES
+from app.core.task_queue import enqueue
+from app.models.club_member import ClubMember
 from app.models.match import Match
 from app.models.match_availability import MatchAvailability
 from app.models.notification import Notification
+from app.models.notification_archive import NotificationArchive
+from app.models.notification_counter import NotificationCounter
 from app.models.payment import Payment
 from app.models.player import Player
+from app.models.task import Task
+from app.services.lifecycle_service import LifecycleService
+from app.services.push_delivery_service import PUSH_TASK_KIND
+
+# Admins are alerted once a selection deadline is this close and the squad is short
+SELECTION_DEADLINE_ALERT_HOURS = 24
+
+# Column order of the INSERT ... SELECT sources below
+INSERT_COLUMNS = [
+    "id",
+    "club_id",
+    "user_id",
+    "type",
+    "title",
+    "body",
+    "data",
+    "is_read",
+    "dedupe_key",
+]
+ARCHIVE_COLUMNS = [*INSERT_COLUMNS, "created_at"]
 
 
 class NotificationService:
     def __init__(self, db: AsyncSession):
         self.db = db
 
-    async def get_for_user(self, user_id: UUID, *, limit: int = 50) -> list[Notification]:
+    async def get_for_user(
+        self,
+        user_id: UUID,
+        *,
+        limit: int = 50,
+        after: tuple[datetime, UUID] | None = None,
+        unread_only: bool = False,
+    ) -> list[Notification]:
+        """A page of the inbox, newest first, starting after the ``(created_at, id)`` key."""
         stmt = (
             select(Notification)
             .where(Notification.user_id == user_id)
-            .order_by(Notification.created_at.desc())
+            .order_by(Notification.created_at.desc(), Notification.id.desc())
             .limit(limit)
         )
+        if after:
+            stmt = stmt.where(keyset_after([Notification.created_at, Notification.id], after))
+        if unread_only:
+            # Spelled like the partial index predicate so the planner can use it
+            stmt = stmt.where(Notification.is_read == false())
         result = await self.db.execute(stmt)
         return list(result.scalars().all())
 
     async def get_unread_count(self, user_id: UUID) -> int:
-        stmt = select(func.count()).select_from(Notification).where(
-            Notification.user_id == user_id,
-            Notification.is_read.is_(False),
+        stmt = select(NotificationCounter.unread_count).where(
+            NotificationCounter.user_id == user_id
         )
-        result = await self.db.execute(stmt)
-        return result.scalar_one()
+        return await self.db.scalar(stmt) or 0
 
     async def mark_read(self, notification_id: UUID) -> bool:
+        # Lock the row and return its previous state, so the counter only moves
+        # when this call is the one that flipped it
+        before = (
+            select(Notification.id, Notification.user_id, Notification.is_read)
+            .where(Notification.id == notification_id)
+            .with_for_update()
+            .subquery()
+        )
         stmt = (
             update(Notification)
-            .where(Notification.id == notification_id)
+            .where(Notification.id == before.c.id)
             .values(is_read=True)
+            .returning(before.c.user_id, before.c.is_read)
         )
-        result = await self.db.execute(stmt)
+        row = (await self.db.execute(stmt)).one_or_none()
+        if row is None:
+            return False
+        if row.is_read is False:
+            await self._decrement_unread(row.user_id, 1)
+            await notify_users(self.db, [row.user_id])
         await self.db.flush()
-        return result.rowcount > 0
+        return True
 
     async def mark_all_read(self, user_id: UUID) -> bool:
         stmt = (
@@ -49,7 +120,12 @@ class NotificationService:
             .where(Notification.user_id == user_id, Notification.is_read.is_(False))
             .values(is_read=True)
         )
-        await self.db.execute(stmt)
+        result = await self.db.execute(stmt)
+        # Subtract what was flipped rather than zeroing, so notifications created
+        # concurrently stay counted
+        if result.rowcount:
+            await self._decrement_unread(user_id, result.rowcount)
+            await notify_users(self.db, [user_id])
         await self.db.flush()
         return True
 
@@ -61,6 +137,7 @@ class NotificationService:
         title: str,
         body: str | None = None,
         data: dict | None = None,
+        dedupe_key: str | None = None,
     ) -> Notification:
         notif = Notification(
             club_id=club_id,
@@ -69,100 +146,301 @@ class NotificationService:
             title=title,
             body=body,
             data=data or {},
+            dedupe_key=dedupe_key,
         )
         self.db.add(notif)
         await self.db.flush()
         await self.db.refresh(notif)
+        await self._increment_unread({user_id: 1})
+        await notify_users(self.db, [user_id])
+        await self._enqueue_push(club_id, [notif.id])
         return notif
 
+    async def broadcast(
+        self,
+        club_id: UUID,
+        title: str,
+        body: str | None = None,
+        data: dict | None = None,
+        created_by: UUID | None = None,
+    ) -> tuple[int, Task | None]:
+        """Notify every member of a club in one INSERT ... SELECT.
+
+        Push delivery is queued as a single high-priority task; returns the
+        number of notifications created and that task.
+        """
+        source = select(
+            func.gen_random_uuid(),
+            ClubMember.club_id,
+            ClubMember.user_id,
+            literal("broadcast"),
+            literal(title),
+            literal(body, String),
+            literal(data or {}, JSON),
+            false(),
+            literal(None, String),
+        ).where(ClubMember.club_id == club_id)
+        stmt = (
+            pg_insert(Notification)
+            .from_select(INSERT_COLUMNS, source)
+            .returning(Notification.id, Notification.user_id)
+        )
+        rows = (await self.db.execute(stmt)).all()
+        ids = [notification_id for notification_id, _ in rows]
+        await self._increment_unread(Counter(user_id for _, user_id in rows))
+        await notify_users(self.db, (user_id for _, user_id in rows))
+        task = await self._enqueue_push(club_id, ids, priority=10, created_by=created_by)
+        return len(ids), task
+
     async def generate_match_reminders(self) -> int:
-        """Generate reminders for upcoming matches within 48 hours."""
+        """Generate reminders for upcoming matches within 48 hours.
+
+        One INSERT ... SELECT across all clubs: every linked player who has not
+        set availability for the match and has not already been reminded.
+        """
         now = datetime.now(timezone.utc)
         cutoff = now + timedelta(hours=48)
+        dedupe_key = literal("match_reminder:") + cast(Match.id, String)
 
-        # Find upcoming matches within 48h that don't already have reminders
-        stmt = (
-            select(Match)
+        source = (
+            select(
+                func.gen_random_uuid(),
+                Match.club_id,
+                Player.user_id,
+                literal("match_reminder"),
+                literal("Availability needed: ") + Match.opponent,
+                literal("Please set your availability for the match on ")
+                + cast(Match.date, String),
+                func.json_build_object("match_id", cast(Match.id, String)),
+                false(),
+                dedupe_key,
+            )
+            .join(Player, (Player.club_id == Match.club_id) & Player.user_id.is_not(None))
             .where(
                 Match.status == "upcoming",
                 Match.date <= cutoff.date(),
                 Match.date >= now.date(),
+                ~exists().where(
+                    MatchAvailability.match_id == Match.id,
+                    MatchAvailability.player_id == Player.id,
+                ),
+                ~exists().where(
+                    Notification.user_id == Player.user_id,
+                    Notification.dedupe_key == dedupe_key,
+                ),
             )
         )
-        result = await self.db.execute(stmt)
-        matches = list(result.scalars().all())
+        return await self._insert_reminders(source)
 
-        count = 0
-        for match in matches:
-            # Find players without availability set
-            avail_stmt = select(MatchAvailability.player_id).where(
-                MatchAvailability.match_id == match.id
+    async def generate_payment_reminders(self) -> int:
+        """Generate reminders for overdue payments, once per payment."""
+        dedupe_key = literal("payment_reminder:") + cast(Payment.id, String)
+
+        source = (
+            select(
+                func.gen_random_uuid(),
+                Payment.club_id,
+                Player.user_id,
+                literal("payment_reminder"),
+                literal("Payment overdue"),
+                literal("You have an overdue payment of £") + cast(Payment.amount, String),
+                func.json_build_object("payment_id", cast(Payment.id, String)),
+                false(),
+                dedupe_key,
+            )
+            .join(Player, (Player.id == Payment.player_id) & Player.user_id.is_not(None))
+            .where(
+                Payment.status == "overdue",
+                ~exists().where(
+                    Notification.user_id == Player.user_id,
+                    Notification.dedupe_key == dedupe_key,
+                ),
+                # A payment can stay overdue past the retention window
+                ~exists().where(
+                    NotificationArchive.user_id == Player.user_id,
+                    NotificationArchive.dedupe_key == dedupe_key,
+                ),
+            )
+        )
+        return await self._insert_reminders(source)
+
+    async def generate_selection_deadline_alerts(self) -> int:
+        """Alert club admins to selection deadlines within a day for short squads.
+
+        Alerts for every club come from one query and are written in one
+        INSERT ... SELECT; each admin is alerted once per match.
+        """
+        alerts = await LifecycleService.get_deadline_alerts_for_all_clubs(self.db)
+        due = [
+            (
+                club_id,
+                str(alert["match_id"]),
+                f"Selection due: {alert['opponent_name']}",
+                f"{alert['selected_count']} of {alert['target_players']} players selected "
+                f"for {alert['match_date']}; the deadline is in "
+                f"{alert['hours_until_deadline']:g} hours",
             )
-            avail_result = await self.db.execute(avail_stmt)
-            responded_player_ids = {row[0] for row in avail_result.all()}
-
-            # Find all players in this club
-            player_stmt = select(Player).where(Player.club_id == match.club_id)
-            player_result = await self.db.execute(player_stmt)
-            players = list(player_result.scalars().all())
-
-            for player in players:
-                if player.id not in responded_player_ids and player.user_id:
-                    # Check if we already sent a reminder
-                    existing = await self.db.execute(
-                        select(func.count())
-                        .select_from(Notification)
-                        .where(
-                            Notification.user_id == player.user_id,
-                            Notification.type == "match_reminder",
-                            Notification.data["match_id"].as_string() == str(match.id),
-                        )
-                    )
-                    if existing.scalar_one() == 0:
-                        await self.create_notification(
-                            club_id=match.club_id,
-                            user_id=player.user_id,
-                            type="match_reminder",
-                            title=f"Availability needed: {match.opponent}",
-                            body=f"Please set your availability for the match on {match.date}",
-                            data={"match_id": str(match.id)},
-                        )
-                        count += 1
-        return count
+            for club_id, club_alerts in alerts.items()
+            for alert in club_alerts
+            if 0 < alert["hours_until_deadline"] <= SELECTION_DEADLINE_ALERT_HOURS
+            and alert["selected_count"] < alert["target_players"]
+        ]
+        if not due:
+            return 0
+        alerts_due = values(
+            column("club_id", PG_UUID(as_uuid=True)),
+            column("match_id", String),
+            column("title", String),
+            column("body", String),
+            name="alerts_due",
+        ).data(due)
+        dedupe_key = literal("selection_deadline:") + alerts_due.c.match_id
 
-    async def generate_payment_reminders(self) -> int:
-        """Generate reminders for overdue payments."""
-        stmt = select(Payment).where(Payment.status == "overdue")
+        source = (
+            select(
+                func.gen_random_uuid(),
+                ClubMember.club_id,
+                ClubMember.user_id,
+                literal("selection_deadline"),
+                alerts_due.c.title,
+                alerts_due.c.body,
+                func.json_build_object("match_id", alerts_due.c.match_id),
+                false(),
+                dedupe_key,
+            )
+            .join(alerts_due, ClubMember.club_id == alerts_due.c.club_id)
+            .where(
+                ClubMember.role.in_(sorted(ADMIN_ROLES)),
+                ~exists().where(
+                    Notification.user_id == ClubMember.user_id,
+                    Notification.dedupe_key == dedupe_key,
+                ),
+            )
+        )
+        return await self._insert_reminders(source)
+
+    async def _insert_reminders(self, source: Select) -> int:
+        # The anti-join in ``source`` skips reminders already sent; the unique
+        # index catches any inserted concurrently by another run.
+        stmt = (
+            pg_insert(Notification)
+            .from_select(INSERT_COLUMNS, source)
+            .on_conflict_do_nothing(
+                index_elements=[Notification.user_id, Notification.dedupe_key],
+                index_where=Notification.dedupe_key.is_not(None),
+            )
+            .returning(Notification.id, Notification.club_id, Notification.user_id)
+        )
         result = await self.db.execute(stmt)
-        payments = list(result.scalars().all())
-
-        count = 0
-        for payment in payments:
-            # Get the player to find user_id
-            player_stmt = select(Player).where(Player.id == payment.player_id)
-            player_result = await self.db.execute(player_stmt)
-            player = player_result.scalar_one_or_none()
-            if not player or not player.user_id:
-                continue
-
-            # Check if we already sent a reminder for this payment
-            existing = await self.db.execute(
-                select(func.count())
-                .select_from(Notification)
-                .where(
-                    Notification.user_id == player.user_id,
-                    Notification.type == "payment_reminder",
-                    Notification.data["payment_id"].as_string() == str(payment.id),
-                )
+        rows = result.all()
+        await self._increment_unread(Counter(user_id for _, _, user_id in rows))
+        await notify_users(self.db, (user_id for _, _, user_id in rows))
+
+        ids_by_club: dict[UUID, list[UUID]] = {}
+        for notification_id, club_id, _ in rows:
+            ids_by_club.setdefault(club_id, []).append(notification_id)
+        for club_id, ids in ids_by_club.items():
+            await self._enqueue_push(club_id, ids)
+        await self.db.flush()
+        return len(rows)
+
+    async def reconcile_unread_counts(self) -> int:
+        """Reset every counter that has drifted from its inbox; returns counters fixed.
+
+        Counts are taken from a snapshot, so a notification created while this
+        runs can be missed until the next run.
+        """
+        actual = (
+            select(Notification.user_id, func.count())
+            .where(Notification.is_read.is_(False))
+            .group_by(Notification.user_id)
+        )
+        upsert = pg_insert(NotificationCounter).from_select(["user_id", "unread_count"], actual)
+        upsert = upsert.on_conflict_do_update(
+            index_elements=[NotificationCounter.user_id],
+            set_={"unread_count": upsert.excluded.unread_count, "updated_at": func.now()},
+            where=NotificationCounter.unread_count != upsert.excluded.unread_count,
+        )
+        corrected = (await self.db.execute(upsert)).rowcount
+
+        # Users with no unread notifications left at all
+        cleared = await self.db.execute(
+            update(NotificationCounter)
+            .where(
+                NotificationCounter.unread_count != 0,
+                ~exists().where(
+                    Notification.user_id == NotificationCounter.user_id,
+                    Notification.is_read.is_(False),
+                ),
             )
-            if existing.scalar_one() == 0:
-                await self.create_notification(
-                    club_id=payment.club_id,
-                    user_id=player.user_id,
-                    type="payment_reminder",
-                    title="Payment overdue",
-                    body=f"You have an overdue payment of £{payment.amount}",
-                    data={"payment_id": str(payment.id)},
-                )
-                count += 1
-        return count
+            .values(unread_count=0)
+        )
+        await self.db.flush()
+        return corrected + cleared.rowcount
+
+    async def archive_read_batch(self, older_than: datetime, batch_size: int) -> int:
+        """Move up to ``batch_size`` read notifications created before ``older_than``
+        into ``notifications_archive``; returns how many moved.
+
+        One DELETE ... RETURNING feeding an INSERT, so each batch is a short
+        transaction. Rows locked by other writers are skipped for a later batch.
+        """
+        batch = (
+            select(Notification.id)
+            .where(Notification.is_read.is_(True), Notification.created_at < older_than)
+            .order_by(Notification.created_at)
+            .limit(batch_size)
+            .with_for_update(skip_locked=True)
+        )
+        moved = (
+            delete(Notification)
+            .where(Notification.id.in_(batch.scalar_subquery()))
+            .returning(*(Notification.__table__.c[name] for name in ARCHIVE_COLUMNS))
+            .cte("moved")
+        )
+        stmt = insert(NotificationArchive).from_select(ARCHIVE_COLUMNS, select(moved))
+        result = await self.db.execute(stmt)
+        return result.rowcount
+
+    async def _increment_unread(self, counts: Mapping[UUID, int]) -> None:
+        """Add per-user unread counts in one upsert."""
+        if not counts:
+            return
+        # Sorted so concurrent bulk inserts lock counter rows in the same order
+        rows = [{"user_id": u, "unread_count": n} for u, n in sorted(counts.items())]
+        stmt = pg_insert(NotificationCounter).values(rows)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[NotificationCounter.user_id],
+            set_={
+                "unread_count": NotificationCounter.unread_count + stmt.excluded.unread_count,
+                "updated_at": func.now(),
+            },
+        )
+        await self.db.execute(stmt)
+
+    async def _decrement_unread(self, user_id: UUID, n: int) -> None:
+        await self.db.execute(
+            update(NotificationCounter)
+            .where(NotificationCounter.user_id == user_id)
+            .values(unread_count=func.greatest(NotificationCounter.unread_count - n, 0))
+        )
+
+    async def _enqueue_push(
+        self,
+        club_id: UUID,
+        notification_ids: list[UUID],
+        *,
+        priority: int = 0,
+        created_by: UUID | None = None,
+    ) -> Task | None:
+        # Commits with the notifications, so a worker never sees ids that were rolled back
+        if not notification_ids:
+            return None
+        return await enqueue(
+            self.db,
+            PUSH_TASK_KIND,
+            {"notification_ids": [str(i) for i in notification_ids]},
+            club_id=club_id,
+            priority=priority,
+            created_by=created_by,
+        )
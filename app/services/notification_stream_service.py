@@ -0,0 +1,157 @@
+import asyncio
+import json
+from collections.abc import AsyncIterator, Callable
+from contextlib import AbstractAsyncContextManager
+from datetime import datetime, timedelta
+from uuid import UUID
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import get_settings
+from app.core.notification_broker import NotificationBroker, Subscription
+from app.core.pagination import encode_cursor, keyset_after
+from app.core.pubsub import ConnectionLimitError
+from app.models.notification import Notification
+from app.schemas.notification import NotificationRead
+from app.services.notification_service import NotificationService
+
+SessionFactory = Callable[[], AbstractAsyncContextManager[AsyncSession]]
+
+# Clients reconnect after this many milliseconds if the stream drops
+RETRY_MS = 3000
+# Clients retry this much later if the server filled up while they connected
+FULL_RETRY_MS = 10000
+# Most notifications sent per wake-up; the rest follow on the next pass
+BATCH_SIZE = 100
+# How far behind the newest streamed notification each pass looks again, for
+# rows whose transaction started earlier but committed later (e.g. a job run)
+LATE_COMMIT_WINDOW = timedelta(minutes=2)
+
+
+class NotificationStreamService:
+    """Server-sent events for one user's notifications.
+
+    Emits a ``notification`` event per new notification, with the stream's
+    keyset cursor as the event id, and an ``unread_count`` event whenever the count
+    changes. A session is opened only when the broker wakes the stream, so an
+    idle stream holds no connection and runs no queries; it only sends
+    heartbeats.
+
+    The stream subscribes when it starts iterating and unsubscribes when it
+    ends, so a client that leaves before the first byte never takes a slot.
+
+    ``created_at`` is the inserting transaction's start time, so a notification
+    can commit after one with a later ``created_at`` was streamed. Each pass
+    therefore re-reads ``LATE_COMMIT_WINDOW`` behind the newest streamed row
+    and skips the ids it has already sent. A resumed stream counts the rows
+    in that window up to its ``Last-Event-ID`` as delivered.
+    """
+
+    def __init__(
+        self,
+        broker: NotificationBroker,
+        user_id: UUID,
+        session_factory: SessionFactory | None = None,
+        *,
+        heartbeat: float | None = None,
+    ):
+        if session_factory is None:
+            from app.core.database import async_session_factory
+
+            session_factory = async_session_factory
+        self.broker = broker
+        self.user_id = user_id
+        self.session_factory = session_factory
+        self.heartbeat = heartbeat or get_settings().sse_heartbeat_seconds
+
+    async def events(self, after: tuple[datetime, UUID] | None = None) -> AsyncIterator[str]:
+        """Stream events after the ``(created_at, id)`` key, or from now if None."""
+        try:
+            subscription = self.broker.subscribe(self.user_id)
+        except ConnectionLimitError:
+            yield f"retry: {FULL_RETRY_MS}\n\n"
+            return
+        try:
+            yield f"retry: {RETRY_MS}\n\n"
+            if after is None:
+                after = await self._latest_key()
+            # Rows at or before the starting key count as delivered
+            sent = await self._keys_in_window(after) if after else {}
+            last_count = None
+            while True:
+                subscription.wake.clear()
+                notifications, count = await self._fetch(after, sent)
+                for notification in notifications:
+                    key = (notification.created_at, notification.id)
+                    sent[notification.id] = notification.created_at
+                    after = max(after, key) if after else key
+                    payload = NotificationRead.model_validate(notification).model_dump_json()
+                    # The newest key streamed so far, so a resumed stream skips the same rows
+                    yield _event("notification", payload, event_id=encode_cursor(*after))
+                if after:
+                    floor = after[0] - LATE_COMMIT_WINDOW
+                    sent = {i: t for i, t in sent.items() if t >= floor}
+                if count != last_count:
+                    yield _event("unread_count", json.dumps({"count": count}))
+                    last_count = count
+                if len(notifications) == BATCH_SIZE:
+                    continue
+                # Heartbeats keep the connection open without touching the database
+                while not await self._woken(subscription):
+                    yield ": heartbeat\n\n"
+        finally:
+            subscription.close()
+
+    async def _woken(self, subscription: Subscription) -> bool:
+        try:
+            await asyncio.wait_for(subscription.wake.wait(), self.heartbeat)
+        except TimeoutError:
+            return False
+        return True
+
+    async def _latest_key(self) -> tuple[datetime, UUID] | None:
+        stmt = (
+            select(Notification.created_at, Notification.id)
+            .where(Notification.user_id == self.user_id)
+            .order_by(Notification.created_at.desc(), Notification.id.desc())
+            .limit(1)
+        )
+        async with self.session_factory() as db:
+            row = (await db.execute(stmt)).one_or_none()
+        return tuple(row) if row else None
+
+    async def _keys_in_window(self, after: tuple[datetime, UUID]) -> dict[UUID, datetime]:
+        stmt = select(Notification.id, Notification.created_at).where(
+            Notification.user_id == self.user_id,
+            Notification.created_at >= after[0] - LATE_COMMIT_WINDOW,
+            ~keyset_after([Notification.created_at, Notification.id], after, descending=False),
+        )
+        async with self.session_factory() as db:
+            return dict((await db.execute(stmt)).tuples().all())
+
+    async def _fetch(
+        self, after: tuple[datetime, UUID] | None, sent: dict[UUID, datetime]
+    ) -> tuple[list[Notification], int]:
+        stmt = (
+            select(Notification)
+            .where(Notification.user_id == self.user_id)
+            .order_by(Notification.created_at, Notification.id)
+            .limit(BATCH_SIZE)
+        )
+        if after:
+            stmt = stmt.where(Notification.created_at >= after[0] - LATE_COMMIT_WINDOW)
+        if sent:
+            stmt = stmt.where(Notification.id.not_in(list(sent)))
+        async with self.session_factory() as db:
+            notifications = list((await db.scalars(stmt)).all())
+            count = await NotificationService(db).get_unread_count(self.user_id)
+        return notifications, count
+
+
+def _event(name: str, data: str, *, event_id: str | None = None) -> str:
+    lines = [f"event: {name}"]
+    if event_id:
+        lines.append(f"id: {event_id}")
+    lines.append(f"data: {data}")
+    return "\n".join(lines) + "\n\n"
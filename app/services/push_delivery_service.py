@@ -0,0 +1,146 @@
+"""Push notification delivery.
+
+Notifications are pushed from the task queue, never from a request: creating a
+notification enqueues a ``push_delivery`` task carrying the new notification
+ids, and a worker sends them through the configured provider. Messages go out
+in provider-sized batches with at most ``push_concurrency`` requests in flight;
+a batch that fails transiently is retried with backoff up to
+``push_max_retries`` times, and tokens the provider reports as dead are pruned.
+Any other failure is recorded against its own batch only. The task still
+succeeds, because retrying it would push every other batch a second time.
+"""
+
+import asyncio
+import logging
+import time
+from datetime import datetime, timedelta, timezone
+from uuid import UUID
+
+from sqlalchemy import Float, Integer, delete, func, select
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import get_settings
+from app.integrations.push_provider import (
+    PushMessage,
+    PushOutcome,
+    PushProvider,
+    TransientPushError,
+)
+from app.models.notification import Notification
+from app.models.push_token import PushToken
+from app.models.task import Task
+
+logger = logging.getLogger(__name__)
+
+PUSH_TASK_KIND = "push_delivery"
+
+# First retry waits this long; each further retry doubles it
+RETRY_BASE_SECONDS = 0.5
+
+
+class PushDeliveryService:
+    def __init__(self, db: AsyncSession, provider: PushProvider | None = None):
+        self.db = db
+        self.provider = provider
+
+    async def deliver_notifications(self, notification_ids: list[UUID]) -> dict:
+        """Push each notification to every device registered by its recipient."""
+        stmt = (
+            select(Notification.title, Notification.body, Notification.data, PushToken.token)
+            .join(PushToken, PushToken.user_id == Notification.user_id)
+            .where(Notification.id.in_(notification_ids))
+        )
+        result = await self.db.execute(stmt)
+        messages = [
+            PushMessage(token=token, title=title, body=body, data=data or {})
+            for title, body, data, token in result.all()
+        ]
+        return await self.deliver(messages)
+
+    async def deliver(self, messages: list[PushMessage]) -> dict:
+        """Send ``messages`` and prune dead tokens; returns delivery stats.
+
+        The stats become the task result, which is what :meth:`get_metrics`
+        aggregates.
+        """
+        started = time.monotonic()
+        size = self.provider.max_batch_size
+        batches = [messages[i : i + size] for i in range(0, len(messages), size)]
+        slots = asyncio.Semaphore(get_settings().push_concurrency)
+        results = await asyncio.gather(*(self._send_batch(batch, slots) for batch in batches))
+
+        outcomes = [outcome for batch_outcomes, _ in results for outcome in batch_outcomes]
+        dead_tokens = {o.token for o in outcomes if o.status == "invalid_token"}
+        if dead_tokens:
+            try:
+                async with self.db.begin_nested():
+                    await self.db.execute(
+                        delete(PushToken).where(PushToken.token.in_(dead_tokens))
+                    )
+            except SQLAlchemyError:
+                # The pushes went out; the provider reports these tokens again next time
+                logger.exception("Could not prune %d dead push tokens", len(dead_tokens))
+                dead_tokens = set()
+
+        stats = {
+            "messages": len(messages),
+            "sent": sum(1 for o in outcomes if o.status == "ok"),
+            "failed": sum(1 for o in outcomes if o.status == "error"),
+            "pruned": len(dead_tokens),
+            "batches": len(batches),
+            "retries": sum(retries for _, retries in results),
+            "seconds": round(time.monotonic() - started, 3),
+        }
+        logger.info("Push delivery: %s", stats)
+        return stats
+
+    async def _send_batch(
+        self, batch: list[PushMessage], slots: asyncio.Semaphore
+    ) -> tuple[list[PushOutcome], int]:
+        """Send one batch, retrying transient failures; returns outcomes and retry count."""
+        max_retries = get_settings().push_max_retries
+        for attempt in range(max_retries + 1):
+            # Hold a slot only while the request is in flight, not during backoff
+            async with slots:
+                try:
+                    return await self.provider.send(batch), attempt
+                except TransientPushError as exc:
+                    error = str(exc)
+                except Exception as exc:
+                    # e.g. a 4xx or a malformed response: resending the batch cannot help
+                    logger.exception("Push batch of %d failed", len(batch))
+                    return [PushOutcome(m.token, "error", repr(exc)) for m in batch], attempt
+            if attempt < max_retries:
+                await asyncio.sleep(RETRY_BASE_SECONDS * 2**attempt)
+        logger.warning("Push batch of %d failed after %d retries: %s", len(batch), attempt, error)
+        return [PushOutcome(m.token, "error", error) for m in batch], attempt
+
+    async def get_metrics(self, hours: int = 24) -> dict:
+        """Delivery totals and throughput over finished push tasks in the last ``hours``."""
+        since = datetime.now(timezone.utc) - timedelta(hours=hours)
+
+        def total(key: str, type_=Integer):
+            return func.coalesce(func.sum(Task.result[key].as_string().cast(type_)), 0)
+
+        stmt = select(
+            func.count().label("deliveries"),
+            total("messages").label("messages"),
+            total("sent").label("sent"),
+            total("failed").label("failed"),
+            total("pruned").label("pruned"),
+            total("batches").label("batches"),
+            total("retries").label("retries"),
+            total("seconds", Float).label("seconds"),
+        ).where(
+            Task.kind == PUSH_TASK_KIND,
+            Task.status == "succeeded",
+            Task.finished_at >= since,
+        )
+        row = (await self.db.execute(stmt)).one()
+        metrics = dict(row._mapping)
+        metrics["hours"] = hours
+        metrics["messages_per_second"] = (
+            round(metrics["messages"] / metrics["seconds"], 1) if metrics["seconds"] else None
+        )
+        return metrics
@@ -3,6 +3,7 @@ from decimal import Decimal
 from uuid import UUID
 
 from sqlalchemy import delete, func, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.match import Match
@@ -204,28 +205,28 @@ class RecommendationService:
     async def record_practice_attendance(
         self, fixture_id: UUID, attendances: list[dict], recorded_by: UUID | None = None
     ) -> bool:
-        for att in attendances:
-            stmt = select(PracticeAttendance).where(
-                PracticeAttendance.fixture_id == fixture_id,
-                PracticeAttendance.player_id == att["player_id"],
-            )
-            result = await self.db.execute(stmt)
-            existing = result.scalar_one_or_none()
-
-            if existing:
-                existing.status = att["status"]
-                existing.notes = att.get("notes")
-            else:
-                entry = PracticeAttendance(
-                    fixture_id=fixture_id,
-                    player_id=att["player_id"],
-                    status=att["status"],
-                    notes=att.get("notes"),
-                    recorded_by=recorded_by,
-                )
-                self.db.add(entry)
-
-        await self.db.flush()
+        if not attendances:
+            return True
+
+        # Last entry wins for a repeated player; ON CONFLICT can't hit a row twice
+        by_player = {att["player_id"]: att for att in attendances}
+        upsert = pg_insert(PracticeAttendance).values(
+            [
+                {
+                    "fixture_id": fixture_id,
+                    "player_id": player_id,
+                    "status": att["status"],
+                    "notes": att.get("notes"),
+                    "recorded_by": recorded_by,
+                }
+                for player_id, att in by_player.items()
+            ]
+        )
+        upsert = upsert.on_conflict_do_update(
+            index_elements=[PracticeAttendance.player_id, PracticeAttendance.fixture_id],
+            set_={"status": upsert.excluded.status, "notes": upsert.excluded.notes},
+        )
+        await self.db.execute(upsert)
         return True
 
     # --- Selection Withdrawal ---
@@ -0,0 +1,112 @@
+from datetime import datetime
+from uuid import UUID
+
+from sqlalchemy import REAL, ColumnElement, false, func, literal, null, select, union_all
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.pagination import keyset_after
+from app.models.announcement import Announcement
+from app.models.channel import Channel
+from app.models.message import Message
+
+# Must match the configuration in the generated search_vector columns
+SEARCH_CONFIG = "english"
+HIGHLIGHT_OPTIONS = (
+    "StartSel=<mark>, StopSel=</mark>, MaxWords=30, MinWords=10, "
+    "MaxFragments=2, FragmentDelimiter=\" … \""
+)
+# "&" first, so the other entities are not escaped twice
+HTML_ENTITIES = (("&", "&amp;"), ("<", "&lt;"), (">", "&gt;"), ('"', "&quot;"), ("'", "&#39;"))
+
+
+class SearchService:
+    """Full-text search over a club's messages and announcements.
+
+    Both tables carry a generated ``search_vector`` with a GIN index, so the
+    match is an index scan; ranking and snippets only touch matching rows.
+    Announcement titles and bodies are weighted A and B while messages use
+    the default weight, so an announcement outranks a chat message that
+    matches equally well.
+    """
+
+    def __init__(self, db: AsyncSession, club_id: UUID):
+        self.db = db
+        self.club_id = club_id
+
+    async def search(
+        self,
+        query: str,
+        *,
+        limit: int = 20,
+        after: tuple[float, datetime, UUID] | None = None,
+    ) -> list[dict]:
+        """Best matches first, starting after the ``(rank, created_at, id)`` key.
+
+        ``query`` uses web search syntax: quoted phrases, ``or`` and ``-word``.
+        Snippets are HTML: the stored text is escaped and matched terms are
+        wrapped in ``<mark>``.
+        """
+        tsquery = func.websearch_to_tsquery(SEARCH_CONFIG, query)
+        messages = (
+            select(
+                literal("message").label("kind"),
+                Message.id,
+                Message.channel_id,
+                null().label("title"),
+                Message.content.label("text"),
+                func.ts_rank(Message.search_vector, tsquery, type_=REAL).label("rank"),
+                Message.created_at,
+            )
+            .join(Channel, Message.channel_id == Channel.id)
+            .where(
+                Channel.club_id == self.club_id,
+                Message.is_deleted == false(),
+                Message.search_vector.op("@@")(tsquery),
+            )
+        )
+        announcements = select(
+            literal("announcement").label("kind"),
+            Announcement.id,
+            null().label("channel_id"),
+            Announcement.title,
+            func.coalesce(Announcement.body, Announcement.title).label("text"),
+            func.ts_rank(Announcement.search_vector, tsquery, type_=REAL).label("rank"),
+            Announcement.created_at,
+        ).where(
+            Announcement.club_id == self.club_id,
+            Announcement.is_archived == false(),
+            Announcement.search_vector.op("@@")(tsquery),
+        )
+        matches = union_all(messages, announcements).subquery("matches")
+        sort_key = [matches.c.rank, matches.c.created_at, matches.c.id]
+
+        page_stmt = (
+            select(matches)
+            .order_by(*(c.desc() for c in sort_key))
+            .limit(limit)
+        )
+        if after:
+            page_stmt = page_stmt.where(keyset_after(sort_key, after))
+        page = page_stmt.subquery("page")
+
+        # Headlines are costly, so they are built for the page only
+        stmt = select(
+            page.c.kind,
+            page.c.id,
+            page.c.channel_id,
+            page.c.title,
+            func.ts_headline(
+                SEARCH_CONFIG, _html_escape(page.c.text), tsquery, HIGHLIGHT_OPTIONS
+            ).label("snippet"),
+            page.c.rank,
+            page.c.created_at,
+        ).order_by(page.c.rank.desc(), page.c.created_at.desc(), page.c.id.desc())
+        result = await self.db.execute(stmt)
+        return [dict(row) for row in result.mappings().all()]
+
+
+def _html_escape(text: ColumnElement) -> ColumnElement:
+    """``html.escape`` in SQL, so only the ``<mark>`` tags in a snippet are markup."""
+    for char, entity in HTML_ENTITIES:
+        text = func.replace(text, char, entity)
+    return text
@@ -1,10 +1,15 @@
 from uuid import UUID
 
-from sqlalchemy import select
+from sqlalchemy import Boolean, Integer, column, delete, insert, select, update, values
+from sqlalchemy.dialects.postgresql import UUID as PG_UUID
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.models.match_audit_log import MatchAuditLog
 from app.models.team_selection import TeamSelection
 
+# Columns a captain can change on an existing selection without re-selecting the player
+EDITABLE_FIELDS = ("batting_position", "is_captain", "is_wicketkeeper")
+
 
 class SelectionService:
     def __init__(self, db: AsyncSession):
@@ -16,28 +21,86 @@ class SelectionService:
         return list(result.scalars().all())
 
     async def set_selections(
-        self, match_id: UUID, selections: list[dict]
-    ) -> list[TeamSelection]:
-        # Delete existing selections for this match
-        stmt = select(TeamSelection).where(TeamSelection.match_id == match_id)
-        result = await self.db.execute(stmt)
-        for existing in result.scalars().all():
-            await self.db.delete(existing)
-
-        # Create new selections
-        created = []
-        for sel in selections:
-            ts = TeamSelection(
-                match_id=match_id,
-                player_id=sel["player_id"],
-                batting_position=sel.get("batting_position"),
-                is_captain=sel.get("is_captain", False),
-                is_wicketkeeper=sel.get("is_wicketkeeper", False),
+        self, match_id: UUID, selections: list[dict], actor_id: UUID | None = None
+    ) -> tuple[list[TeamSelection], dict]:
+        """Replace the XI for a match by applying only the difference.
+
+        Removed players go in one DELETE, new players in one multi-row INSERT and
+        changed batting positions / captaincy in one UPDATE ... FROM (VALUES ...).
+        Returns the resulting selections (in request order) and a change set of
+        player ids ``{"added": [...], "removed": [...], "updated": [...]}``, which
+        is also written to the match audit log when non-empty.
+        """
+        requested = {
+            sel["player_id"]: {
+                "batting_position": sel.get("batting_position"),
+                "is_captain": sel.get("is_captain", False),
+                "is_wicketkeeper": sel.get("is_wicketkeeper", False),
+            }
+            for sel in selections
+        }
+        current = {s.player_id: s for s in await self.get_for_match(match_id)}
+
+        removed = [s for player_id, s in current.items() if player_id not in requested]
+        added = [
+            {"match_id": match_id, "player_id": player_id, **fields}
+            for player_id, fields in requested.items()
+            if player_id not in current
+        ]
+        updated = [
+            player_id
+            for player_id, fields in requested.items()
+            if player_id in current
+            and any(getattr(current[player_id], f) != fields[f] for f in EDITABLE_FIELDS)
+        ]
+
+        if removed:
+            await self.db.execute(
+                delete(TeamSelection).where(TeamSelection.id.in_([s.id for s in removed]))
+            )
+        rows = {s.player_id: s for s in current.values() if s.player_id in requested}
+        if added:
+            result = await self.db.scalars(insert(TeamSelection).returning(TeamSelection), added)
+            rows.update({s.player_id: s for s in result.all()})
+        if updated:
+            changes = values(
+                column("id", PG_UUID(as_uuid=True)),
+                column("batting_position", Integer),
+                column("is_captain", Boolean),
+                column("is_wicketkeeper", Boolean),
+                name="changes",
+            ).data(
+                [
+                    (current[player_id].id, *(requested[player_id][f] for f in EDITABLE_FIELDS))
+                    for player_id in updated
+                ]
+            )
+            stmt = (
+                update(TeamSelection)
+                .where(TeamSelection.id == changes.c.id)
+                .values({f: changes.c[f] for f in EDITABLE_FIELDS})
+                .returning(TeamSelection)
             )
-            self.db.add(ts)
-            created.append(ts)
+            result = await self.db.execute(
+                select(TeamSelection)
+                .from_statement(stmt)
+                .execution_options(populate_existing=True)
+            )
+            rows.update({s.player_id: s for s in result.scalars().all()})
 
-        await self.db.flush()
-        for ts in created:
-            await self.db.refresh(ts)
-        return created
+        change_set = {
+            "added": [str(a["player_id"]) for a in added],
+            "removed": [str(s.player_id) for s in removed],
+            "updated": [str(player_id) for player_id in updated],
+        }
+        if any(change_set.values()):
+            self.db.add(
+                MatchAuditLog(
+                    match_id=match_id,
+                    action="selection_changed",
+                    actor_id=actor_id,
+                    details=change_set,
+                )
+            )
+            await self.db.flush()
+        return [rows[player_id] for player_id in requested], change_set
@@ -0,0 +1,30 @@
+from uuid import UUID
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.task_queue import enqueue
+from app.models.task import Task
+
+
+class TaskService:
+    def __init__(self, db: AsyncSession, club_id: UUID):
+        self.db = db
+        self.club_id = club_id
+
+    async def enqueue(
+        self,
+        kind: str,
+        payload: dict | None = None,
+        *,
+        priority: int = 0,
+        created_by: UUID | None = None,
+    ) -> Task:
+        return await enqueue(
+            self.db, kind, payload, club_id=self.club_id, priority=priority, created_by=created_by
+        )
+
+    async def get_by_id(self, task_id: UUID) -> Task | None:
+        stmt = select(Task).where(Task.id == task_id, Task.club_id == self.club_id)
+        result = await self.db.execute(stmt)
+        return result.scalar_one_or_none()
@@ -0,0 +1,84 @@
+"""Background task handlers.
+
+Importing this module registers every handler with the task queue; workers
+(``python -m app.worker`` or in-process) import it before they start.
+"""
+
+from uuid import UUID
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import get_settings
+from app.core.task_queue import PermanentTaskError, TaskWorker, registered_kinds, task_handler
+from app.integrations.imaging import ImageError
+from app.integrations.play_cricket_client import PlayCricketClient
+from app.integrations.push_provider import get_push_provider
+from app.models.club import Club
+from app.models.task import Task
+from app.services.media_derivative_service import DERIVATIVES_TASK_KIND, MediaDerivativeService
+from app.services.media_upload_service import content_key
+from app.services.play_cricket_sync_service import PlayCricketSyncService
+from app.services.push_delivery_service import PUSH_TASK_KIND, PushDeliveryService
+
+# Kinds that read or write media storage. Only the commerce service and the
+# standalone worker mount the media volume, so other services leave them out.
+MEDIA_TASK_KINDS = [DERIVATIVES_TASK_KIND]
+
+
+@task_handler("play_cricket_sync")
+async def sync_play_cricket(db: AsyncSession, task: Task) -> dict:
+    """Full Play-Cricket sync (teams, players, fixtures) for one club and season."""
+    settings = get_settings()
+    if not settings.play_cricket_api_token:
+        raise PermanentTaskError("Play-Cricket API token not configured")
+    site_id = await db.scalar(select(Club.play_cricket_id).where(Club.id == task.club_id))
+    if not site_id:
+        raise PermanentTaskError("Club does not have a Play-Cricket site ID configured")
+
+    client = PlayCricketClient(
+        base_url=settings.play_cricket_api_url,
+        api_token=settings.play_cricket_api_token,
+    )
+    async with client:
+        service = PlayCricketSyncService(db, task.club_id, client)
+        result = await service.sync_all(site_id, task.payload["season"])
+    return result.model_dump()
+
+
+@task_handler(PUSH_TASK_KIND)
+async def deliver_push(db: AsyncSession, task: Task) -> dict | None:
+    """Push a batch of freshly created notifications to their recipients' devices."""
+    provider = get_push_provider()
+    if provider is None:
+        return None
+    try:
+        service = PushDeliveryService(db, provider)
+        ids = [UUID(i) for i in task.payload["notification_ids"]]
+        return await service.deliver_notifications(ids)
+    finally:
+        await provider.aclose()
+
+
+@task_handler(DERIVATIVES_TASK_KIND)
+async def render_media_derivatives(db: AsyncSession, task: Task) -> dict:
+    """Resized copies of an uploaded image for every item sharing its content hash."""
+    content_hash = task.payload["content_hash"]
+    service = MediaDerivativeService(db)
+    try:
+        return await service.generate(content_hash, content_key(content_hash))
+    except FileNotFoundError as exc:
+        raise PermanentTaskError(f"Uploaded file {exc.filename} is not in media storage") from exc
+    except ImageError as exc:
+        raise PermanentTaskError(str(exc)) from exc
+
+
+def create_worker(*args, media: bool = True, **kwargs) -> TaskWorker:
+    """A worker that can run every task kind registered in this module.
+
+    Pass ``media=False`` where the media volume is not mounted, to leave
+    :data:`MEDIA_TASK_KINDS` to a worker that has it.
+    """
+    if not media:
+        kwargs["kinds"] = [k for k in registered_kinds() if k not in MEDIA_TASK_KINDS]
+    return TaskWorker(*args, **kwargs)
@@ -0,0 +1,34 @@
+"""Standalone task queue worker.
+
+Run with ``python -m app.worker``; stops cleanly on SIGINT/SIGTERM, giving
+running tasks time to finish before re-queueing them.
+"""
+
+import asyncio
+import logging
+import signal
+
+from app.integrations.imaging import shutdown_executor
+from app.tasks import create_worker
+
+
+async def main() -> None:
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop.set)
+
+    worker = create_worker()
+    await worker.start()
+    await stop.wait()
+    await worker.stop()
+    shutdown_executor()
+
+    from app.core.database import engine
+
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(main())
@@ -0,0 +1,116 @@
+"""Fan-out latency of channel events to connected messaging sockets.
+
+Simulates ``--connections`` sockets subscribed to one channel, publishes
+``--messages`` events and reports, per delivery, the time from publish to the
+socket's send. A ``--slow`` fraction of sockets take ``--slow-ms`` to send
+each event, to show that they are dropped without delaying everyone else.
+
+    python -m benchmarks.channel_fanout --connections 5000 --messages 200
+    python -m benchmarks.channel_fanout --postgres   # through LISTEN/NOTIFY
+
+``--postgres`` publishes with ``pg_notify`` on a real database (DATABASE_URL)
+and receives through :class:`PostgresChannelHub`, so it includes the
+commit-to-listener hop that cross-worker delivery pays.
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import time
+import uuid
+
+from app.core.channel_hub import ChannelConnection, ChannelHub, PostgresChannelHub
+
+
+def percentile(values: list[float], pct: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+async def run(args: argparse.Namespace) -> None:
+    hub = PostgresChannelHub(args.connections) if args.postgres else ChannelHub(args.connections)
+    await hub.start()
+    channel_id = str(uuid.uuid4())
+    latencies: list[float] = []
+    received = asyncio.Event()
+    expected = 0
+
+    def make_send(slow: bool):
+        async def send(event: dict) -> None:
+            if slow:
+                await asyncio.sleep(args.slow_ms / 1000)
+                return
+            latencies.append(time.perf_counter() - event["sent_at"])
+            if len(latencies) >= expected:
+                received.set()
+
+        return send
+
+    n_slow = int(args.connections * args.slow)
+    connections = []
+    for i in range(args.connections):
+        connection = ChannelConnection(uuid.uuid4(), make_send(i < n_slow), args.queue_size)
+        hub.connect(connection)
+        hub.join(connection, uuid.UUID(channel_id))
+        connections.append(connection)
+    writers = [asyncio.create_task(c.drain()) for c in connections]
+
+    publisher = None
+    if args.postgres:
+        import asyncpg
+
+        await asyncio.sleep(1)  # let the listener connect
+        publisher = await asyncpg.connect(hub._listener._dsn)
+
+    # Slow sockets are not timed; everyone else must get every event
+    expected = (args.connections - n_slow) * args.messages
+    started = time.perf_counter()
+    for i in range(args.messages):
+        event = {"type": "message.created", "channel_id": channel_id, "seq": i}
+        if args.postgres:
+            event["sent_at"] = time.perf_counter()
+            await publisher.execute("SELECT pg_notify('channel_events', $1)", json.dumps(event))
+        else:
+            event["sent_at"] = time.perf_counter()
+            hub.deliver(event)
+        await asyncio.sleep(args.interval_ms / 1000)
+
+    try:
+        await asyncio.wait_for(received.wait(), timeout=60)
+    except TimeoutError:
+        print("Timed out waiting for deliveries")
+    elapsed = time.perf_counter() - started
+
+    dropped = sum(c.overflowed.is_set() for c in connections)
+    for writer in writers:
+        writer.cancel()
+    await asyncio.gather(*writers, return_exceptions=True)
+    if publisher:
+        await publisher.close()
+    await hub.stop()
+
+    ms = [v * 1000 for v in latencies]
+    print(f"connections={args.connections} messages={args.messages} slow={n_slow}")
+    print(f"deliveries={len(ms)} in {elapsed:.2f}s ({len(ms) / elapsed:,.0f}/s)")
+    print(
+        f"latency ms: p50={statistics.median(ms):.2f} p95={percentile(ms, 95):.2f} "
+        f"p99={percentile(ms, 99):.2f} max={max(ms):.2f}"
+    )
+    print(f"slow sockets dropped: {dropped}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--connections", type=int, default=5000)
+    parser.add_argument("--messages", type=int, default=100)
+    parser.add_argument("--interval-ms", type=float, default=10.0)
+    parser.add_argument("--queue-size", type=int, default=256)
+    parser.add_argument("--slow", type=float, default=0.01, help="fraction of slow sockets")
+    parser.add_argument("--slow-ms", type=float, default=200.0)
+    parser.add_argument("--postgres", action="store_true")
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""Images per second per core of derivative rendering.
+
+Renders every size in ``DERIVATIVE_SPECS`` for ``--images`` synthetic JPEG
+photos of ``--megapixels`` through a process pool the way the
+``media_derivatives`` task does, once for each pool size up to the core
+count. Throughput per core should stay roughly flat as workers are added;
+a drop points at memory bandwidth or too few cores for the pool. Needs
+Pillow (``pip install .[media]``).
+
+    python -m benchmarks.media_derivatives --images 64 --megapixels 12
+"""
+
+import argparse
+import io
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from PIL import Image, ImageFilter
+
+from app.integrations.imaging import DERIVATIVE_SPECS, render_derivatives
+
+
+def photo(megapixels: float, seed: int) -> bytes:
+    """A camera-sized JPEG with photo-like detail, so neither codec can cheat."""
+    width = int((megapixels * 1e6 * 4 / 3) ** 0.5)
+    height = width * 3 // 4
+    noise = Image.effect_noise((width, height), 64 + seed % 32)
+    noise = noise.filter(ImageFilter.GaussianBlur(1.5))
+    gradient = Image.linear_gradient("L").resize((width, height))
+    image = Image.merge("RGB", (noise, gradient, gradient.transpose(Image.Transpose.ROTATE_180)))
+    out = io.BytesIO()
+    image.save(out, "JPEG", quality=90)
+    return out.getvalue()
+
+
+def pool_sizes(cores: int) -> list[int]:
+    sizes = [1]
+    while sizes[-1] * 2 < cores:
+        sizes.append(sizes[-1] * 2)
+    return sizes + [cores] if cores > 1 else sizes
+
+
+def run(args: argparse.Namespace) -> None:
+    sources = [photo(args.megapixels, i) for i in range(min(args.images, 8))]
+    work = [sources[i % len(sources)] for i in range(args.images)]
+    size_mb = sum(len(s) for s in sources) / len(sources) / 1024 / 1024
+    print(f"{args.images} images, {args.megapixels} MP, ~{size_mb:.1f} MiB JPEG each")
+
+    context = multiprocessing.get_context("spawn")
+    for workers in pool_sizes(args.max_workers or os.cpu_count() or 1):
+        with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+            # Warm up: start every worker and import Pillow before timing
+            list(pool.map(render_derivatives, sources[:1] * workers, [DERIVATIVE_SPECS] * workers))
+            started = time.perf_counter()
+            rendered = list(pool.map(render_derivatives, work, [DERIVATIVE_SPECS] * len(work)))
+            seconds = time.perf_counter() - started
+        out_kb = sum(len(d) for r in rendered for d in r.values()) / len(rendered) / 1024
+        rate = len(work) / seconds
+        print(
+            f"workers={workers:>3}  {rate:7.1f} images/s  {rate / workers:6.2f} images/s/core"
+            f"  ({out_kb:.0f} KiB of derivatives per image)"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--images", type=int, default=64)
+    parser.add_argument("--megapixels", type=float, default=12)
+    parser.add_argument("--max-workers", type=int, default=0, help="default: all cores")
+    run(parser.parse_args())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""Throughput and memory of the media upload path.
+
+Streams a ``--size-mb`` file through :class:`LocalStorage` the way
+``PATCH /media/uploads/{id}`` does: ``--chunk-mb`` requests, each arriving as
+64 KiB body chunks, written at their offset. It then runs the completion
+pass, which hashes the staged file and moves it to its content-addressed
+key. It reports MB/s for each phase and the peak Python heap, which should
+stay near ``BLOCK_SIZE`` whatever the file size.
+
+    python -m benchmarks.media_upload --size-mb 1024 --chunk-mb 16
+"""
+
+import argparse
+import asyncio
+import hashlib
+import os
+import resource
+import tempfile
+import time
+import tracemalloc
+
+from app.integrations.storage import LocalStorage
+from app.services.media_upload_service import content_key, staging_key
+
+BODY_CHUNK = 64 * 1024
+
+
+async def body(size: int, block: bytes):
+    """Request body chunks as the ASGI server delivers them."""
+    sent = 0
+    while sent < size:
+        chunk = block[: min(BODY_CHUNK, size - sent)]
+        sent += len(chunk)
+        yield chunk
+
+
+async def run(args: argparse.Namespace) -> None:
+    size = args.size_mb * 1024 * 1024
+    chunk_size = args.chunk_mb * 1024 * 1024
+    block = os.urandom(BODY_CHUNK)
+    with tempfile.TemporaryDirectory(dir=args.dir) as root:
+        storage = LocalStorage(root, "/media")
+        key = staging_key("benchmark")
+        tracemalloc.start()
+
+        started = time.perf_counter()
+        for offset in range(0, size, chunk_size):
+            await storage.write_at(key, offset, body(min(chunk_size, size - offset), block))
+        write_seconds = time.perf_counter() - started
+
+        started = time.perf_counter()
+        digest = hashlib.sha256()
+        async for data in storage.read(key):
+            digest.update(data)
+        await storage.move(key, content_key(digest.hexdigest()))
+        complete_seconds = time.perf_counter() - started
+
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    mb = size / 1024 / 1024
+    print(f"size={args.size_mb} MiB requests={-(-size // chunk_size)} x {args.chunk_mb} MiB")
+    print(f"write:    {mb / write_seconds:,.0f} MiB/s ({write_seconds:.2f}s)")
+    print(f"complete: {mb / complete_seconds:,.0f} MiB/s ({complete_seconds:.2f}s, hash + move)")
+    print(f"peak Python heap: {peak / 1024 / 1024:.1f} MiB")
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(f"max RSS: {max_rss:.0f} MiB")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size-mb", type=int, default=256)
+    parser.add_argument("--chunk-mb", type=int, default=16)
+    parser.add_argument("--dir", default=None, help="where to write (default: system temp)")
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -34,16 +34,39 @@ docker pull "${IMAGE}"
 docker stop "${CONTAINER_NAME}" 2>/dev/null || true
 docker rm "${CONTAINER_NAME}" 2>/dev/null || true
 
+# Commerce stores uploaded media on the host, where nginx serves /media/ from
+VOLUMES=()
+if [ "${SERVICE_NAME}" = "commerce" ]; then
+    mkdir -p /opt/ccm-backend/media
+    VOLUMES=(-v /opt/ccm-backend/media:/app/var/media)
+fi
+
 # Start the new container
 docker run -d \
     --name "${CONTAINER_NAME}" \
     --restart unless-stopped \
     -p "${PORT}:8000" \
     --env-file /opt/ccm/.env \
+    "${VOLUMES[@]}" \
     "${IMAGE}"
 
 echo "Deployed ${SERVICE_NAME} service on port ${PORT}"
 
+# The task worker runs every queued task kind (push delivery, Play-Cricket
+# sync, media derivatives), so it ships with commerce and shares its media
+if [ "${SERVICE_NAME}" = "commerce" ]; then
+    docker stop ccm-worker 2>/dev/null || true
+    docker rm ccm-worker 2>/dev/null || true
+    docker run -d \
+        --name ccm-worker \
+        --restart unless-stopped \
+        --env-file /opt/ccm/.env \
+        "${VOLUMES[@]}" \
+        "${IMAGE}" \
+        python -m app.worker
+    echo "Deployed task worker"
+fi
+
 # Wait for health check
 echo "Waiting for health check..."
 for i in $(seq 1 30); do
@@ -82,8 +82,8 @@ export class BackendStack extends cdk.Stack {
       '# Add ec2-user to docker group',
       'usermod -aG docker ec2-user',
       '',
-      '# Create application directory',
-      'mkdir -p /opt/ccm-backend',
+      '# Create application directory (media/ is served by nginx from /media/)',
+      'mkdir -p /opt/ccm-backend/media',
       '',
       '# Write initial Nginx config (placeholder — full config deployed via CI/CD)',
       '# The detailed routing config (nginx/api.conf from ccm-backend repo) is',
@@ -219,13 +219,34 @@ export class BackendStack extends cdk.Stack {
       '  docker stop $SERVICE 2>/dev/null || true',
       '  docker rm $SERVICE 2>/dev/null || true',
       '',
+      '  # Commerce stores uploaded media (and renders its derivatives) on the host',
+      '  VOLUMES=""',
+      '  if [ "$SERVICE" = "ccm-commerce" ]; then',
+      '    VOLUMES="-v /opt/ccm-backend/media:/app/var/media"',
+      '  fi',
+      '',
       '  # Start new container',
       '  docker run -d \\',
       '    --name $SERVICE \\',
       '    --restart unless-stopped \\',
       '    -p $PORT:8000 \\',
       '    --env-file /opt/ccm-backend/$SERVICE.env \\',
+      '    $VOLUMES \\',
       '    $IMAGE',
+      '',
+      '  # The task worker runs every queued task kind, media derivatives included,',
+      '  # so it ships with commerce and shares its media volume',
+      '  if [ "$SERVICE" = "ccm-commerce" ]; then',
+      '    docker stop ccm-worker 2>/dev/null || true',
+      '    docker rm ccm-worker 2>/dev/null || true',
+      '    docker run -d \\',
+      '      --name ccm-worker \\',
+      '      --restart unless-stopped \\',
+      '      --env-file /opt/ccm-backend/$SERVICE.env \\',
+      '      $VOLUMES \\',
+      '      $IMAGE \\',
+      '      python -m app.worker',
+      '  fi',
       'done',
       '',
       'echo "Deployment complete!"',
@@ -26,6 +26,7 @@ SERVICE_TABLES = {
     "platform_settings",
     "registration_requests",
     "pending_club_registrations",
+    "job_runs",
 }
 
 
@@ -21,6 +21,7 @@ SERVICE_TABLES = {
     "players",
     "seasons",
     "club_key_people",
+    "tasks",
 }
 
 
@@ -9,7 +9,18 @@ from app.core.exception_handlers import register_exception_handlers
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
+    from app.jobs import create_scheduler
+    from app.tasks import create_worker
+
+    scheduler = create_scheduler("play_cricket_sync")
+    # Media tasks run next to commerce, which owns the media volume
+    worker = create_worker(media=False)
+    await scheduler.start()
+    if get_settings().task_worker_in_process:
+        await worker.start()
     yield
+    await worker.stop()
+    await scheduler.stop()
     from app.core.database import engine
 
     await engine.dispose()
@@ -35,7 +46,16 @@ def create_app() -> FastAPI:
 
     register_exception_handlers(app)
 
-    from app.api.v1 import clubs, health, members, play_cricket, players, seasons, teams
+    from app.api.v1 import (
+        clubs,
+        health,
+        members,
+        play_cricket,
+        players,
+        seasons,
+        tasks,
+        teams,
+    )
 
     router = APIRouter(prefix="/api/v1")
     router.include_router(health.router)
@@ -45,6 +65,7 @@ def create_app() -> FastAPI:
     router.include_router(teams.router)
     router.include_router(players.router)
     router.include_router(play_cricket.router)
+    router.include_router(tasks.router)
     app.include_router(router)
 
     return app
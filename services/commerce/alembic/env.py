@@ -27,6 +27,7 @@ SERVICE_TABLES = {
     "media_items",
     "media_tags",
     "media_item_tags",
+    "media_uploads",
 }
 
 
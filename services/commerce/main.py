@@ -9,7 +9,22 @@ from app.core.exception_handlers import register_exception_handlers
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
+    from app.core.summary_cache import summary_cache
+    from app.integrations.imaging import shutdown_executor
+    from app.jobs import create_scheduler
+    from app.tasks import MEDIA_TASK_KINDS, create_worker
+
+    scheduler = create_scheduler("media_upload_cleanup")
+    worker = create_worker(kinds=MEDIA_TASK_KINDS)
+    await scheduler.start()
+    await summary_cache.start()
+    if get_settings().task_worker_in_process:
+        await worker.start()
     yield
+    await worker.stop()
+    shutdown_executor()
+    await summary_cache.stop()
+    await scheduler.stop()
     from app.core.database import engine
 
     await engine.dispose()
@@ -53,6 +68,7 @@ def create_app() -> FastAPI:
     router.include_router(media.gallery_router)
     router.include_router(media.item_router)
     router.include_router(media.tag_router)
+    router.include_router(media.upload_router)
     app.include_router(router)
 
     return app
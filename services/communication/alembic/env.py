@@ -17,12 +17,15 @@ target_metadata = Base.metadata
 
 SERVICE_TABLES = {
     "channels",
+    "channel_read_cursors",
     "messages",
     "message_reactions",
     "polls",
     "poll_options",
     "poll_votes",
     "notifications",
+    "notification_counters",
+    "notifications_archive",
     "push_tokens",
     "announcements",
     "faqs",
@@ -9,7 +9,27 @@ from app.core.exception_handlers import register_exception_handlers
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
+    from app.core.channel_hub import hub
+    from app.core.notification_broker import broker
+    from app.core.read_cursors import read_cursors
+    from app.jobs import create_scheduler
+
+    scheduler = create_scheduler(
+        "match_reminders",
+        "payment_reminders",
+        "selection_deadline_alerts",
+        "unread_counts_reconcile",
+        "notification_archive",
+    )
+    await scheduler.start()
+    await broker.start()
+    await hub.start()
+    await read_cursors.start()
     yield
+    await read_cursors.stop()
+    await hub.stop()
+    await broker.stop()
+    await scheduler.stop()
     from app.core.database import engine
 
     await engine.dispose()
@@ -35,7 +55,7 @@ def create_app() -> FastAPI:
 
     register_exception_handlers(app)
 
-    from app.api.v1 import announcements, faqs, health, messaging, notifications
+    from app.api.v1 import announcements, faqs, health, messaging, notifications, search
 
     router = APIRouter(prefix="/api/v1")
     router.include_router(health.router)
@@ -44,10 +64,13 @@ def create_app() -> FastAPI:
     router.include_router(messaging.message_action_router)
     router.include_router(messaging.poll_option_router)
     router.include_router(messaging.poll_action_router)
+    router.include_router(messaging.socket_router)
+    router.include_router(search.router)
     router.include_router(notifications.router)
     router.include_router(notifications.notification_actions_router)
     router.include_router(notifications.reminders_router)
     router.include_router(notifications.push_tokens_router)
+    router.include_router(notifications.club_router)
     router.include_router(announcements.router)
     router.include_router(faqs.router)
     app.include_router(router)
@@ -0,0 +1,149 @@
+import uuid
+from datetime import date, time
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.club import Club
+from app.models.match import Match
+from app.models.match_availability import MatchAvailability
+from app.models.player import Player
+from app.models.season import Season
+from tests.conftest import TEST_CLUB_ID
+
+
+@pytest.fixture
+async def seed_season(db_session: AsyncSession):
+    club = Club(id=TEST_CLUB_ID, name="Test CC", slug="test-cc-matrix")
+    db_session.add(club)
+
+    season = Season(
+        id=uuid.uuid4(),
+        club_id=TEST_CLUB_ID,
+        name="2026",
+        start_date=date(2026, 4, 1),
+        end_date=date(2026, 9, 30),
+    )
+    db_session.add(season)
+
+    matches = [
+        Match(
+            id=uuid.uuid4(),
+            club_id=TEST_CLUB_ID,
+            season_id=season.id,
+            date=date(2026, 5, day),
+            time=time(13, 0),
+            opponent=f"Opponent {day}",
+            venue="Home",
+            type="League",
+            status="upcoming",
+        )
+        for day in (9, 2, 16)
+    ]
+    players = [
+        Player(id=uuid.uuid4(), club_id=TEST_CLUB_ID, name=name, role="Batter")
+        for name in ("Bravo", "Alpha")
+    ]
+    db_session.add_all(matches + players)
+    await db_session.flush()
+
+    db_session.add_all(
+        [
+            MatchAvailability(match_id=matches[1].id, player_id=players[0].id, status="available"),
+            MatchAvailability(
+                match_id=matches[2].id, player_id=players[0].id, status="unavailable"
+            ),
+            MatchAvailability(match_id=matches[0].id, player_id=players[1].id, status="pending"),
+        ]
+    )
+    await db_session.flush()
+    return {"season": season, "matches": matches, "players": players}
+
+
+@pytest.mark.asyncio
+async def test_season_matrix_encoding(client: AsyncClient, seed_season):
+    season = seed_season["season"]
+    matches = seed_season["matches"]
+    bravo, alpha = seed_season["players"]
+
+    response = await client.get(
+        f"/api/v1/clubs/{TEST_CLUB_ID}/availability/matrix",
+        params={"season_id": str(season.id)},
+    )
+    assert response.status_code == 200
+    data = response.json()
+    # Matches by date, players by name
+    assert data["match_ids"] == [str(m.id) for m in (matches[1], matches[0], matches[2])]
+    assert data["player_ids"] == [str(alpha.id), str(bravo.id)]
+    assert data["statuses"] == ["-P-", "A-U"]
+    assert data["codes"] == {
+        "A": "available",
+        "U": "unavailable",
+        "P": "pending",
+        "-": "no_response",
+    }
+
+
+@pytest.mark.asyncio
+async def test_season_matrix_not_modified(
+    client: AsyncClient, seed_season, db_session: AsyncSession
+):
+    url = f"/api/v1/clubs/{TEST_CLUB_ID}/availability/matrix"
+    params = {"season_id": str(seed_season["season"].id)}
+    first = await client.get(url, params=params)
+    etag = first.headers["etag"]
+
+    response = await client.get(url, params=params, headers={"If-None-Match": etag})
+    assert response.status_code == 304
+
+    db_session.add(
+        MatchAvailability(
+            match_id=seed_season["matches"][1].id,
+            player_id=seed_season["players"][1].id,
+            status="available",
+        )
+    )
+    await db_session.flush()
+    response = await client.get(url, params=params, headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.json()["statuses"][0] == "AP-"
+
+
+@pytest.mark.asyncio
+async def test_season_matrix_unknown_season(client: AsyncClient, seed_season):
+    response = await client.get(
+        f"/api/v1/clubs/{TEST_CLUB_ID}/availability/matrix",
+        params={"season_id": str(uuid.uuid4())},
+    )
+    assert response.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_admin_bulk_set_reports_per_entry(client: AsyncClient, seed_season):
+    matches = seed_season["matches"]
+    bravo, alpha = seed_season["players"]
+
+    def entry(match_id, player, status):
+        return {"match_id": str(match_id), "player_id": str(player.id), "status": status}
+
+    response = await client.post(
+        f"/api/v1/clubs/{TEST_CLUB_ID}/availability/bulk/players",
+        json={
+            "entries": [
+                entry(matches[1].id, bravo, "unavailable"),
+                entry(matches[1].id, alpha, "available"),
+                entry(uuid.uuid4(), alpha, "available"),
+            ]
+        },
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert data["updated_count"] == 2
+    assert [r["result"] for r in data["results"]] == ["updated", "created", "not_found"]
+
+    response = await client.get(
+        f"/api/v1/clubs/{TEST_CLUB_ID}/availability/matrix",
+        params={"season_id": str(seed_season["season"].id)},
+    )
+    assert response.json()["statuses"] == ["AP-", "U-U"]
@@ -0,0 +1,67 @@
+import asyncio
+import uuid
+
+import pytest
+
+from app.core.channel_hub import ChannelConnection, ChannelHub
+from app.core.pubsub import ConnectionLimitError
+from tests.conftest import TEST_USER_ID
+
+
+def make_connection(queue_size: int = 8) -> tuple[ChannelConnection, list[dict]]:
+    sent: list[dict] = []
+
+    async def send(event: dict) -> None:
+        sent.append(event)
+
+    return ChannelConnection(TEST_USER_ID, send, queue_size), sent
+
+
+def test_hub_caps_connections_per_worker():
+    hub = ChannelHub(max_connections=1)
+    first, _ = make_connection()
+    hub.connect(first)
+    with pytest.raises(ConnectionLimitError):
+        hub.connect(make_connection()[0])
+
+    hub.disconnect(first)
+    assert hub.connection_count == 0
+    hub.connect(make_connection()[0])
+
+
+@pytest.mark.asyncio
+async def test_deliver_reaches_only_subscribed_connections():
+    hub = ChannelHub(max_connections=10)
+    channel_id = uuid.uuid4()
+    subscribed, subscribed_sent = make_connection()
+    other, other_sent = make_connection()
+    for connection in (subscribed, other):
+        hub.connect(connection)
+    hub.join(subscribed, channel_id)
+    hub.join(other, uuid.uuid4())
+
+    event = {"type": "message.created", "channel_id": str(channel_id)}
+    assert hub.deliver(event) == 1
+
+    writer = asyncio.create_task(subscribed.drain())
+    await asyncio.sleep(0)
+    writer.cancel()
+    assert subscribed_sent == [event]
+    assert other_sent == []
+
+    hub.leave(subscribed, channel_id)
+    assert hub.deliver(event) == 0
+
+
+def test_full_queue_marks_connection_overflowed():
+    hub = ChannelHub(max_connections=10)
+    channel_id = uuid.uuid4()
+    slow, _ = make_connection(queue_size=2)
+    hub.connect(slow)
+    hub.join(slow, channel_id)
+
+    event = {"type": "message.deleted", "channel_id": str(channel_id)}
+    assert [hub.deliver(event) for _ in range(3)] == [1, 1, 0]
+    assert slow.overflowed.is_set()
+    # Once behind, nothing more is queued for it
+    assert slow.queue.qsize() == 2
@@ -0,0 +1,56 @@
+import pytest
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.club import Club
+from app.models.faq import FAQ
+from tests.conftest import TEST_CLUB_ID
+
+
+@pytest.fixture
+async def seed_faq(db_session: AsyncSession):
+    club = Club(id=TEST_CLUB_ID, name="Test CC", slug="test-cc-etag")
+    db_session.add(club)
+    faq = FAQ(club_id=TEST_CLUB_ID, question="When are nets?", answer="Tuesdays")
+    db_session.add(faq)
+    await db_session.flush()
+    return faq
+
+
+@pytest.mark.asyncio
+async def test_list_faqs_emits_validators(client: AsyncClient, seed_faq):
+    response = await client.get(f"/api/v1/clubs/{TEST_CLUB_ID}/faqs/")
+    assert response.status_code == 200
+    assert response.headers["etag"].startswith('W/"')
+    assert "last-modified" in response.headers
+
+
+@pytest.mark.asyncio
+async def test_list_faqs_not_modified(client: AsyncClient, seed_faq):
+    first = await client.get(f"/api/v1/clubs/{TEST_CLUB_ID}/faqs/")
+    etag = first.headers["etag"]
+
+    response = await client.get(
+        f"/api/v1/clubs/{TEST_CLUB_ID}/faqs/", headers={"If-None-Match": etag}
+    )
+    assert response.status_code == 304
+    assert response.headers["etag"] == etag
+    assert response.content == b""
+
+
+@pytest.mark.asyncio
+async def test_list_faqs_etag_changes_after_write(
+    client: AsyncClient, seed_faq, db_session: AsyncSession
+):
+    first = await client.get(f"/api/v1/clubs/{TEST_CLUB_ID}/faqs/")
+
+    db_session.add(FAQ(club_id=TEST_CLUB_ID, question="Kit colours?", answer="Whites"))
+    await db_session.flush()
+
+    response = await client.get(
+        f"/api/v1/clubs/{TEST_CLUB_ID}/faqs/",
+        headers={"If-None-Match": first.headers["etag"]},
+    )
+    assert response.status_code == 200
+    assert response.headers["etag"] != first.headers["etag"]
+    assert len(response.json()) == 2
@@ -0,0 +1,188 @@
+import uuid
+from datetime import date, time, timedelta
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.club import Club
+from app.models.match import Match
+from app.models.match_availability import MatchAvailability
+from app.models.player import Player
+from app.models.team import Team
+from app.models.team_selection import TeamSelection
+from app.models.team_selection_config import TeamSelectionConfig
+from app.services.lifecycle_service import LifecycleService
+from tests.conftest import TEST_CLUB_ID
+
+
+@pytest.fixture
+async def seed_lifecycle_data(db_session: AsyncSession):
+    club = Club(id=TEST_CLUB_ID, name="Test CC", slug="test-cc-lifecycle")
+    db_session.add(club)
+
+    team = Team(id=uuid.uuid4(), club_id=TEST_CLUB_ID, name="1st XI")
+    db_session.add(team)
+
+    match = Match(
+        id=uuid.uuid4(),
+        club_id=TEST_CLUB_ID,
+        team_id=team.id,
+        date=date.today() + timedelta(days=3),
+        time=time(13, 0),
+        opponent="Rival CC",
+        venue="Home",
+        type="League",
+        status="upcoming",
+    )
+    db_session.add(match)
+
+    players = [
+        Player(id=uuid.uuid4(), club_id=TEST_CLUB_ID, name=f"Player {i}", role="Batter")
+        for i in range(3)
+    ]
+    db_session.add_all(players)
+    await db_session.flush()
+
+    db_session.add_all(
+        [
+            MatchAvailability(match_id=match.id, player_id=players[0].id, status="available"),
+            MatchAvailability(match_id=match.id, player_id=players[1].id, status="available"),
+            MatchAvailability(match_id=match.id, player_id=players[2].id, status="unavailable"),
+            TeamSelection(match_id=match.id, player_id=players[0].id),
+        ]
+    )
+    await db_session.flush()
+    return {"club": club, "team": team, "match": match, "players": players}
+
+
+@pytest.mark.asyncio
+async def test_deadline_alerts_counts(client: AsyncClient, seed_lifecycle_data):
+    response = await client.get(f"/api/v1/clubs/{TEST_CLUB_ID}/deadline-alerts")
+    assert response.status_code == 200
+    [alert] = response.json()
+    assert alert["match_id"] == str(seed_lifecycle_data["match"].id)
+    assert alert["team_name"] == "1st XI"
+    assert alert["available_count"] == 2
+    assert alert["selected_count"] == 1
+    assert alert["target_players"] == 11
+
+
+@pytest.mark.asyncio
+async def test_deadline_alerts_use_club_config(
+    client: AsyncClient, seed_lifecycle_data, db_session: AsyncSession
+):
+    db_session.add(
+        TeamSelectionConfig(
+            club_id=TEST_CLUB_ID, selection_deadline_hours=24, target_players=8
+        )
+    )
+    await db_session.flush()
+
+    response = await client.get(f"/api/v1/clubs/{TEST_CLUB_ID}/deadline-alerts")
+    [alert] = response.json()
+    match = seed_lifecycle_data["match"]
+    assert alert["target_players"] == 8
+    assert alert["deadline_at"].startswith((match.date - timedelta(days=1)).isoformat())
+
+
+@pytest.mark.asyncio
+async def test_deadline_alerts_for_all_clubs(seed_lifecycle_data, db_session: AsyncSession):
+    other_club = Club(id=uuid.uuid4(), name="Other CC", slug="other-cc-lifecycle")
+    db_session.add(other_club)
+    other_match = Match(
+        id=uuid.uuid4(),
+        club_id=other_club.id,
+        date=date.today() + timedelta(days=2),
+        time=time(11, 0),
+        opponent="Town CC",
+        venue="Away",
+        type="Friendly",
+        status="upcoming",
+    )
+    db_session.add(other_match)
+    db_session.add(TeamSelectionConfig(club_id=other_club.id, target_players=9))
+    await db_session.flush()
+
+    alerts = await LifecycleService.get_deadline_alerts_for_all_clubs(db_session)
+    [alert] = alerts[TEST_CLUB_ID]
+    assert alert["match_id"] == seed_lifecycle_data["match"].id
+    assert (alert["available_count"], alert["selected_count"]) == (2, 1)
+    assert alert["target_players"] == 11
+    [other_alert] = alerts[other_club.id]
+    assert other_alert["match_id"] == other_match.id
+    assert (other_alert["available_count"], other_alert["selected_count"]) == (0, 0)
+    assert other_alert["target_players"] == 9
+
+
+@pytest.mark.asyncio
+async def test_confirm_participation_upserts(
+    client: AsyncClient, seed_lifecycle_data, db_session: AsyncSession
+):
+    match_id = seed_lifecycle_data["match"].id
+    player_id = str(seed_lifecycle_data["players"][0].id)
+
+    for status in ("played", "no_show"):
+        response = await client.post(
+            f"/api/v1/matches/{match_id}/confirm-participation",
+            json={"participations": [{"player_id": player_id, "status": status}]},
+        )
+        assert response.status_code == 200
+
+    response = await client.get(f"/api/v1/matches/{match_id}/participation")
+    [participation] = response.json()
+    assert participation["status"] == "no_show"
+
+    response = await client.get(f"/api/v1/matches/{match_id}/audit-log")
+    assert len(response.json()) == 2
+
+
+@pytest.mark.asyncio
+async def test_finalize_selection_keeps_existing_participation(
+    client: AsyncClient, seed_lifecycle_data
+):
+    match_id = seed_lifecycle_data["match"].id
+    player_id = str(seed_lifecycle_data["players"][0].id)
+
+    await client.post(
+        f"/api/v1/matches/{match_id}/withdrawal",
+        json={"player_id": player_id, "reason": "Injured"},
+    )
+    response = await client.post(f"/api/v1/matches/{match_id}/finalize-selection")
+    assert response.status_code == 200
+
+    response = await client.get(f"/api/v1/matches/{match_id}/participation")
+    [participation] = response.json()
+    assert participation["status"] == "withdrawn"
+
+
+@pytest.mark.asyncio
+async def test_club_selection_stats(
+    client: AsyncClient, seed_lifecycle_data, db_session: AsyncSession
+):
+    from datetime import datetime, timezone
+
+    from app.models.selection_withdrawal import SelectionWithdrawal
+
+    match = seed_lifecycle_data["match"]
+    withdrawn = seed_lifecycle_data["players"][1]
+    db_session.add(
+        SelectionWithdrawal(
+            match_id=match.id,
+            player_id=withdrawn.id,
+            match_time=datetime.now(timezone.utc),
+            is_late=True,
+        )
+    )
+    await db_session.flush()
+
+    response = await client.get(f"/api/v1/clubs/{TEST_CLUB_ID}/players/selection-stats")
+    assert response.status_code == 200
+    stats = {s["player_id"]: s for s in response.json()}
+    assert len(stats) == 3
+
+    selected = stats[str(seed_lifecycle_data["players"][0].id)]
+    assert selected["matches_available"] == 1
+    assert selected["matches_selected"] == 1
+    assert selected["selection_rate"] == 100.0
+    assert stats[str(withdrawn.id)]["late_withdrawals"] == 1
@@ -0,0 +1,351 @@
+import asyncio
+import hashlib
+import io
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import delete, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.config import get_settings
+from app.core.task_queue import enqueue
+from app.integrations.imaging import DERIVATIVE_SPECS, pick_derivative, render_derivatives
+from app.integrations.storage import LocalStorage
+from app.models.club import Club
+from app.models.media_item import MediaItem
+from app.models.media_tag import MediaTag
+from app.models.task import Task
+from app.services.media_derivative_service import (
+    DERIVATIVES_TASK_KIND,
+    MediaDerivativeService,
+    derivative_key,
+)
+from app.services.media_service import media_item_tags
+from app.services.media_upload_service import content_key
+from app.tasks import MEDIA_TASK_KINDS, create_worker
+from tests.conftest import TEST_CLUB_ID
+
+
+@pytest.fixture
+async def seed_media(db_session: AsyncSession):
+    db_session.add(Club(id=TEST_CLUB_ID, name="Test CC", slug="test-cc-media"))
+    now = datetime.now(timezone.utc)
+    items = [
+        MediaItem(
+            id=uuid.uuid4(),
+            club_id=TEST_CLUB_ID,
+            title=f"Photo {i}",
+            url=f"https://example.com/{i}.jpg",
+            created_at=now - timedelta(minutes=i),
+        )
+        for i in range(3)
+    ]
+    tags = [MediaTag(id=uuid.uuid4(), club_id=TEST_CLUB_ID, name=n) for n in ("nets", "final")]
+    db_session.add_all(items + tags)
+    await db_session.flush()
+    nets, final = tags
+    await db_session.execute(
+        insert(media_item_tags),
+        [
+            {"media_item_id": items[0].id, "media_tag_id": nets.id},
+            {"media_item_id": items[0].id, "media_tag_id": final.id},
+            {"media_item_id": items[2].id, "media_tag_id": nets.id},
+        ],
+    )
+    return {"items": items, "nets": nets}
+
+
+@pytest.mark.asyncio
+async def test_items_keyset_page_with_tags(client: AsyncClient, seed_media):
+    url = f"/api/v1/clubs/{TEST_CLUB_ID}/media/items"
+
+    response = await client.get(url, params={"limit": 2})
+    assert response.status_code == 200
+    page = response.json()
+    assert [(i["title"], i["tags"]) for i in page] == [
+        ("Photo 0", ["final", "nets"]),
+        ("Photo 1", []),
+    ]
+
+    response = await client.get(
+        url, params={"limit": 2, "cursor": response.headers["X-Next-Cursor"]}
+    )
+    assert [i["title"] for i in response.json()] == ["Photo 2"]
+    assert "X-Next-Cursor" not in response.headers
+
+
+@pytest.mark.asyncio
+async def test_items_filtered_by_tag(client: AsyncClient, seed_media):
+    url = f"/api/v1/clubs/{TEST_CLUB_ID}/media/items"
+    response = await client.get(url, params={"tag_id": str(seed_media["nets"].id)})
+    assert [i["title"] for i in response.json()] == ["Photo 0", "Photo 2"]
+
+    item_id = seed_media["items"][0].id
+    response = await client.get(f"/api/v1/media/items/{item_id}/")
+    assert response.json()["tags"] == ["final", "nets"]
+
+
+@pytest.mark.asyncio
+async def test_summary_counts(client: AsyncClient, seed_media):
+    response = await client.get(f"/api/v1/clubs/{TEST_CLUB_ID}/media/summary")
+    assert response.status_code == 200
+    assert response.json() == {"total_galleries": 0, "total_items": 3, "total_tags": 2}
+
+
+@pytest.fixture
+def media_storage(tmp_path, monkeypatch):
+    monkeypatch.setattr(get_settings(), "media_storage_path", str(tmp_path))
+    return tmp_path
+
+
+async def _upload(client: AsyncClient, data: bytes, chunk_size: int) -> dict:
+    response = await client.post(
+        f"/api/v1/clubs/{TEST_CLUB_ID}/media/uploads",
+        json={"filename": "team.jpg", "content_type": "image/jpeg", "total_bytes": len(data)},
+    )
+    assert response.status_code == 201
+    url = f"/api/v1/media/uploads/{response.json()['id']}/"
+    for offset in range(0, len(data), chunk_size):
+        response = await client.patch(
+            url,
+            content=data[offset : offset + chunk_size],
+            headers={"Upload-Offset": str(offset)},
+        )
+        assert response.status_code == 200
+    return response.json()
+
+
+@pytest.mark.asyncio
+async def test_resumable_upload_creates_item(client: AsyncClient, seed_media, media_storage):
+    data = b"\xff\xd8" + b"pixels" * 1000
+    response = await client.post(
+        f"/api/v1/clubs/{TEST_CLUB_ID}/media/uploads",
+        json={"filename": "team.jpg", "content_type": "image/jpeg", "total_bytes": len(data)},
+    )
+    url = f"/api/v1/media/uploads/{response.json()['id']}/"
+
+    response = await client.patch(url, content=data[:4000], headers={"Upload-Offset": "0"})
+    assert response.json()["received_bytes"] == 4000
+    assert response.json()["media_item"] is None
+
+    # A retried chunk at a stale offset is refused; the client resumes from GET
+    response = await client.patch(url, content=data[:4000], headers={"Upload-Offset": "0"})
+    assert response.status_code == 409
+    offset = int((await client.get(url)).headers["Upload-Offset"])
+    assert offset == 4000
+
+    response = await client.patch(url, content=data[offset:], headers={"Upload-Offset": "4000"})
+    upload = response.json()
+    assert upload["status"] == "completed"
+    item = upload["media_item"]
+    assert item["title"] == "team.jpg"
+    assert item["size_bytes"] == len(data)
+    content_hash = hashlib.sha256(data).hexdigest()
+    assert item["url"] == f"/media/objects/{content_hash[:2]}/{content_hash}"
+    assert (media_storage / "objects" / content_hash[:2] / content_hash).read_bytes() == data
+
+
+@pytest.mark.asyncio
+async def test_upload_restarts_when_staged_bytes_are_gone(
+    client: AsyncClient, seed_media, media_storage
+):
+    data = b"\xff\xd8" + b"pixels" * 1000
+    response = await client.post(
+        f"/api/v1/clubs/{TEST_CLUB_ID}/media/uploads",
+        json={"filename": "team.jpg", "content_type": "image/jpeg", "total_bytes": len(data)},
+    )
+    upload_id = response.json()["id"]
+    url = f"/api/v1/media/uploads/{upload_id}/"
+    await client.patch(url, content=data[:4000], headers={"Upload-Offset": "0"})
+
+    # As after a completion whose commit failed once the file had been moved
+    (media_storage / "uploads" / upload_id).unlink()
+    response = await client.patch(url, content=data[4000:], headers={"Upload-Offset": "4000"})
+    assert response.status_code == 409
+    assert response.json()["detail"] == "Upload offset is 0"
+    assert (await client.get(url)).headers["Upload-Offset"] == "0"
+
+    response = await client.patch(url, content=data, headers={"Upload-Offset": "0"})
+    assert response.json()["status"] == "completed"
+    content_hash = hashlib.sha256(data).hexdigest()
+    assert (media_storage / content_key(content_hash)).read_bytes() == data
+
+
+@pytest.mark.asyncio
+async def test_identical_uploads_share_storage(client: AsyncClient, seed_media, media_storage):
+    data = b"same photo" * 100
+    first = await _upload(client, data, chunk_size=300)
+    second = await _upload(client, data, chunk_size=len(data))
+
+    assert first["media_item"]["id"] != second["media_item"]["id"]
+    assert first["media_item"]["url"] == second["media_item"]["url"]
+    assert [p.name for p in (media_storage / "uploads").iterdir()] == []
+
+
+@pytest.mark.asyncio
+async def test_upload_rejects_extra_bytes(client: AsyncClient, seed_media, media_storage):
+    response = await client.post(
+        f"/api/v1/clubs/{TEST_CLUB_ID}/media/uploads",
+        json={"filename": "clip.mp4", "content_type": "video/mp4", "total_bytes": 10},
+    )
+    url = f"/api/v1/media/uploads/{response.json()['id']}/"
+    response = await client.patch(url, content=b"x" * 11, headers={"Upload-Offset": "0"})
+    assert response.status_code == 400
+
+
+def test_pick_derivative_smallest_wide_enough():
+    derivatives = {spec.name: f"/{spec.name}.webp" for spec in DERIVATIVE_SPECS}
+    assert pick_derivative(derivatives, 200) == "/thumb.webp"
+    assert pick_derivative(derivatives, 641) == "/medium.webp"
+    assert pick_derivative(derivatives, 5000) == "/large.webp"
+    assert pick_derivative(derivatives, None) is None
+    assert pick_derivative(None, 200) is None
+
+
+def _png(width: int, height: int) -> bytes:
+    image = pytest.importorskip("PIL.Image")
+    out = io.BytesIO()
+    image.new("RGB", (width, height), "green").save(out, "PNG")
+    return out.getvalue()
+
+
+def test_render_derivatives_never_upscales():
+    rendered = render_derivatives(_png(1000, 500), DERIVATIVE_SPECS)
+
+    image = pytest.importorskip("PIL.Image")
+    sizes = {name: image.open(io.BytesIO(data)).size for name, data in rendered.items()}
+    assert sizes == {
+        "thumb": (320, 160),
+        "small": (640, 320),
+        "medium": (1000, 500),
+        "large": (1000, 500),
+    }
+
+
+@pytest.mark.asyncio
+async def test_duplicate_upload_reuses_derivatives(
+    client: AsyncClient, db_session: AsyncSession, seed_media, media_storage
+):
+    data = _png(800, 600)
+    first = (await _upload(client, data, chunk_size=len(data)))["media_item"]
+    content_hash = hashlib.sha256(data).hexdigest()
+    tasks = select(Task).where(Task.kind == DERIVATIVES_TASK_KIND)
+    assert [t.payload for t in (await db_session.execute(tasks)).scalars()] == [
+        {"content_hash": content_hash}
+    ]
+
+    result = await MediaDerivativeService(db_session).generate(
+        content_hash, content_key(content_hash)
+    )
+    assert result == {"items": 1, "cached": False}
+
+    second = (await _upload(client, data, chunk_size=len(data)))["media_item"]
+    assert set(second["derivatives"]) == {spec.name for spec in DERIVATIVE_SPECS}
+    assert second["thumbnail_url"] == second["derivatives"]["thumb"]
+    assert len((await db_session.execute(tasks)).scalars().all()) == 1
+
+    response = await client.get(f"/api/v1/clubs/{TEST_CLUB_ID}/media/items?width=600")
+    by_id = {i["id"]: i for i in response.json()}
+    assert by_id[first["id"]]["display_url"] == second["derivatives"]["small"]
+    assert by_id[str(seed_media["items"][0].id)]["display_url"] == "https://example.com/0.jpg"
+
+
+class _FailingStorage(LocalStorage):
+    """Writes half of every object, then fails like a worker killed mid-write."""
+
+    async def write_at(self, key, offset, chunks):
+        data = b"".join([chunk async for chunk in chunks])
+
+        async def half():
+            yield data[: len(data) // 2]
+
+        await super().write_at(key, offset, half())
+        raise OSError("worker killed")
+
+
+@pytest.mark.asyncio
+async def test_interrupted_render_is_not_cached(db_session: AsyncSession, media_storage):
+    data = _png(800, 600)
+    content_hash = hashlib.sha256(data).hexdigest()
+    source = media_storage / content_key(content_hash)
+    source.parent.mkdir(parents=True)
+    source.write_bytes(data)
+
+    failing = _FailingStorage(media_storage, "/media")
+    with pytest.raises(OSError):
+        await MediaDerivativeService(db_session, failing).generate(
+            content_hash, content_key(content_hash)
+        )
+    for spec in DERIVATIVE_SPECS:
+        assert not (media_storage / derivative_key(content_hash, spec.name)).exists()
+
+    result = await MediaDerivativeService(db_session).generate(
+        content_hash, content_key(content_hash)
+    )
+    assert result == {"items": 0, "cached": False}
+
+
+@pytest.mark.asyncio
+async def test_worker_renders_derivatives_from_media_storage(
+    setup_database, media_storage, monkeypatch
+):
+    # The worker commits in its own sessions, so seed committed rows and clean up after
+    monkeypatch.setattr(get_settings(), "task_poll_interval", 0.05)
+    session_factory = async_sessionmaker(
+        setup_database, class_=AsyncSession, expire_on_commit=False
+    )
+    data = _png(800, 600)
+    content_hash = hashlib.sha256(data).hexdigest()
+    source = media_storage / content_key(content_hash)
+    source.parent.mkdir(parents=True)
+    source.write_bytes(data)
+
+    club_id = uuid.uuid4()
+    async with session_factory() as db:
+        db.add(Club(id=club_id, name="Derivatives CC", slug=f"derivatives-{club_id}"))
+        item = MediaItem(
+            club_id=club_id, url="/media/team.png", content_hash=content_hash, media_type="image"
+        )
+        db.add(item)
+        await db.flush()
+        rendered = await enqueue(
+            db, DERIVATIVES_TASK_KIND, {"content_hash": content_hash}, club_id=club_id
+        )
+        # Not in storage: retrying cannot help, so the task fails on its first attempt
+        missing = await enqueue(
+            db, DERIVATIVES_TASK_KIND, {"content_hash": "0" * 64}, club_id=club_id
+        )
+        await db.commit()
+
+    async def finished_tasks() -> dict[uuid.UUID, Task]:
+        async with session_factory() as db:
+            tasks = (await db.scalars(select(Task).where(Task.club_id == club_id))).all()
+        return {t.id: t for t in tasks} if all(t.finished_at for t in tasks) else {}
+
+    worker = create_worker(session_factory, kinds=MEDIA_TASK_KINDS, concurrency=2)
+    await worker.start()
+    try:
+        for _ in range(600):
+            if tasks := await finished_tasks():
+                break
+            await asyncio.sleep(0.05)
+        async with session_factory() as db:
+            derivatives = await db.scalar(
+                select(MediaItem.derivatives).where(MediaItem.id == item.id)
+            )
+    finally:
+        await worker.stop()
+        async with session_factory() as db:
+            await db.execute(delete(Task).where(Task.club_id == club_id))
+            await db.execute(delete(MediaItem).where(MediaItem.club_id == club_id))
+            await db.execute(delete(Club).where(Club.id == club_id))
+            await db.commit()
+
+    assert tasks[rendered.id].status == "succeeded"
+    assert tasks[missing.id].status == "failed"
+    assert tasks[missing.id].attempts == 1
+    assert set(derivatives) == {spec.name for spec in DERIVATIVE_SPECS}
+    for url in derivatives.values():
+        assert (media_storage / url.removeprefix("/media/")).is_file()
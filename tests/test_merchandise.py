@@ -0,0 +1,234 @@
+import asyncio
+import uuid
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import delete, func, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.exceptions import ConflictError
+from app.models.club import Club
+from app.models.merchandise_item import MerchandiseItem
+from app.models.merchandise_order import MerchandiseOrder
+from app.models.merchandise_order_item import MerchandiseOrderItem
+from app.models.merchandise_variant import MerchandiseVariant
+from app.services.merchandise_service import MerchOrderService
+from tests.conftest import TEST_CLUB_ID, TEST_USER_ID
+
+
+@pytest.fixture
+async def seed_merch(db_session: AsyncSession):
+    db_session.add(Club(id=TEST_CLUB_ID, name="Test CC", slug="test-cc-merch"))
+    item = MerchandiseItem(
+        id=uuid.uuid4(),
+        club_id=TEST_CLUB_ID,
+        name="Training shirt",
+        base_price=Decimal("20.00"),
+        stock_quantity=3,
+    )
+    cap = MerchandiseItem(
+        id=uuid.uuid4(), club_id=TEST_CLUB_ID, name="Cap", base_price=Decimal("8.00")
+    )
+    db_session.add_all([item, cap])
+    await db_session.flush()
+    variant = MerchandiseVariant(
+        id=uuid.uuid4(),
+        item_id=item.id,
+        name="XL",
+        price_adjustment=Decimal("2.00"),
+        stock_quantity=2,
+    )
+    db_session.add(variant)
+    await db_session.flush()
+    return {"item": item, "variant": variant, "cap": cap}
+
+
+async def _stock(db: AsyncSession, model, row_id: uuid.UUID) -> int:
+    return await db.scalar(select(model.stock_quantity).where(model.id == row_id))
+
+
+@pytest.mark.asyncio
+async def test_order_reserves_and_cancel_releases_stock(
+    client: AsyncClient, db_session: AsyncSession, seed_merch
+):
+    item, variant = seed_merch["item"], seed_merch["variant"]
+    response = await client.post(
+        f"/api/v1/clubs/{TEST_CLUB_ID}/merchandise/orders",
+        json={
+            "items": [
+                {"item_id": str(item.id), "quantity": 2},
+                {"item_id": str(item.id), "variant_id": str(variant.id), "quantity": 2},
+            ]
+        },
+    )
+    assert response.status_code == 201
+    order = response.json()
+    assert Decimal(order["total_amount"]) == Decimal("84.00")
+    assert sorted(i["variant_name"] or "" for i in order["items"]) == ["", "XL"]
+    assert await _stock(db_session, MerchandiseItem, item.id) == 1
+    assert await _stock(db_session, MerchandiseVariant, variant.id) == 0
+
+    response = await client.post(f"/api/v1/merchandise/orders/{order['id']}/cancel")
+    assert response.json()["status"] == "cancelled"
+    assert await _stock(db_session, MerchandiseItem, item.id) == 3
+    assert await _stock(db_session, MerchandiseVariant, variant.id) == 2
+
+    # Cancelling again must not restock twice
+    await client.post(f"/api/v1/merchandise/orders/{order['id']}/cancel")
+    assert await _stock(db_session, MerchandiseItem, item.id) == 3
+
+
+@pytest.mark.asyncio
+async def test_order_short_of_stock_changes_nothing(
+    client: AsyncClient, db_session: AsyncSession, seed_merch
+):
+    item, variant = seed_merch["item"], seed_merch["variant"]
+    response = await client.post(
+        f"/api/v1/clubs/{TEST_CLUB_ID}/merchandise/orders",
+        json={
+            "items": [
+                {"item_id": str(item.id), "quantity": 1},
+                {"item_id": str(item.id), "variant_id": str(variant.id), "quantity": 3},
+            ]
+        },
+    )
+    assert response.status_code == 409
+    assert "Training shirt (XL)" in response.json()["detail"]
+    assert await _stock(db_session, MerchandiseItem, item.id) == 3
+    orders = await db_session.scalars(
+        select(MerchandiseOrder).where(MerchandiseOrder.club_id == TEST_CLUB_ID)
+    )
+    assert orders.all() == []
+
+
+@pytest.mark.asyncio
+async def test_order_rejects_variant_of_another_item(client: AsyncClient, seed_merch):
+    response = await client.post(
+        f"/api/v1/clubs/{TEST_CLUB_ID}/merchandise/orders",
+        json={
+            "items": [
+                {
+                    "item_id": str(seed_merch["cap"].id),
+                    "variant_id": str(seed_merch["variant"].id),
+                    "quantity": 1,
+                }
+            ]
+        },
+    )
+    assert response.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_orders_keyset_page_with_items_and_filters(
+    client: AsyncClient, db_session: AsyncSession, seed_merch
+):
+    now = datetime.now(timezone.utc)
+    statuses = ["pending", "confirmed", "pending", "collected", "pending"]
+    orders = [
+        MerchandiseOrder(
+            id=uuid.uuid4(),
+            club_id=TEST_CLUB_ID,
+            user_id=TEST_USER_ID,
+            status=status,
+            total_amount=Decimal("20.00") * (i + 1),
+            created_at=now - timedelta(days=i),
+        )
+        for i, status in enumerate(statuses)
+    ]
+    db_session.add_all(orders)
+    await db_session.flush()
+    db_session.add_all(
+        MerchandiseOrderItem(
+            order_id=order.id,
+            item_id=seed_merch["item"].id,
+            quantity=i + 1,
+            unit_price=Decimal("20.00"),
+            item_name="Training shirt",
+        )
+        for i, order in enumerate(orders)
+    )
+    await db_session.flush()
+    url = f"/api/v1/clubs/{TEST_CLUB_ID}/merchandise/orders"
+
+    response = await client.get(url, params={"limit": 3})
+    page = response.json()
+    assert [o["id"] for o in page] == [str(o.id) for o in orders[:3]]
+    assert [o["items"][0]["quantity"] for o in page] == [1, 2, 3]
+    response = await client.get(
+        url, params={"limit": 3, "cursor": response.headers["X-Next-Cursor"]}
+    )
+    assert [o["id"] for o in response.json()] == [str(o.id) for o in orders[3:]]
+    assert "X-Next-Cursor" not in response.headers
+
+    response = await client.get(url, params={"status": "pending"})
+    assert [o["id"] for o in response.json()] == [str(orders[i].id) for i in (0, 2, 4)]
+
+    created_from = (now - timedelta(days=3, hours=12)).isoformat()
+    created_to = (now - timedelta(hours=12)).isoformat()
+    response = await client.get(
+        url, params={"status": "pending", "created_from": created_from, "created_to": created_to}
+    )
+    assert [o["id"] for o in response.json()] == [str(orders[2].id)]
+
+
+@pytest.fixture
+async def committed_stock(setup_database):
+    # Concurrent orders need their own committed transactions; clean up after
+    session_factory = async_sessionmaker(
+        setup_database, class_=AsyncSession, expire_on_commit=False
+    )
+    club_id = uuid.uuid4()
+    async with session_factory() as db:
+        db.add(Club(id=club_id, name="Stock CC", slug=f"stock-{club_id}"))
+        item = MerchandiseItem(
+            id=uuid.uuid4(),
+            club_id=club_id,
+            name="Match shirt",
+            base_price=Decimal("30.00"),
+            stock_quantity=25,
+        )
+        db.add(item)
+        await db.flush()
+        variant = MerchandiseVariant(
+            id=uuid.uuid4(), item_id=item.id, name="M", stock_quantity=15
+        )
+        db.add(variant)
+        await db.commit()
+    yield session_factory, club_id, item, variant
+    async with session_factory() as db:
+        await db.execute(delete(MerchandiseOrder).where(MerchandiseOrder.club_id == club_id))
+        await db.execute(delete(MerchandiseItem).where(MerchandiseItem.club_id == club_id))
+        await db.execute(delete(Club).where(Club.id == club_id))
+        await db.commit()
+
+
+@pytest.mark.asyncio
+async def test_parallel_orders_never_oversell(committed_stock):
+    session_factory, club_id, item, variant = committed_stock
+
+    async def place(n: int) -> bool:
+        # Every other order wants both the item and the variant, in either order
+        lines = [{"item_id": item.id, "variant_id": variant.id, "quantity": 1}]
+        if n % 2:
+            lines.insert(n % 4 // 2, {"item_id": item.id, "variant_id": None, "quantity": 1})
+        async with session_factory() as db:
+            try:
+                await MerchOrderService(db, club_id).create_order(TEST_USER_ID, lines, None)
+            except ConflictError:
+                await db.rollback()
+                return False
+            await db.commit()
+            return True
+
+    placed = await asyncio.gather(*(place(n) for n in range(300)))
+
+    async with session_factory() as db:
+        assert await _stock(db, MerchandiseVariant, variant.id) == 0
+        item_stock = await _stock(db, MerchandiseItem, item.id)
+        orders = await db.scalar(
+            select(func.count()).where(MerchandiseOrder.club_id == club_id)
+        )
+    assert sum(placed) == orders == 15
+    assert item_stock == 25 - sum(1 for n, ok in enumerate(placed) if ok and n % 2)
@@ -0,0 +1,165 @@
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.read_cursors import ReadCursorBuffer
+from app.models.channel import Channel
+from app.models.club import Club
+from app.models.message import Message
+from app.models.message_reaction import MessageReaction
+from app.models.profile import Profile
+from app.services.messaging_service import MessagingService
+from tests.conftest import TEST_CLUB_ID, TEST_USER_ID
+
+
+@pytest.fixture
+async def seed_channel(db_session: AsyncSession):
+    db_session.add(Club(id=TEST_CLUB_ID, name="Test CC", slug="test-cc-messaging"))
+    sender = Profile(id=uuid.uuid4(), email="sender@example.com", full_name="Sam Sender")
+    channel = Channel(id=uuid.uuid4(), club_id=TEST_CLUB_ID, name="General")
+    db_session.add_all([sender, channel])
+    await db_session.flush()
+
+    now = datetime.now(timezone.utc)
+    messages = [
+        Message(
+            id=uuid.uuid4(),
+            channel_id=channel.id,
+            sender_id=sender.id,
+            content=f"Message {i}",
+            created_at=now - timedelta(minutes=i),
+        )
+        for i in range(3)
+    ]
+    messages.append(
+        Message(channel_id=channel.id, content="Gone", is_deleted=True, created_at=now)
+    )
+    db_session.add_all(messages)
+    await db_session.flush()
+
+    other_user = uuid.uuid4()
+    db_session.add_all(
+        [
+            MessageReaction(message_id=messages[0].id, user_id=TEST_USER_ID, emoji="👍"),
+            MessageReaction(message_id=messages[0].id, user_id=other_user, emoji="👍"),
+            MessageReaction(message_id=messages[0].id, user_id=other_user, emoji="🏏"),
+        ]
+    )
+    await db_session.flush()
+    return channel
+
+
+@pytest.mark.asyncio
+async def test_messages_keyset_page_with_reactions(client: AsyncClient, seed_channel):
+    url = f"/api/v1/channels/{seed_channel.id}/messages"
+
+    response = await client.get(url, params={"limit": 2})
+    assert response.status_code == 200
+    page = response.json()
+    assert [m["content"] for m in page] == ["Message 0", "Message 1"]
+    assert page[0]["sender_name"] == "Sam Sender"
+    assert sorted(page[0]["reactions"], key=lambda r: r["emoji"]) == sorted(
+        [
+            {"emoji": "👍", "count": 2, "reacted_by_me": True},
+            {"emoji": "🏏", "count": 1, "reacted_by_me": False},
+        ],
+        key=lambda r: r["emoji"],
+    )
+    assert page[1]["reactions"] == []
+
+    cursor = response.headers["X-Next-Cursor"]
+    response = await client.get(url, params={"limit": 2, "cursor": cursor})
+    assert [m["content"] for m in response.json()] == ["Message 2"]
+    assert "X-Next-Cursor" not in response.headers
+
+
+@pytest.mark.asyncio
+async def test_poll_vote_counts_follow_votes(db_session: AsyncSession, seed_channel):
+    service = MessagingService(db_session, TEST_CLUB_ID)
+    poll = await service.create_poll(
+        seed_channel.id, TEST_USER_ID, "Nets on Tuesday?", [{"text": "Yes"}, {"text": "No"}]
+    )
+    yes, no = (opt["id"] for opt in poll["options"])
+    other_user = uuid.uuid4()
+
+    assert (await service.vote_on_poll(yes, TEST_USER_ID))["action"] == "added"
+    assert (await service.vote_on_poll(yes, other_user))["action"] == "added"
+    # Single choice: voting "No" moves the vote off "Yes"
+    assert (await service.vote_on_poll(no, TEST_USER_ID))["action"] == "added"
+
+    [listed] = await service.get_polls(TEST_USER_ID)
+    counts = {opt["text"]: (opt["vote_count"], opt["voted_by_me"]) for opt in listed["options"]}
+    assert counts == {"Yes": (1, False), "No": (1, True)}
+
+    assert (await service.vote_on_poll(no, TEST_USER_ID))["action"] == "removed"
+    [listed] = await service.get_polls(TEST_USER_ID)
+    assert [opt["vote_count"] for opt in listed["options"]] == [1, 0]
+
+
+@pytest.mark.asyncio
+async def test_polls_keyset_page(client: AsyncClient, db_session: AsyncSession, seed_channel):
+    service = MessagingService(db_session, TEST_CLUB_ID)
+    for question in ("First", "Second", "Third"):
+        await service.create_poll(seed_channel.id, TEST_USER_ID, question, [{"text": "Yes"}])
+
+    url = f"/api/v1/clubs/{TEST_CLUB_ID}/polls"
+    response = await client.get(url, params={"limit": 2})
+    assert response.status_code == 200
+    first_page = response.json()
+    assert len(first_page) == 2
+    assert all(len(poll["options"]) == 1 for poll in first_page)
+
+    cursor = response.headers["X-Next-Cursor"]
+    response = await client.get(url, params={"limit": 2, "cursor": cursor})
+    rest = response.json()
+    assert len(rest) == 1
+    assert "X-Next-Cursor" not in response.headers
+    seen = {poll["question"] for poll in first_page + rest}
+    assert seen == {"First", "Second", "Third"}
+
+
+@pytest.mark.asyncio
+async def test_read_cursor_unread_counts(client: AsyncClient, seed_channel):
+    unread_url = f"/api/v1/clubs/{TEST_CLUB_ID}/channels/unread"
+    read_url = f"/api/v1/channels/{seed_channel.id}/read"
+
+    response = await client.get(unread_url)
+    assert response.status_code == 200
+    assert response.json() == [
+        {"channel_id": str(seed_channel.id), "unread_count": 3, "last_read_message_id": None}
+    ]
+
+    newest, middle, oldest = (
+        m["id"] for m in (await client.get(f"/api/v1/channels/{seed_channel.id}/messages")).json()
+    )
+    assert (await client.put(read_url, json={"message_id": middle})).status_code == 204
+    # Reported out of order while scrolling: the cursor does not move back
+    assert (await client.put(read_url, json={"message_id": oldest})).status_code == 204
+
+    [counts] = (await client.get(unread_url)).json()
+    assert counts["unread_count"] == 1
+    assert counts["last_read_message_id"] == middle
+
+    await client.put(read_url, json={"message_id": newest})
+    [counts] = (await client.get(unread_url)).json()
+    assert counts["unread_count"] == 0
+
+    response = await client.put(read_url, json={"message_id": str(uuid.uuid4())})
+    assert response.status_code == 404
+
+
+def test_read_cursor_buffer_keeps_furthest_position():
+    buffer = ReadCursorBuffer(flush_seconds=60)
+    channel_id = uuid.uuid4()
+    now = datetime.now(timezone.utc)
+    ids = [uuid.uuid4() for _ in range(3)]
+
+    buffer.record(TEST_USER_ID, channel_id, now, ids[0])
+    buffer.record(TEST_USER_ID, channel_id, now + timedelta(seconds=1), ids[1])
+    buffer.record(TEST_USER_ID, channel_id, now - timedelta(seconds=1), ids[2])
+
+    assert buffer.pending_count == 1
+    assert buffer._pending[(TEST_USER_ID, channel_id)] == (now + timedelta(seconds=1), ids[1])
@@ -0,0 +1,193 @@
+import json
+import uuid
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from starlette.websockets import WebSocketDisconnect
+
+from app.api.v1 import messaging
+from app.core.channel_hub import ChannelConnection, ChannelHub
+from app.core.exceptions import ForbiddenError
+from app.main import create_app
+from app.models.channel import Channel
+from app.models.club import Club
+from app.models.message import Message
+from app.services.messaging_socket_service import CLOSE_TRY_AGAIN_LATER, MessagingSocketService
+from tests.conftest import TEST_CLUB_ID, TEST_USER_ID, make_test_user
+
+
+class FakeWebSocket:
+    """Feeds ``frames`` to the service; ``accept`` can fail like a dropped handshake."""
+
+    headers: dict[str, str] = {}
+
+    def __init__(self, frames: list[str] = (), accept_error: Exception | None = None):
+        self.frames = frames
+        self.accept_error = accept_error
+
+    async def accept(self) -> None:
+        if self.accept_error:
+            raise self.accept_error
+
+    async def iter_text(self):
+        for frame in self.frames:
+            yield frame
+
+    async def send_json(self, data: dict) -> None:
+        pass
+
+    async def close(self, code: int = 1000, reason: str | None = None) -> None:
+        pass
+
+
+def make_service(
+    websocket=None, session_factory=None
+) -> tuple[MessagingSocketService, ChannelHub, ChannelConnection]:
+    hub = ChannelHub(max_connections=10)
+    user = make_test_user(role="player")
+    connection = ChannelConnection(user.user_id, websocket.send_json if websocket else None)
+    hub.connect(connection)
+    service = MessagingSocketService(websocket, user, connection, hub, session_factory)
+    return service, hub, connection
+
+
+@pytest.mark.asyncio
+async def test_malformed_frames_get_error_replies():
+    websocket = FakeWebSocket(
+        [
+            "not json",
+            json.dumps({"type": "subscribe"}),
+            json.dumps({"type": "subscribe", "channel_id": "not-a-uuid"}),
+            json.dumps({"type": "shout"}),
+            json.dumps({"type": "ping"}),
+        ]
+    )
+    service, _, connection = make_service(websocket)
+    await service._read()
+
+    replies = [connection.queue.get_nowait() for _ in range(connection.queue.qsize())]
+    assert replies == [
+        {"type": "error", "detail": "Malformed frame"},
+        {"type": "error", "detail": "Malformed frame"},
+        {"type": "error", "detail": "Malformed frame"},
+        {"type": "error", "detail": "Unknown frame type 'shout'"},
+        {"type": "pong"},
+    ]
+
+
+@pytest.fixture
+async def committed_channels(setup_database):
+    # Sending commits in the service's own session; clean up after
+    session_factory = async_sessionmaker(
+        setup_database, class_=AsyncSession, expire_on_commit=False
+    )
+    other_club_id = uuid.uuid4()
+    async with session_factory() as db:
+        db.add_all(
+            [
+                Club(id=TEST_CLUB_ID, name="Test CC", slug="test-cc-socket"),
+                Club(id=other_club_id, name="Other CC", slug=f"other-{other_club_id}"),
+            ]
+        )
+        channel = Channel(id=uuid.uuid4(), club_id=TEST_CLUB_ID, name="General")
+        other_channel = Channel(id=uuid.uuid4(), club_id=other_club_id, name="General")
+        db.add_all([channel, other_channel])
+        await db.commit()
+    yield session_factory, channel, other_channel
+    async with session_factory() as db:
+        channel_ids = [channel.id, other_channel.id]
+        await db.execute(delete(Message).where(Message.channel_id.in_(channel_ids)))
+        await db.execute(delete(Channel).where(Channel.id.in_(channel_ids)))
+        await db.execute(delete(Club).where(Club.id.in_([TEST_CLUB_ID, other_club_id])))
+        await db.commit()
+
+
+@pytest.mark.asyncio
+async def test_subscribe_only_to_channels_of_the_users_clubs(committed_channels):
+    session_factory, channel, other_channel = committed_channels
+    service, hub, connection = make_service(session_factory=session_factory)
+
+    reply = await service.handle({"type": "subscribe", "channel_id": str(channel.id)})
+    assert reply == {"type": "subscribed", "channel_id": str(channel.id)}
+    assert connection.channels == {channel.id}
+
+    with pytest.raises(ForbiddenError):
+        await service.handle({"type": "subscribe", "channel_id": str(other_channel.id)})
+    with pytest.raises(ForbiddenError, match="Channel not found"):
+        await service.handle({"type": "subscribe", "channel_id": str(uuid.uuid4())})
+    assert connection.channels == {channel.id}
+
+    await service.handle({"type": "unsubscribe", "channel_id": str(channel.id)})
+    assert connection.channels == set()
+
+
+@pytest.mark.asyncio
+async def test_send_persists_and_acks(committed_channels):
+    session_factory, channel, _ = committed_channels
+    service, _, _ = make_service(session_factory=session_factory)
+
+    frame = {"type": "send", "channel_id": str(channel.id), "content": "Nets", "client_id": "c1"}
+    reply = await service.handle(frame)
+    assert reply["type"] == "ack"
+    assert reply["client_id"] == "c1"
+    async with session_factory() as db:
+        message = await db.get(Message, uuid.UUID(reply["message_id"]))
+    assert message.content == "Nets"
+    assert message.channel_id == channel.id
+
+    reply = await service.handle({"type": "send", "channel_id": str(channel.id), "content": " "})
+    assert reply == {"type": "error", "detail": "Message content is required"}
+    async with session_factory() as db:
+        stored = await db.scalars(select(Message.id).where(Message.channel_id == channel.id))
+    assert len(stored.all()) == 1
+
+
+@pytest.fixture
+def socket_client(monkeypatch):
+    # No lifespan: these tests never reach the database
+    async def authenticate(authorization: str, db) -> object:
+        if authorization != "Bearer good":
+            from app.core.exceptions import AuthenticationError
+
+            raise AuthenticationError("Invalid token")
+        return make_test_user()
+
+    hub = ChannelHub(max_connections=1)
+    monkeypatch.setattr(messaging, "get_current_user", authenticate)
+    monkeypatch.setattr(messaging, "channel_hub", hub)
+    return TestClient(create_app()), hub
+
+
+def test_socket_rejects_missing_token(socket_client):
+    client, _ = socket_client
+    with pytest.raises(WebSocketDisconnect) as exc_info:
+        with client.websocket_connect("/api/v1/ws/messaging"):
+            pass
+    assert exc_info.value.code == 1008
+
+
+def test_socket_refused_over_the_connection_limit(socket_client):
+    client, hub = socket_client
+    hub.connect(ChannelConnection(TEST_USER_ID, None))
+    with pytest.raises(WebSocketDisconnect) as exc_info:
+        with client.websocket_connect("/api/v1/ws/messaging?token=good"):
+            pass
+    assert exc_info.value.code == CLOSE_TRY_AGAIN_LATER
+
+
+@pytest.mark.asyncio
+async def test_socket_frees_its_slot_when_the_client_leaves(socket_client):
+    _, hub = socket_client
+    await messaging.messaging_socket(FakeWebSocket([json.dumps({"type": "ping"})]), token="good")
+    assert hub.connection_count == 0
+
+
+@pytest.mark.asyncio
+async def test_socket_dropped_during_handshake_frees_its_slot(socket_client):
+    _, hub = socket_client
+    websocket = FakeWebSocket(accept_error=WebSocketDisconnect(1006))
+    with pytest.raises(WebSocketDisconnect):
+        await messaging.messaging_socket(websocket, token="good")
+    assert hub.connection_count == 0
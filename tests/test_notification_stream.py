@@ -0,0 +1,118 @@
+import asyncio
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.notification_broker import NotificationBroker
+from app.core.pagination import encode_cursor
+from app.core.pubsub import ConnectionLimitError
+from app.services.notification_service import NotificationService
+from app.services.notification_stream_service import NotificationStreamService
+from tests.conftest import TEST_CLUB_ID, TEST_USER_ID
+
+
+def session_factory(db_session: AsyncSession, opened: list | None = None):
+    @asynccontextmanager
+    async def factory():
+        if opened is not None:
+            opened.append(db_session)
+        yield db_session
+
+    return factory
+
+
+def test_broker_caps_connections_per_worker():
+    broker = NotificationBroker(max_connections=2)
+    first = broker.subscribe(TEST_USER_ID)
+    broker.subscribe(TEST_USER_ID)
+    with pytest.raises(ConnectionLimitError):
+        broker.subscribe(TEST_USER_ID)
+
+    first.close()
+    first.close()
+    assert broker.connection_count == 1
+    broker.subscribe(TEST_USER_ID)
+
+
+async def _create(db_session: AsyncSession, title: str, created_at: datetime):
+    # One transaction gives every row the same now(); set distinct times explicitly
+    notification = await NotificationService(db_session).create_notification(
+        TEST_CLUB_ID, TEST_USER_ID, "general", title
+    )
+    notification.created_at = created_at
+    await db_session.flush()
+    return notification
+
+
+@pytest.mark.asyncio
+async def test_stream_sends_new_notifications_and_counts(db_session: AsyncSession):
+    now = datetime.now(timezone.utc)
+    await _create(db_session, "Before", now - timedelta(seconds=10))
+
+    broker = NotificationBroker(max_connections=10)
+    stream = NotificationStreamService(
+        broker, TEST_USER_ID, session_factory(db_session), heartbeat=0.05
+    ).events()
+
+    assert await anext(stream) == "retry: 3000\n\n"
+    # Existing notifications are not replayed without a Last-Event-ID
+    count_event = await anext(stream)
+    assert count_event.startswith("event: unread_count")
+    assert '"count": 1' in count_event
+    assert await anext(stream) == ": heartbeat\n\n"
+
+    after = await _create(db_session, "After", now - timedelta(seconds=5))
+    broker.publish([TEST_USER_ID])
+    notification_event = await asyncio.wait_for(anext(stream), 1)
+    assert notification_event.startswith("event: notification\nid: ")
+    assert '"title":"After"' in notification_event
+    assert '"count": 2' in await anext(stream)
+
+    # Committed late by a transaction that started before "After" was created
+    await _create(db_session, "Late", now - timedelta(seconds=7))
+    broker.publish([TEST_USER_ID])
+    notification_event = await asyncio.wait_for(anext(stream), 1)
+    assert '"title":"Late"' in notification_event
+    # The event id stays at the newest key, so a resumed stream does not repeat "After"
+    assert f"id: {encode_cursor(after.created_at, after.id)}" in notification_event
+    assert '"count": 3' in await anext(stream)
+
+    await stream.aclose()
+    assert broker.connection_count == 0
+
+
+@pytest.mark.asyncio
+async def test_idle_stream_sends_heartbeats_without_queries(db_session: AsyncSession):
+    broker = NotificationBroker(max_connections=10)
+    opened = []
+    stream = NotificationStreamService(
+        broker, TEST_USER_ID, session_factory(db_session, opened), heartbeat=0.01
+    ).events()
+    # No slot is taken until the response starts streaming
+    assert broker.connection_count == 0
+
+    assert await anext(stream) == "retry: 3000\n\n"
+    assert broker.connection_count == 1
+    assert (await anext(stream)).startswith("event: unread_count")
+    sessions = len(opened)
+    for _ in range(5):
+        assert await anext(stream) == ": heartbeat\n\n"
+    assert len(opened) == sessions
+
+    broker.publish([TEST_USER_ID])
+    await anext(stream)
+    assert len(opened) == sessions + 1
+
+    await stream.aclose()
+    assert broker.connection_count == 0
+
+
+@pytest.mark.asyncio
+async def test_stream_started_on_a_full_server_asks_the_client_to_retry():
+    broker = NotificationBroker(max_connections=1)
+    broker.subscribe(TEST_USER_ID)
+    stream = NotificationStreamService(broker, TEST_USER_ID, heartbeat=0.01).events()
+    assert [event async for event in stream] == ["retry: 10000\n\n"]
+    assert broker.connection_count == 1
@@ -0,0 +1,271 @@
+import uuid
+from datetime import date, datetime, time, timedelta, timezone
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.club import Club
+from app.models.club_member import ClubMember
+from app.models.match import Match
+from app.models.match_availability import MatchAvailability
+from app.models.notification import Notification
+from app.models.notification_archive import NotificationArchive
+from app.models.notification_counter import NotificationCounter
+from app.models.payment import Payment
+from app.models.player import Player
+from app.models.profile import Profile
+from app.models.team_selection_config import TeamSelectionConfig
+from app.services.notification_service import NotificationService
+from tests.conftest import TEST_CLUB_ID, TEST_USER_ID
+
+
+@pytest.fixture
+async def seed_reminder_data(db_session: AsyncSession):
+    club = Club(id=TEST_CLUB_ID, name="Test CC", slug="test-cc-reminders")
+    db_session.add(club)
+    match = Match(
+        id=uuid.uuid4(),
+        club_id=TEST_CLUB_ID,
+        date=date.today() + timedelta(days=1),
+        time=time(13, 0),
+        opponent="Rival CC",
+        venue="Home",
+        type="League",
+        status="upcoming",
+    )
+    players = [
+        Player(
+            id=uuid.uuid4(),
+            club_id=TEST_CLUB_ID,
+            user_id=uuid.uuid4(),
+            name=f"Player {i}",
+            role="Batter",
+        )
+        for i in range(3)
+    ]
+    # No linked user, so never reminded
+    players.append(Player(id=uuid.uuid4(), club_id=TEST_CLUB_ID, name="Guest", role="Bowler"))
+    db_session.add_all([match, *players])
+    await db_session.flush()
+
+    db_session.add_all(
+        [
+            MatchAvailability(match_id=match.id, player_id=players[0].id, status="available"),
+            Payment(
+                club_id=TEST_CLUB_ID,
+                player_id=players[1].id,
+                type="match",
+                amount=12.5,
+                status="overdue",
+            ),
+        ]
+    )
+    await db_session.flush()
+    return {"match": match, "players": players}
+
+
+@pytest.mark.asyncio
+async def test_generate_reminders_is_idempotent(
+    client: AsyncClient, seed_reminder_data, db_session: AsyncSession
+):
+    response = await client.post("/api/v1/reminders/generate")
+    assert response.status_code == 200
+    assert response.json() == {"matchReminders": 2, "paymentReminders": 1}
+
+    response = await client.post("/api/v1/reminders/generate")
+    assert response.json() == {"matchReminders": 0, "paymentReminders": 0}
+
+    match = seed_reminder_data["match"]
+    result = await db_session.execute(
+        select(Notification.body, Notification.data).where(
+            Notification.dedupe_key == f"match_reminder:{match.id}"
+        )
+    )
+    rows = result.all()
+    assert len(rows) == 2
+    assert rows[0].body == f"Please set your availability for the match on {match.date}"
+    assert rows[0].data == {"match_id": str(match.id)}
+
+    total = await db_session.scalar(select(func.count()).select_from(Notification))
+    assert total == 3
+
+
+@pytest.mark.asyncio
+async def test_selection_deadline_alerts_reach_admins_once(db_session: AsyncSession):
+    db_session.add(Club(id=TEST_CLUB_ID, name="Test CC", slug="test-cc-deadlines"))
+    # Deadline 12 hours before a match 30 hours away: due within the day
+    starts_at = datetime.now(timezone.utc) + timedelta(hours=30)
+    match = Match(
+        id=uuid.uuid4(),
+        club_id=TEST_CLUB_ID,
+        date=starts_at.date(),
+        time=starts_at.time().replace(microsecond=0),
+        opponent="Rival CC",
+        venue="Home",
+        type="League",
+        status="upcoming",
+    )
+    # Still a week from its deadline, so not alerted yet
+    later = Match(
+        id=uuid.uuid4(),
+        club_id=TEST_CLUB_ID,
+        date=date.today() + timedelta(days=7),
+        time=time(13, 0),
+        opponent="Town CC",
+        venue="Away",
+        type="League",
+        status="upcoming",
+    )
+    profiles = [Profile(id=uuid.uuid4(), email=f"deadline-{i}@example.com") for i in range(3)]
+    db_session.add_all(
+        [
+            match,
+            later,
+            *profiles,
+            TeamSelectionConfig(club_id=TEST_CLUB_ID, selection_deadline_hours=12),
+        ]
+    )
+    await db_session.flush()
+    db_session.add_all(
+        [
+            ClubMember(user_id=profiles[0].id, club_id=TEST_CLUB_ID, role="clubadmin"),
+            ClubMember(user_id=profiles[1].id, club_id=TEST_CLUB_ID, role="secretary"),
+            ClubMember(user_id=profiles[2].id, club_id=TEST_CLUB_ID, role="player"),
+        ]
+    )
+    await db_session.flush()
+
+    service = NotificationService(db_session)
+    assert await service.generate_selection_deadline_alerts() == 2
+    assert await service.generate_selection_deadline_alerts() == 0
+
+    result = await db_session.execute(
+        select(Notification.user_id, Notification.type, Notification.data).where(
+            Notification.club_id == TEST_CLUB_ID
+        )
+    )
+    rows = result.all()
+    assert {row.user_id for row in rows} == {profiles[0].id, profiles[1].id}
+    assert {row.type for row in rows} == {"selection_deadline"}
+    assert {row.data["match_id"] for row in rows} == {str(match.id)}
+
+
+async def unread_count(client: AsyncClient, user_id) -> int:
+    response = await client.get(f"/api/v1/users/{user_id}/notifications/unread-count")
+    assert response.status_code == 200
+    return response.json()["count"]
+
+
+@pytest.mark.asyncio
+async def test_unread_counter_follows_creates_and_reads(
+    client: AsyncClient, db_session: AsyncSession
+):
+    service = NotificationService(db_session)
+    first = await service.create_notification(TEST_CLUB_ID, TEST_USER_ID, "general", "One")
+    await service.create_notification(TEST_CLUB_ID, TEST_USER_ID, "general", "Two")
+    await service.create_notification(TEST_CLUB_ID, TEST_USER_ID, "general", "Three")
+    assert await unread_count(client, TEST_USER_ID) == 3
+
+    response = await client.post(f"/api/v1/notifications/{first.id}/mark-read")
+    assert response.json() == {"success": True}
+    # Marking an already-read notification does not count twice
+    await client.post(f"/api/v1/notifications/{first.id}/mark-read")
+    assert await unread_count(client, TEST_USER_ID) == 2
+
+    await client.post(f"/api/v1/users/{TEST_USER_ID}/notifications/mark-all-read")
+    assert await unread_count(client, TEST_USER_ID) == 0
+
+
+@pytest.mark.asyncio
+async def test_reminders_bump_counters_and_reconcile_fixes_drift(
+    client: AsyncClient, seed_reminder_data, db_session: AsyncSession
+):
+    await client.post("/api/v1/reminders/generate")
+    players = seed_reminder_data["players"]
+    # players[1] has a match reminder and a payment reminder
+    assert await unread_count(client, players[1].user_id) == 2
+
+    await db_session.execute(
+        update(NotificationCounter)
+        .where(NotificationCounter.user_id == players[1].user_id)
+        .values(unread_count=7)
+    )
+    db_session.add(NotificationCounter(user_id=uuid.uuid4(), unread_count=4))
+    await db_session.flush()
+
+    fixed = await NotificationService(db_session).reconcile_unread_counts()
+    assert fixed == 2
+    assert await unread_count(client, players[1].user_id) == 2
+
+
+@pytest.mark.asyncio
+async def test_inbox_keyset_paging(client: AsyncClient, db_session: AsyncSession):
+    now = datetime.now(timezone.utc)
+    db_session.add_all(
+        [
+            Notification(
+                club_id=TEST_CLUB_ID,
+                user_id=TEST_USER_ID,
+                type="general",
+                title=f"N{i}",
+                data={},
+                is_read=i % 2 == 0,
+                created_at=now - timedelta(minutes=i),
+            )
+            for i in range(5)
+        ]
+    )
+    await db_session.flush()
+    url = f"/api/v1/users/{TEST_USER_ID}/notifications/"
+
+    response = await client.get(url, params={"limit": 2})
+    assert [n["title"] for n in response.json()] == ["N0", "N1"]
+    cursor = response.headers["X-Next-Cursor"]
+
+    response = await client.get(url, params={"limit": 2, "cursor": cursor})
+    assert [n["title"] for n in response.json()] == ["N2", "N3"]
+
+    response = await client.get(url, params={"limit": 10, "unread_only": True})
+    assert [n["title"] for n in response.json()] == ["N1", "N3"]
+    assert "X-Next-Cursor" not in response.headers
+
+    response = await client.get(url, params={"cursor": "not-a-cursor"})
+    assert response.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_archive_moves_only_old_read_notifications(db_session: AsyncSession):
+    old = datetime.now(timezone.utc) - timedelta(days=120)
+    db_session.add_all(
+        [
+            Notification(
+                club_id=TEST_CLUB_ID,
+                user_id=TEST_USER_ID,
+                type="general",
+                title=title,
+                data={},
+                is_read=is_read,
+                created_at=created_at,
+            )
+            for title, is_read, created_at in [
+                ("old read 1", True, old),
+                ("old read 2", True, old),
+                ("old unread", False, old),
+                ("new read", True, datetime.now(timezone.utc)),
+            ]
+        ]
+    )
+    await db_session.flush()
+
+    service = NotificationService(db_session)
+    cutoff = datetime.now(timezone.utc) - timedelta(days=90)
+    assert await service.archive_read_batch(cutoff, batch_size=1) == 1
+    assert await service.archive_read_batch(cutoff, batch_size=1) == 1
+    assert await service.archive_read_batch(cutoff, batch_size=1) == 0
+
+    archived = (await db_session.scalars(select(NotificationArchive.title))).all()
+    assert sorted(archived) == ["old read 1", "old read 2"]
+    remaining = (await db_session.scalars(select(Notification.title))).all()
+    assert sorted(remaining) == ["new read", "old unread"]
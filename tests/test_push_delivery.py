@@ -0,0 +1,138 @@
+import uuid
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.integrations.push_provider import PushMessage, PushOutcome, TransientPushError
+from app.models.club import Club
+from app.models.club_member import ClubMember
+from app.models.notification import Notification
+from app.models.profile import Profile
+from app.models.push_token import PushToken
+from app.models.task import Task
+from app.services.push_delivery_service import PushDeliveryService
+from tests.conftest import TEST_CLUB_ID
+
+
+class RecordingProvider:
+    """Accepts batches of two; tokens containing ``invalid`` are dead, ``flaky`` fails once."""
+
+    max_batch_size = 2
+
+    def __init__(self):
+        self.batches: list[list[str]] = []
+        self._failed: set[str] = set()
+
+    async def send(self, messages: list[PushMessage]) -> list[PushOutcome]:
+        flaky = {m.token for m in messages if "flaky" in m.token} - self._failed
+        if flaky:
+            self._failed.update(flaky)
+            raise TransientPushError("503")
+        self.batches.append([m.token for m in messages])
+        return [
+            PushOutcome(m.token, "invalid_token" if "invalid" in m.token else "ok")
+            for m in messages
+        ]
+
+    async def aclose(self) -> None:
+        pass
+
+
+@pytest.fixture
+async def seed_members(db_session: AsyncSession):
+    db_session.add(Club(id=TEST_CLUB_ID, name="Test CC", slug="test-cc-push"))
+    profiles = [Profile(id=uuid.uuid4(), email=f"push-{i}@example.com") for i in range(3)]
+    db_session.add_all(profiles)
+    await db_session.flush()
+    db_session.add_all(
+        [ClubMember(user_id=p.id, club_id=TEST_CLUB_ID, role="player") for p in profiles]
+    )
+    tokens = ["ok-1", "ok-2", "invalid-1", "flaky-1"]
+    db_session.add_all(
+        [
+            PushToken(user_id=profiles[0].id, token=tokens[0], platform="ios"),
+            PushToken(user_id=profiles[0].id, token=tokens[1], platform="android"),
+            PushToken(user_id=profiles[1].id, token=tokens[2], platform="ios"),
+            PushToken(user_id=profiles[2].id, token=tokens[3], platform="web"),
+        ]
+    )
+    await db_session.flush()
+    return profiles
+
+
+@pytest.mark.asyncio
+async def test_broadcast_notifies_members_and_queues_one_push(
+    client: AsyncClient, seed_members, db_session: AsyncSession
+):
+    response = await client.post(
+        f"/api/v1/clubs/{TEST_CLUB_ID}/notifications/broadcast",
+        json={"title": "Nets cancelled", "body": "Rain", "data": {"kind": "nets"}},
+    )
+    assert response.status_code == 202
+    assert response.json()["recipients"] == 3
+
+    task = await db_session.get(Task, uuid.UUID(response.json()["task_id"]))
+    assert task.kind == "push_delivery"
+    assert len(task.payload["notification_ids"]) == 3
+
+    count = await db_session.scalar(
+        select(func.count()).where(Notification.type == "broadcast")
+    )
+    assert count == 3
+
+
+@pytest.mark.asyncio
+async def test_delivery_batches_retries_and_prunes(seed_members, db_session: AsyncSession):
+    notifications = [
+        Notification(club_id=TEST_CLUB_ID, user_id=p.id, type="broadcast", title="Hi", data={})
+        for p in seed_members
+    ]
+    db_session.add_all(notifications)
+    await db_session.flush()
+
+    provider = RecordingProvider()
+    stats = await PushDeliveryService(db_session, provider).deliver_notifications(
+        [n.id for n in notifications]
+    )
+
+    assert stats["messages"] == 4
+    assert stats["sent"] == 3
+    assert stats["pruned"] == 1
+    assert stats["batches"] == 2
+    assert stats["retries"] == 1
+    assert sorted(t for batch in provider.batches for t in batch) == [
+        "flaky-1",
+        "invalid-1",
+        "ok-1",
+        "ok-2",
+    ]
+
+    remaining = (await db_session.scalars(select(PushToken.token))).all()
+    assert "invalid-1" not in remaining
+    assert len(remaining) == 3
+
+
+class BrokenBatchProvider(RecordingProvider):
+    """Rejects any batch containing a ``broken`` token, as a 4xx from the API would."""
+
+    async def send(self, messages: list[PushMessage]) -> list[PushOutcome]:
+        if any("broken" in m.token for m in messages):
+            raise ValueError("400 Bad Request")
+        return await super().send(messages)
+
+
+@pytest.mark.asyncio
+async def test_permanent_batch_failure_spares_other_batches():
+    provider = BrokenBatchProvider()
+    tokens = ["ok-1", "ok-2", "broken-1", "ok-3", "ok-4"]
+    stats = await PushDeliveryService(None, provider).deliver(
+        [PushMessage(token=t, title="Hi") for t in tokens]
+    )
+
+    # Returned, not raised: a task retry would push the other batches again
+    assert stats["sent"] == 3
+    assert stats["failed"] == 2
+    assert stats["retries"] == 0
+    assert provider.batches == [["ok-1", "ok-2"], ["ok-4"]]
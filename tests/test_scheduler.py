@@ -0,0 +1,79 @@
+from datetime import datetime, timezone
+
+import pytest
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.scheduler import CronSchedule, Scheduler
+from app.models.job_run import JobRun
+
+MONDAY = datetime(2026, 10, 19, 10, 7, tzinfo=timezone.utc)
+
+
+@pytest.mark.parametrize(
+    ("expression", "expected"),
+    [
+        ("*/15 * * * *", datetime(2026, 10, 19, 10, 15, tzinfo=timezone.utc)),
+        ("30 3 * * *", datetime(2026, 10, 20, 3, 30, tzinfo=timezone.utc)),
+        ("0 9 * * 1-5", datetime(2026, 10, 20, 9, 0, tzinfo=timezone.utc)),
+        ("0 0 * * 7", datetime(2026, 10, 25, 0, 0, tzinfo=timezone.utc)),
+        ("0 0 1 * *", datetime(2026, 11, 1, 0, 0, tzinfo=timezone.utc)),
+        ("0 12 13 * 5", datetime(2026, 10, 23, 12, 0, tzinfo=timezone.utc)),
+    ],
+)
+def test_cron_next_after(expression, expected):
+    assert CronSchedule(expression).next_after(MONDAY) == expected
+
+
+@pytest.mark.parametrize("expression", ["* * * *", "60 * * * *", "*/0 * * * *", "5-1 * * * *"])
+def test_cron_rejects_invalid(expression):
+    with pytest.raises(ValueError):
+        CronSchedule(expression)
+
+
+@pytest.fixture
+async def scheduler(setup_database):
+    # The scheduler commits, so it gets its own sessions and cleans up after itself
+    session_factory = async_sessionmaker(
+        setup_database, class_=AsyncSession, expire_on_commit=False
+    )
+    yield Scheduler(session_factory, instance="test")
+    async with session_factory() as db:
+        await db.execute(delete(JobRun).where(JobRun.instance == "test"))
+        await db.commit()
+
+
+@pytest.mark.asyncio
+async def test_run_job_records_run_once_per_slot(scheduler: Scheduler):
+    calls = []
+
+    async def job(db: AsyncSession) -> int:
+        calls.append(db)
+        return 7
+
+    scheduler.add_job("test_job", "* * * * *", job)
+    run_id = await scheduler.run_job(scheduler.jobs["test_job"], MONDAY)
+    assert run_id is not None
+    # A second replica waking up for the same slot does nothing
+    assert await scheduler.run_job(scheduler.jobs["test_job"], MONDAY) is None
+    assert len(calls) == 1
+
+    async with scheduler.session_factory() as db:
+        run = await db.scalar(select(JobRun).where(JobRun.id == run_id))
+    assert run.status == "succeeded"
+    assert run.rows_affected == 7
+    assert run.duration_ms is not None
+
+
+@pytest.mark.asyncio
+async def test_run_job_records_failure(scheduler: Scheduler):
+    async def job(db: AsyncSession) -> int:
+        raise RuntimeError("boom")
+
+    scheduler.add_job("failing_job", "* * * * *", job)
+    run_id = await scheduler.run_job(scheduler.jobs["failing_job"], MONDAY)
+
+    async with scheduler.session_factory() as db:
+        run = await db.scalar(select(JobRun).where(JobRun.id == run_id))
+    assert run.status == "failed"
+    assert "boom" in run.error
@@ -0,0 +1,86 @@
+import uuid
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.announcement import Announcement
+from app.models.channel import Channel
+from app.models.club import Club
+from app.models.message import Message
+from tests.conftest import TEST_CLUB_ID, TEST_USER_ID
+
+
+@pytest.fixture
+async def seed_search(db_session: AsyncSession):
+    other_club_id = uuid.uuid4()
+    db_session.add_all(
+        [
+            Club(id=TEST_CLUB_ID, name="Test CC", slug="test-cc-search"),
+            Club(id=other_club_id, name="Other CC", slug="other-cc-search"),
+        ]
+    )
+    channel = Channel(id=uuid.uuid4(), club_id=TEST_CLUB_ID, name="General")
+    other_channel = Channel(id=uuid.uuid4(), club_id=other_club_id, name="General")
+    db_session.add_all([channel, other_channel])
+    await db_session.flush()
+
+    db_session.add_all(
+        [
+            Message(channel_id=channel.id, content="Nets are on Tuesday at six"),
+            Message(channel_id=channel.id, content="Who is bringing the tea?"),
+            Message(channel_id=channel.id, content="Net session cancelled", is_deleted=True),
+            Message(channel_id=other_channel.id, content="Our nets are on Wednesday"),
+            Announcement(
+                club_id=TEST_CLUB_ID,
+                title="Indoor nets",
+                body="Winter nets start in January.",
+                created_by=TEST_USER_ID,
+            ),
+        ]
+    )
+    await db_session.flush()
+    return channel
+
+
+@pytest.mark.asyncio
+async def test_search_is_ranked_highlighted_and_club_scoped(client: AsyncClient, seed_search):
+    response = await client.get(f"/api/v1/clubs/{TEST_CLUB_ID}/search/", params={"q": "nets"})
+    assert response.status_code == 200
+    results = response.json()
+
+    assert [r["kind"] for r in results] == ["announcement", "message"]
+    announcement, message = results
+    assert announcement["title"] == "Indoor nets"
+    assert "<mark>nets</mark>" in announcement["snippet"]
+    assert message["channel_id"] == str(seed_search.id)
+    assert message["snippet"].startswith("<mark>Nets</mark>")
+
+
+@pytest.mark.asyncio
+async def test_search_keyset_pages(client: AsyncClient, seed_search):
+    url = f"/api/v1/clubs/{TEST_CLUB_ID}/search/"
+    first = await client.get(url, params={"q": "nets", "limit": 1})
+    assert len(first.json()) == 1
+    cursor = first.headers["X-Next-Cursor"]
+
+    second = await client.get(url, params={"q": "nets", "limit": 1, "cursor": cursor})
+    assert [r["kind"] for r in second.json()] == ["message"]
+
+    response = await client.get(url, params={"q": "nets", "cursor": "not-a-cursor"})
+    assert response.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_search_snippets_escape_stored_html(
+    client: AsyncClient, db_session: AsyncSession, seed_search
+):
+    db_session.add(
+        Message(channel_id=seed_search.id, content='Nets <img src=x onerror="alert(1)"> & tea')
+    )
+    await db_session.flush()
+
+    response = await client.get(f"/api/v1/clubs/{TEST_CLUB_ID}/search/", params={"q": "tea"})
+    snippet = next(r["snippet"] for r in response.json() if "onerror" in r["snippet"])
+    assert "&lt;img src=x onerror=&quot;alert(1)&quot;&gt; &amp; <mark>tea</mark>" in snippet
+    assert "<img" not in snippet
@@ -0,0 +1,75 @@
+import uuid
+from datetime import date, time, timedelta
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.club import Club
+from app.models.match import Match
+from app.models.match_audit_log import MatchAuditLog
+from app.models.player import Player
+from tests.conftest import TEST_CLUB_ID
+
+
+@pytest.fixture
+async def seed_match(db_session: AsyncSession):
+    club = Club(id=TEST_CLUB_ID, name="Test CC", slug="test-cc-selections")
+    db_session.add(club)
+    match = Match(
+        id=uuid.uuid4(),
+        club_id=TEST_CLUB_ID,
+        date=date.today() + timedelta(days=5),
+        time=time(13, 0),
+        opponent="Rival CC",
+        venue="Home",
+        type="League",
+        status="upcoming",
+    )
+    players = [
+        Player(id=uuid.uuid4(), club_id=TEST_CLUB_ID, name=f"Player {i}", role="Batter")
+        for i in range(3)
+    ]
+    db_session.add_all([match, *players])
+    await db_session.flush()
+    return {"match": match, "players": players}
+
+
+@pytest.mark.asyncio
+async def test_set_selections_applies_diff(
+    client: AsyncClient, seed_match, db_session: AsyncSession
+):
+    match = seed_match["match"]
+    p0, p1, p2 = (str(p.id) for p in seed_match["players"])
+    url = f"/api/v1/clubs/{TEST_CLUB_ID}/matches/{match.id}/selections/"
+
+    first = await client.post(
+        url,
+        json=[{"player_id": p0, "batting_position": 1}, {"player_id": p1, "batting_position": 2}],
+    )
+    assert first.status_code == 200
+    kept_id = first.json()[0]["id"]
+
+    response = await client.post(
+        url,
+        json=[
+            {"player_id": p0, "batting_position": 2, "is_captain": True},
+            {"player_id": p2, "batting_position": 1},
+        ],
+    )
+    assert response.status_code == 200
+    rows = response.json()
+    assert [r["player_id"] for r in rows] == [p0, p2]
+    # Unchanged players keep their row; only the edited fields move
+    assert rows[0]["id"] == kept_id
+    assert rows[0]["batting_position"] == 2
+    assert rows[0]["is_captain"] is True
+
+    result = await db_session.execute(
+        select(MatchAuditLog.details)
+        .where(MatchAuditLog.match_id == match.id, MatchAuditLog.action == "selection_changed")
+    )
+    change_sets = result.scalars().all()
+    assert len(change_sets) == 2
+    assert {"added": [p2], "removed": [p1], "updated": [p0]} in change_sets
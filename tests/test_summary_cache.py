@@ -0,0 +1,75 @@
+import asyncio
+import uuid
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import get_settings
+from app.core.summary_cache import SummaryCache, invalidate_summaries, summary_cache
+
+
+def loader(values: list):
+    calls = []
+
+    async def load():
+        calls.append(1)
+        return values[len(calls) - 1]
+
+    return load, calls
+
+
+@pytest.mark.asyncio
+async def test_cached_per_club_until_invalidated():
+    cache = SummaryCache(ttl=60)
+    club_id, other_id = uuid.uuid4(), uuid.uuid4()
+    load, calls = loader([{"n": 1}, {"n": 2}])
+    async with AsyncSession() as db:
+        assert await cache.get(db, club_id, "media", load) == {"n": 1}
+        assert await cache.get(db, club_id, "media", load) == {"n": 1}
+        assert len(calls) == 1
+
+        cache.invalidate({other_id})
+        assert await cache.get(db, club_id, "media", load) == {"n": 1}
+        cache.invalidate({club_id})
+        assert await cache.get(db, club_id, "media", load) == {"n": 2}
+
+
+@pytest.mark.asyncio
+async def test_load_racing_an_invalidation_is_not_stored():
+    cache = SummaryCache(ttl=60)
+    club_id = uuid.uuid4()
+    started, release = asyncio.Event(), asyncio.Event()
+
+    async def slow_load():
+        started.set()
+        await release.wait()
+        return {"n": "stale"}
+
+    async with AsyncSession() as db:
+        pending = asyncio.create_task(cache.get(db, club_id, "media", slow_load))
+        await started.wait()
+        cache.invalidate({club_id})
+        release.set()
+        assert await pending == {"n": "stale"}
+
+        load, calls = loader([{"n": "fresh"}])
+        assert await cache.get(db, club_id, "media", load) == {"n": "fresh"}
+        assert len(calls) == 1
+
+
+@pytest.mark.asyncio
+async def test_writer_bypasses_cache_until_commit(monkeypatch):
+    # In-process invalidation only; the postgres broker also sends pg_notify
+    monkeypatch.setattr(get_settings(), "realtime_broker", "local")
+    club_id = uuid.uuid4()
+    load, calls = loader([{"n": 1}, {"n": 2}, {"n": 3}])
+    async with AsyncSession() as reader, AsyncSession() as writer:
+        assert await summary_cache.get(reader, club_id, "media", load) == {"n": 1}
+
+        await invalidate_summaries(writer, club_id)
+        # The writer sees its own uncommitted changes; other sessions keep the cache
+        assert await summary_cache.get(writer, club_id, "media", load) == {"n": 2}
+        assert await summary_cache.get(reader, club_id, "media", load) == {"n": 1}
+
+        await writer.commit()
+        assert await summary_cache.get(reader, club_id, "media", load) == {"n": 3}
@@ -0,0 +1,220 @@
+import asyncio
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.config import get_settings
+from app.core.task_queue import PermanentTaskError, TaskWorker, claim, enqueue, task_handler
+from app.models.club import Club
+from app.models.task import Task
+from tests.conftest import TEST_CLUB_ID
+
+# Attempts seen by the handlers below, by task id
+_attempts: dict[uuid.UUID, list[int]] = {}
+_lease_checks: dict[uuid.UUID, list[datetime]] = {}
+
+
+@task_handler("test_flaky")
+async def flaky_handler(db: AsyncSession, task: Task) -> dict:
+    _attempts.setdefault(task.id, []).append(task.attempts)
+    if task.attempts < task.payload["succeed_on"]:
+        raise RuntimeError(f"attempt {task.attempts} failed")
+    return {"attempt": task.attempts}
+
+
+@task_handler("test_permanent")
+async def permanent_handler(db: AsyncSession, task: Task) -> dict:
+    _attempts.setdefault(task.id, []).append(task.attempts)
+    raise PermanentTaskError("bad payload")
+
+
+@task_handler("test_slow")
+async def slow_handler(db: AsyncSession, task: Task) -> dict:
+    # Outlives the lease several times over; the heartbeat must keep it
+    for _ in range(4):
+        await asyncio.sleep(task.payload["seconds"] / 4)
+        locked_at = await db.scalar(select(Task.locked_at).where(Task.id == task.id))
+        _lease_checks.setdefault(task.id, []).append(locked_at)
+    return {}
+
+
+@pytest.fixture
+async def seed_club(db_session: AsyncSession):
+    club = Club(id=TEST_CLUB_ID, name="Test CC", slug="test-cc-tasks", play_cricket_id=4321)
+    db_session.add(club)
+    await db_session.flush()
+    return club
+
+
+@pytest.mark.asyncio
+async def test_enqueue_returns_task_id_and_status(client: AsyncClient, seed_club):
+    response = await client.post(
+        f"/api/v1/clubs/{TEST_CLUB_ID}/play-cricket/sync/all/background",
+        json={"season": 2026},
+    )
+    assert response.status_code == 202
+    task_id = response.json()["task_id"]
+    assert response.json()["status"] == "queued"
+
+    response = await client.get(f"/api/v1/clubs/{TEST_CLUB_ID}/tasks/{task_id}")
+    assert response.status_code == 200
+    task = response.json()
+    assert task["kind"] == "play_cricket_sync"
+    assert task["attempts"] == 0
+
+
+@pytest.mark.asyncio
+async def test_task_status_is_club_scoped(client: AsyncClient, seed_club, db_session):
+    task = await enqueue(db_session, "play_cricket_sync", club_id=uuid.uuid4())
+    response = await client.get(f"/api/v1/clubs/{TEST_CLUB_ID}/tasks/{task.id}")
+    assert response.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_claim_orders_by_priority_and_limits_per_club(db_session: AsyncSession):
+    other_club = uuid.uuid4()
+    low = await enqueue(db_session, "test_kind", club_id=TEST_CLUB_ID, priority=0)
+    high = await enqueue(db_session, "test_kind", club_id=TEST_CLUB_ID, priority=5)
+    other = await enqueue(db_session, "test_kind", club_id=other_club, priority=1)
+
+    first = await claim(db_session, "w1", club_limit=1, kinds=["test_kind"])
+    assert first.id == high.id
+    assert first.status == "running"
+    assert first.attempts == 1
+
+    # TEST_CLUB_ID is at its limit, so the other club's task is next
+    second = await claim(db_session, "w1", club_limit=1, kinds=["test_kind"])
+    assert second.id == other.id
+    assert await claim(db_session, "w1", club_limit=1, kinds=["test_kind"]) is None
+
+    assert (await claim(db_session, "w1", club_limit=2, kinds=["test_kind"])).id == low.id
+
+
+TEST_KINDS = ["test_flaky", "test_permanent", "test_slow"]
+
+
+@pytest.fixture
+async def worker_sessions(setup_database, monkeypatch):
+    # The worker commits in its own sessions; clean up after
+    settings = get_settings()
+    monkeypatch.setattr(settings, "task_poll_interval", 0.02)
+    monkeypatch.setattr(settings, "task_retry_base_seconds", 0.05)
+    monkeypatch.setattr(settings, "task_lease_seconds", 1)
+    session_factory = async_sessionmaker(
+        setup_database, class_=AsyncSession, expire_on_commit=False
+    )
+    worker = TaskWorker(session_factory, kinds=TEST_KINDS, worker_id="test-worker")
+    yield session_factory, worker
+    await worker.stop(timeout=1)
+    async with session_factory() as db:
+        await db.execute(delete(Task).where(Task.kind.in_(TEST_KINDS)))
+        await db.commit()
+
+
+async def _run_until_finished(session_factory, worker: TaskWorker, *task_ids) -> dict:
+    await worker.start()
+    for _ in range(250):
+        async with session_factory() as db:
+            tasks = (await db.scalars(select(Task).where(Task.id.in_(task_ids)))).all()
+        if all(t.finished_at for t in tasks):
+            return {t.id: t for t in tasks}
+        await asyncio.sleep(0.02)
+    raise AssertionError("Tasks did not finish")
+
+
+@pytest.mark.asyncio
+async def test_worker_retries_with_backoff_then_fails(worker_sessions):
+    session_factory, worker = worker_sessions
+    async with session_factory() as db:
+        recovers = await enqueue(db, "test_flaky", {"succeed_on": 3})
+        gives_up = await enqueue(db, "test_flaky", {"succeed_on": 9}, max_attempts=2)
+        await db.commit()
+
+    tasks = await _run_until_finished(session_factory, worker, recovers.id, gives_up.id)
+
+    assert tasks[recovers.id].status == "succeeded"
+    assert tasks[recovers.id].result == {"attempt": 3}
+    assert _attempts[recovers.id] == [1, 2, 3]
+    assert "attempt 2 failed" in tasks[recovers.id].last_error
+    # Each retry waited out its backoff
+    assert tasks[recovers.id].run_after > tasks[recovers.id].created_at
+
+    assert tasks[gives_up.id].status == "failed"
+    assert tasks[gives_up.id].attempts == 2
+    assert "RuntimeError: attempt 2 failed" in tasks[gives_up.id].last_error
+
+
+@pytest.mark.asyncio
+async def test_permanent_error_fails_without_retry(worker_sessions):
+    session_factory, worker = worker_sessions
+    async with session_factory() as db:
+        task = await enqueue(db, "test_permanent")
+        await db.commit()
+
+    tasks = await _run_until_finished(session_factory, worker, task.id)
+
+    assert tasks[task.id].status == "failed"
+    assert tasks[task.id].attempts == 1
+    assert _attempts[task.id] == [1]
+    assert "PermanentTaskError: bad payload" in tasks[task.id].last_error
+
+
+@pytest.mark.asyncio
+async def test_expired_lease_is_reclaimed(worker_sessions):
+    session_factory, worker = worker_sessions
+    async with session_factory() as db:
+        # Claimed by a worker that died an hour ago
+        task = await enqueue(db, "test_flaky", {"succeed_on": 1})
+        task.status = "running"
+        task.attempts = 1
+        task.locked_by = "dead-worker"
+        task.locked_at = datetime.now(timezone.utc) - timedelta(hours=1)
+        await db.commit()
+
+    tasks = await _run_until_finished(session_factory, worker, task.id)
+
+    assert tasks[task.id].status == "succeeded"
+    assert tasks[task.id].attempts == 2
+    assert tasks[task.id].locked_by == "test-worker"
+
+
+@pytest.mark.asyncio
+async def test_expired_lease_on_the_last_attempt_fails(worker_sessions):
+    session_factory, worker = worker_sessions
+    async with session_factory() as db:
+        # Its worker died on every attempt, e.g. an image that crashes the render pool
+        task = await enqueue(db, "test_flaky", {"succeed_on": 1}, max_attempts=3)
+        task.status = "running"
+        task.attempts = 3
+        task.locked_by = "dead-worker"
+        task.locked_at = datetime.now(timezone.utc) - timedelta(hours=1)
+        await db.commit()
+
+    tasks = await _run_until_finished(session_factory, worker, task.id)
+
+    assert tasks[task.id].status == "failed"
+    assert tasks[task.id].attempts == 3
+    assert tasks[task.id].locked_by is None
+    assert "Lease expired" in tasks[task.id].last_error
+    assert task.id not in _attempts
+
+
+@pytest.mark.asyncio
+async def test_heartbeat_keeps_long_task_leased(worker_sessions):
+    session_factory, worker = worker_sessions
+    async with session_factory() as db:
+        task = await enqueue(db, "test_slow", {"seconds": 2.4})
+        await db.commit()
+
+    tasks = await _run_until_finished(session_factory, worker, task.id)
+
+    # Never re-queued by the worker's own expiry sweep, though it ran past the lease
+    assert tasks[task.id].status == "succeeded"
+    assert tasks[task.id].attempts == 1
+    checks = _lease_checks[task.id]
+    assert checks == sorted(checks)
+    assert checks[-1] > checks[0]